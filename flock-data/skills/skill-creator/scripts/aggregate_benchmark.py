@@ -7,11 +7,15 @@ Reads grading.json files from run directories and produces:
 - delta between with_skill and without_skill configurations
 
 Usage:
-    python aggregate_benchmark.py <benchmark_dir>
+    python aggregate_benchmark.py <benchmark_dir> [--watch [SECONDS]]
 
 Example:
     python aggregate_benchmark.py benchmarks/2026-01-15T10-30-00/
 
+What was extracted from each run is kept in benchmark.manifest.json next to
+benchmark.json, so a rerun only parses grading files that are new or have
+changed. --watch keeps re-aggregating while runs are still being graded.
+
 The script supports two directory layouts:
 
     Workspace layout (from skill-creator iterations):
@@ -35,12 +39,24 @@ The script supports two directory layouts:
 """
 
 import argparse
+import contextlib
+import hashlib
+import io
+import itertools
 import json
 import math
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def calculate_stats(values: list[float]) -> dict:
     """Calculate mean, stddev, min, max for a list of values."""
@@ -64,115 +80,312 @@ def calculate_stats(values: list[float]) -> dict:
     }
 
 
-def load_run_results(benchmark_dir: Path) -> dict:
+def _loads(data: bytes):
+    """Decode JSON bytes, with orjson when it is installed.
+
+    Anything orjson rejects is decoded again with json, so what is accepted
+    and the JSONDecodeError messages stay exactly json's.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _read_json(path: str):
+    with open(path, "rb") as f:
+        return _loads(f.read())
+
+
+# Stand-in for an eval_metadata.json that can't be read
+_INVALID = object()
+
+
+def _load_metadata(path: str):
+    try:
+        return _read_json(path)
+    except (json.JSONDecodeError, OSError):
+        return _INVALID
+
+
+def _read_bytes(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _file_state(path: str) -> list[int] | None:
+    """[mtime_ns, size] of path, or None if it doesn't exist."""
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _same_files(old: dict, new: dict, fields: slice) -> bool:
+    return all(
+        (old.get(name) is None) == (state is None) and (state is None or old[name][fields] == state[fields])
+        for name, state in new.items()
+    )
+
+
+RUN_FILES = ("grading.json", "timing.json")
+
+
+def _load_run(run_dir: str, cached: dict | None = None, track: bool = False) -> tuple[dict | None, bool]:
+    """Extract one run into a manifest entry; return (entry, reused).
+
+    entry is None when there is no grading.json, {"error": message} when it
+    is not valid JSON, and otherwise {"record": ...}, the run's metrics
+    without eval_id and run_number. timing.json is read only if grading has
+    no duration.
+
+    With track, the entry also records "files": {name: [mtime_ns, size,
+    sha256] or None} for RUN_FILES, and a cached entry is reused without
+    parsing anything when every file has the same mtime and size, or
+    failing that the same content hash.
+    """
+    paths = {name: os.path.join(run_dir, name) for name in RUN_FILES}
+    files = None
+    if track:
+        states = {name: _file_state(path) for name, path in paths.items()}
+        if states["grading.json"] is None:
+            return None, False
+        old = cached.get("files") if cached else None
+        if old is not None and _same_files(old, states, slice(0, 2)):
+            return cached, True
+        data = {name: _read_bytes(path) for name, path in paths.items()}
+        files = {
+            name: None if content is None else [*(states[name] or [0, 0]), hashlib.sha256(content).hexdigest()]
+            for name, content in data.items()
+        }
+        if old is not None and _same_files(old, files, slice(2, 3)):
+            return {**cached, "files": files}, True
+        grading_bytes = data["grading.json"]
+    else:
+        grading_bytes = _read_bytes(paths["grading.json"])
+    if grading_bytes is None:
+        return None, False
+
+    try:
+        grading = _loads(grading_bytes)
+    except json.JSONDecodeError as e:
+        entry = {"error": str(e)}
+    else:
+        timing = None
+        if grading.get("timing", {}).get("total_duration_seconds", 0.0) == 0.0:
+            timing_bytes = data["timing.json"] if track else _read_bytes(paths["timing.json"])
+            if timing_bytes is not None:
+                try:
+                    timing = _loads(timing_bytes)
+                except json.JSONDecodeError:
+                    pass
+        entry = {"record": _extract_run(grading, timing)}
+    if files is not None:
+        entry["files"] = files
+    return entry, False
+
+
+def _load_runs(batch: list[tuple[str, dict | None]], track: bool) -> list[tuple[dict | None, bool]]:
+    return [_load_run(run_dir, cached, track) for run_dir, cached in batch]
+
+
+# Runs per thread-pool task; one future per run costs more than reading it
+_BATCH = 64
+
+
+class Manifest:
+    """Run records already extracted from a benchmark tree.
+
+    Stored as JSON next to benchmark.json and keyed by run directory
+    (relative to the benchmark directory), each entry holds the extracted
+    record plus the mtime, size and SHA-256 of the grading.json and
+    timing.json it came from, so a rerun only parses runs that are new or
+    changed. parsed and reused count the runs of the last load.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.runs: dict[str, dict] = {}
+        try:
+            data = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        if isinstance(data, dict) and data.get("version") == self.VERSION:
+            self.runs = data.get("runs", {})
+        self.parsed = 0
+        self.reused = 0
+
+    def save(self) -> None:
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(json.dumps({"version": self.VERSION, "runs": self.runs}))
+        os.replace(tmp, self.path)
+
+
+def _sorted_entries(path: str, prefix: str) -> list[os.DirEntry]:
+    with os.scandir(path) as it:
+        return sorted((e for e in it if e.name.startswith(prefix)), key=lambda e: e.name)
+
+
+def load_run_results(benchmark_dir: Path, workers: int | None = None, manifest: Manifest | None = None) -> dict:
     """
     Load all run results from a benchmark directory.
 
     Returns dict keyed by config name (e.g. "with_skill"/"without_skill",
     or "new_skill"/"old_skill"), each containing a list of run results.
+
+    The tree is listed once with os.scandir, down to the config
+    directories, into a list of runs; the JSON files are then read and
+    decoded on a pool of `workers` threads (orjson if installed), and
+    results and warnings are assembled in directory order. With a
+    manifest, unchanged runs are taken from it instead of being parsed,
+    and it is updated to the runs found (call manifest.save() to keep it).
     """
     # Support both layouts: eval dirs directly under benchmark_dir, or under runs/
     runs_dir = benchmark_dir / "runs"
     if runs_dir.exists():
         search_dir = runs_dir
-    elif list(benchmark_dir.glob("eval-*")):
+    elif _sorted_entries(str(benchmark_dir), "eval-"):
         search_dir = benchmark_dir
     else:
         print(f"No eval directories found in {benchmark_dir} or {benchmark_dir / 'runs'}")
         return {}
-
-    results: dict[str, list] = {}
-
-    for eval_idx, eval_dir in enumerate(sorted(search_dir.glob("eval-*"))):
-        metadata_path = eval_dir / "eval_metadata.json"
-        if metadata_path.exists():
-            try:
-                with open(metadata_path) as mf:
-                    eval_id = json.load(mf).get("eval_id", eval_idx)
-            except (json.JSONDecodeError, OSError):
-                eval_id = eval_idx
-        else:
-            try:
-                eval_id = int(eval_dir.name.split("-")[1])
-            except ValueError:
-                eval_id = eval_idx
-
+    key_prefix = "runs" if search_dir is runs_dir else ""
+
+    # One pass over the tree: (eval_idx, eval_name, eval_dir, has metadata,
+    # [(config, [(run_number, run_dir, manifest key)])]). Paths are plain
+    # strings joined like pathlib would, which is much cheaper than a Path
+    # per file.
+    evals = []
+    for eval_idx, eval_entry in enumerate(_sorted_entries(str(search_dir), "eval-")):
+        eval_dir = os.path.join(str(search_dir), eval_entry.name)
+        children = _sorted_entries(eval_dir, "")
+        configs = []
         # Discover config directories dynamically rather than hardcoding names
-        for config_dir in sorted(eval_dir.iterdir()):
-            if not config_dir.is_dir():
+        for config_entry in children:
+            if not config_entry.is_dir():
                 continue
+            config_dir = os.path.join(eval_dir, config_entry.name)
             # Skip non-config directories (inputs, outputs, etc.)
-            if not list(config_dir.glob("run-*")):
+            run_entries = _sorted_entries(config_dir, "run-")
+            if not run_entries:
                 continue
-            config = config_dir.name
-            if config not in results:
-                results[config] = []
+            configs.append((config_entry.name, [
+                (
+                    int(e.name.split("-")[1]),
+                    os.path.join(config_dir, e.name),
+                    os.path.join(key_prefix, eval_entry.name, config_entry.name, e.name),
+                )
+                for e in run_entries
+            ]))
+        has_metadata = any(e.name == "eval_metadata.json" for e in children)
+        evals.append((eval_idx, eval_entry.name, eval_dir, has_metadata, configs))
 
-            for run_dir in sorted(config_dir.glob("run-*")):
-                run_number = int(run_dir.name.split("-")[1])
-                grading_file = run_dir / "grading.json"
-
-                if not grading_file.exists():
-                    print(f"Warning: grading.json not found in {run_dir}")
-                    continue
+    results: dict[str, list] = {}
+    cached_runs = manifest.runs if manifest is not None else {}
+    work = [
+        (run_dir, cached_runs.get(key))
+        for *_, configs in evals for _, runs in configs for _, run_dir, key in runs
+    ]
+    seen: dict[str, dict] = {}
+    parsed = reused = 0
 
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        metadata = {
+            eval_dir: pool.submit(_load_metadata, os.path.join(eval_dir, "eval_metadata.json"))
+            for _, _, eval_dir, has_metadata, _ in evals if has_metadata
+        }
+        batches = [work[i:i + _BATCH] for i in range(0, len(work), _BATCH)]
+        loaded = itertools.chain.from_iterable(
+            pool.map(_load_runs, batches, itertools.repeat(manifest is not None))
+        )
+
+        for eval_idx, eval_name, eval_dir, has_metadata, configs in evals:
+            if has_metadata:
+                data = metadata[eval_dir].result()
+                eval_id = eval_idx if data is _INVALID else data.get("eval_id", eval_idx)
+            else:
                 try:
-                    with open(grading_file) as f:
-                        grading = json.load(f)
-                except json.JSONDecodeError as e:
-                    print(f"Warning: Invalid JSON in {grading_file}: {e}")
-                    continue
-
-                # Extract metrics
-                result = {
-                    "eval_id": eval_id,
-                    "run_number": run_number,
-                    "pass_rate": grading.get("summary", {}).get("pass_rate", 0.0),
-                    "passed": grading.get("summary", {}).get("passed", 0),
-                    "failed": grading.get("summary", {}).get("failed", 0),
-                    "total": grading.get("summary", {}).get("total", 0),
-                }
-
-                # Extract timing — check grading.json first, then sibling timing.json
-                timing = grading.get("timing", {})
-                result["time_seconds"] = timing.get("total_duration_seconds", 0.0)
-                timing_file = run_dir / "timing.json"
-                if result["time_seconds"] == 0.0 and timing_file.exists():
-                    try:
-                        with open(timing_file) as tf:
-                            timing_data = json.load(tf)
-                        result["time_seconds"] = timing_data.get("total_duration_seconds", 0.0)
-                        result["tokens"] = timing_data.get("total_tokens", 0)
-                    except json.JSONDecodeError:
-                        pass
-
-                # Extract metrics if available
-                metrics = grading.get("execution_metrics", {})
-                result["tool_calls"] = metrics.get("total_tool_calls", 0)
-                if not result.get("tokens"):
-                    result["tokens"] = metrics.get("output_chars", 0)
-                result["errors"] = metrics.get("errors_encountered", 0)
-
-                # Extract expectations — viewer requires fields: text, passed, evidence
-                raw_expectations = grading.get("expectations", [])
-                for exp in raw_expectations:
-                    if "text" not in exp or "passed" not in exp:
-                        print(f"Warning: expectation in {grading_file} missing required fields (text, passed, evidence): {exp}")
-                result["expectations"] = raw_expectations
-
-                # Extract notes from user_notes_summary
-                notes_summary = grading.get("user_notes_summary", {})
-                notes = []
-                notes.extend(notes_summary.get("uncertainties", []))
-                notes.extend(notes_summary.get("needs_review", []))
-                notes.extend(notes_summary.get("workarounds", []))
-                result["notes"] = notes
-
-                results[config].append(result)
-
+                    eval_id = int(eval_name.split("-")[1])
+                except ValueError:
+                    eval_id = eval_idx
+
+            for config, runs in configs:
+                if config not in results:
+                    results[config] = []
+
+                for run_number, run_dir, key in runs:
+                    entry, from_manifest = next(loaded)
+                    grading_file = os.path.join(run_dir, "grading.json")
+
+                    if entry is None:
+                        print(f"Warning: grading.json not found in {run_dir}")
+                        continue
+                    seen[key] = entry
+                    if from_manifest:
+                        reused += 1
+                    else:
+                        parsed += 1
+                    if "error" in entry:
+                        print(f"Warning: Invalid JSON in {grading_file}: {entry['error']}")
+                        continue
+
+                    record = entry["record"]
+                    # Viewer requires expectation fields: text, passed, evidence
+                    for exp in record["expectations"]:
+                        if "text" not in exp or "passed" not in exp:
+                            print(f"Warning: expectation in {grading_file} missing required fields (text, passed, evidence): {exp}")
+                    results[config].append({"eval_id": eval_id, "run_number": run_number, **record})
+
+    if manifest is not None:
+        manifest.runs = seen
+        manifest.parsed, manifest.reused = parsed, reused
     return results
 
 
+def _extract_run(grading: dict, timing_data) -> dict:
+    """Extract one run's metrics from its grading (and timing.json) data."""
+    result = {
+        "pass_rate": grading.get("summary", {}).get("pass_rate", 0.0),
+        "passed": grading.get("summary", {}).get("passed", 0),
+        "failed": grading.get("summary", {}).get("failed", 0),
+        "total": grading.get("summary", {}).get("total", 0),
+    }
+
+    # Extract timing — check grading.json first, then sibling timing.json
+    timing = grading.get("timing", {})
+    result["time_seconds"] = timing.get("total_duration_seconds", 0.0)
+    if result["time_seconds"] == 0.0 and timing_data is not None:
+        result["time_seconds"] = timing_data.get("total_duration_seconds", 0.0)
+        result["tokens"] = timing_data.get("total_tokens", 0)
+
+    # Extract metrics if available
+    metrics = grading.get("execution_metrics", {})
+    result["tool_calls"] = metrics.get("total_tool_calls", 0)
+    if not result.get("tokens"):
+        result["tokens"] = metrics.get("output_chars", 0)
+    result["errors"] = metrics.get("errors_encountered", 0)
+
+    # Expectations are kept as is; the viewer needs text, passed, evidence
+    result["expectations"] = grading.get("expectations", [])
+
+    # Extract notes from user_notes_summary
+    notes_summary = grading.get("user_notes_summary", {})
+    notes = []
+    notes.extend(notes_summary.get("uncertainties", []))
+    notes.extend(notes_summary.get("needs_review", []))
+    notes.extend(notes_summary.get("workarounds", []))
+    result["notes"] = notes
+    return result
+
+
 def aggregate_results(results: dict) -> dict:
     """
     Aggregate run results into summary statistics.
@@ -224,11 +437,21 @@ def aggregate_results(results: dict) -> dict:
     return run_summary
 
 
-def generate_benchmark(benchmark_dir: Path, skill_name: str = "", skill_path: str = "") -> dict:
+def generate_benchmark(
+    benchmark_dir: Path,
+    skill_name: str = "",
+    skill_path: str = "",
+    workers: int | None = None,
+    manifest: Manifest | None = None,
+) -> dict:
     """
     Generate complete benchmark.json from run results.
+
+    With a manifest, only new or changed runs are parsed (see Manifest);
+    run_summary is then recomputed from the cached records, which costs
+    next to nothing next to parsing.
     """
-    results = load_run_results(benchmark_dir)
+    results = load_run_results(benchmark_dir, workers, manifest)
     run_summary = aggregate_results(results)
 
     # Build runs array for benchmark.json
@@ -354,25 +577,72 @@ def main():
         default="",
         help="Path to the skill being benchmarked"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Threads reading grading files (default: ThreadPoolExecutor's)"
+    )
     parser.add_argument(
         "--output", "-o",
         type=Path,
         help="Output path for benchmark.json (default: <benchmark_dir>/benchmark.json)"
     )
 
+    parser.add_argument(
+        "--no-manifest",
+        action="store_true",
+        help="Reparse every grading.json instead of reusing <output>.manifest.json"
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        nargs="?",
+        const=5.0,
+        default=None,
+        metavar="SECONDS",
+        help="Keep re-aggregating every SECONDS (default 5) while runs are graded; stop with Ctrl-C"
+    )
+
     args = parser.parse_args()
 
     if not args.benchmark_dir.exists():
         print(f"Directory not found: {args.benchmark_dir}")
         sys.exit(1)
 
-    # Generate benchmark
-    benchmark = generate_benchmark(args.benchmark_dir, args.skill_name, args.skill_path)
-
     # Determine output paths
     output_json = args.output or (args.benchmark_dir / "benchmark.json")
     output_md = output_json.with_suffix(".md")
-
+    manifest = None if args.no_manifest else Manifest(output_json.with_name(f"{output_json.stem}.manifest.json"))
+
+    if args.watch is None:
+        benchmark = generate_benchmark(args.benchmark_dir, args.skill_name, args.skill_path, args.workers, manifest)
+        write_benchmark(benchmark, output_json, output_md, manifest)
+        print_summary(benchmark)
+        return
+
+    print(f"Watching {args.benchmark_dir} every {args.watch:g}s (Ctrl-C to stop)")
+    last = None
+    try:
+        while True:
+            # Warnings are only worth repeating when something changed
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                benchmark = generate_benchmark(args.benchmark_dir, args.skill_name, args.skill_path, args.workers, manifest)
+            current = (benchmark["runs"], benchmark["run_summary"], out.getvalue())
+            if current != last:
+                print(f"\n[{time.strftime('%H:%M:%S')}] {len(benchmark['runs'])} runs")
+                print(out.getvalue(), end="")
+                write_benchmark(benchmark, output_json, output_md, manifest)
+                print_summary(benchmark)
+                last = current
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        pass
+
+
+def write_benchmark(benchmark: dict, output_json: Path, output_md: Path, manifest: Manifest | None = None) -> None:
+    """Write benchmark.json, benchmark.md and the manifest, if any."""
     # Write benchmark.json
     with open(output_json, "w") as f:
         json.dump(benchmark, f, indent=2)
@@ -384,7 +654,12 @@ def main():
         f.write(markdown)
     print(f"Generated: {output_md}")
 
-    # Print summary
+    if manifest is not None:
+        manifest.save()
+        print(f"Parsed {manifest.parsed} grading files, reused {manifest.reused} from {manifest.path}")
+
+
+def print_summary(benchmark: dict) -> None:
     run_summary = benchmark["run_summary"]
     configs = [k for k in run_summary if k != "delta"]
     delta = run_summary.get("delta", {})
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Benchmark aggregate_benchmark.load_run_results against the old loader.
+
+The old loader walked eval-* -> config dirs -> run-* with Path.glob (globbing
+run-* twice per config dir) and opened and decoded every grading.json,
+timing.json and eval_metadata.json one after another. The current one lists
+the tree once with os.scandir and decodes the files on a thread pool.
+
+Both loaders read the same tree; their results and printed warnings are
+checked to be identical, and the best wall-clock time of each is reported.
+Later repeats run against a warm page cache, so on a local disk the numbers
+mostly show traversal and decoding cost; network filesystems gain more.
+
+Usage:
+    python -m scripts.bench_aggregate_benchmark --runs 10000
+    python -m scripts.bench_aggregate_benchmark --benchmark-dir path/to/benchmark
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from scripts import aggregate_benchmark
+from scripts.aggregate_benchmark import load_run_results
+
+
+def legacy_load_run_results(benchmark_dir: Path) -> dict:
+    """load_run_results as it was before the scandir/thread-pool rewrite."""
+    runs_dir = benchmark_dir / "runs"
+    if runs_dir.exists():
+        search_dir = runs_dir
+    elif list(benchmark_dir.glob("eval-*")):
+        search_dir = benchmark_dir
+    else:
+        print(f"No eval directories found in {benchmark_dir} or {benchmark_dir / 'runs'}")
+        return {}
+
+    results: dict[str, list] = {}
+
+    for eval_idx, eval_dir in enumerate(sorted(search_dir.glob("eval-*"))):
+        metadata_path = eval_dir / "eval_metadata.json"
+        if metadata_path.exists():
+            try:
+                with open(metadata_path) as mf:
+                    eval_id = json.load(mf).get("eval_id", eval_idx)
+            except (json.JSONDecodeError, OSError):
+                eval_id = eval_idx
+        else:
+            try:
+                eval_id = int(eval_dir.name.split("-")[1])
+            except ValueError:
+                eval_id = eval_idx
+
+        for config_dir in sorted(eval_dir.iterdir()):
+            if not config_dir.is_dir():
+                continue
+            if not list(config_dir.glob("run-*")):
+                continue
+            config = config_dir.name
+            if config not in results:
+                results[config] = []
+
+            for run_dir in sorted(config_dir.glob("run-*")):
+                run_number = int(run_dir.name.split("-")[1])
+                grading_file = run_dir / "grading.json"
+
+                if not grading_file.exists():
+                    print(f"Warning: grading.json not found in {run_dir}")
+                    continue
+
+                try:
+                    with open(grading_file) as f:
+                        grading = json.load(f)
+                except json.JSONDecodeError as e:
+                    print(f"Warning: Invalid JSON in {grading_file}: {e}")
+                    continue
+
+                result = {
+                    "eval_id": eval_id,
+                    "run_number": run_number,
+                    "pass_rate": grading.get("summary", {}).get("pass_rate", 0.0),
+                    "passed": grading.get("summary", {}).get("passed", 0),
+                    "failed": grading.get("summary", {}).get("failed", 0),
+                    "total": grading.get("summary", {}).get("total", 0),
+                }
+
+                timing = grading.get("timing", {})
+                result["time_seconds"] = timing.get("total_duration_seconds", 0.0)
+                timing_file = run_dir / "timing.json"
+                if result["time_seconds"] == 0.0 and timing_file.exists():
+                    try:
+                        with open(timing_file) as tf:
+                            timing_data = json.load(tf)
+                        result["time_seconds"] = timing_data.get("total_duration_seconds", 0.0)
+                        result["tokens"] = timing_data.get("total_tokens", 0)
+                    except json.JSONDecodeError:
+                        pass
+
+                metrics = grading.get("execution_metrics", {})
+                result["tool_calls"] = metrics.get("total_tool_calls", 0)
+                if not result.get("tokens"):
+                    result["tokens"] = metrics.get("output_chars", 0)
+                result["errors"] = metrics.get("errors_encountered", 0)
+
+                raw_expectations = grading.get("expectations", [])
+                for exp in raw_expectations:
+                    if "text" not in exp or "passed" not in exp:
+                        print(f"Warning: expectation in {grading_file} missing required fields (text, passed, evidence): {exp}")
+                result["expectations"] = raw_expectations
+
+                notes_summary = grading.get("user_notes_summary", {})
+                notes = []
+                notes.extend(notes_summary.get("uncertainties", []))
+                notes.extend(notes_summary.get("needs_review", []))
+                notes.extend(notes_summary.get("workarounds", []))
+                result["notes"] = notes
+
+                results[config].append(result)
+
+    return results
+
+
+def synthesize_tree(root: Path, n_runs: int, runs_per_config: int = 3, seed: int = 0) -> None:
+    """Write a workspace-layout benchmark tree with about n_runs runs.
+
+    Two configurations per eval. A few runs exercise the edge cases: no
+    grading.json, invalid JSON, duration only in timing.json, and an
+    expectation missing its fields. Every other eval has eval_metadata.json.
+    """
+    rng = random.Random(seed)
+    n_evals = max(1, n_runs // (2 * runs_per_config))
+    for e in range(n_evals):
+        eval_dir = root / f"eval-{e}"
+        (eval_dir / "inputs").mkdir(parents=True)
+        if e % 2 == 0:
+            (eval_dir / "eval_metadata.json").write_text(json.dumps({"eval_id": e, "prompt": "Do the task " * 20}))
+        for config in ("with_skill", "without_skill"):
+            for r in range(1, runs_per_config + 1):
+                run_dir = eval_dir / config / f"run-{r}"
+                (run_dir / "outputs").mkdir(parents=True)
+                kind = rng.random()
+                if kind < 0.002:
+                    continue
+                if kind < 0.004:
+                    (run_dir / "grading.json").write_text("{not json")
+                    continue
+                total = rng.randint(3, 8)
+                passed = rng.randint(0, total)
+                expectations = [
+                    {"text": f"Expectation {i} holds " * 3, "passed": i < passed, "evidence": "Seen in output " * 10}
+                    for i in range(total)
+                ]
+                if kind < 0.006:
+                    del expectations[0]["passed"]
+                grading = {
+                    "expectations": expectations,
+                    "summary": {"passed": passed, "failed": total - passed, "total": total, "pass_rate": round(passed / total, 2)},
+                    "execution_metrics": {"total_tool_calls": rng.randint(1, 40), "output_chars": rng.randint(500, 20000), "errors_encountered": rng.randint(0, 2)},
+                    "user_notes_summary": {"uncertainties": ["unsure about one step"] if kind < 0.1 else [], "needs_review": [], "workarounds": []},
+                }
+                if kind < 0.5:
+                    (run_dir / "timing.json").write_text(json.dumps({"total_duration_seconds": round(rng.uniform(5, 120), 1), "total_tokens": rng.randint(1000, 50000)}))
+                else:
+                    grading["timing"] = {"total_duration_seconds": round(rng.uniform(5, 120), 1)}
+                (run_dir / "grading.json").write_text(json.dumps(grading, indent=2))
+
+
+def timed(fn, benchmark_dir: Path) -> tuple[float, dict, str]:
+    """Run fn(benchmark_dir) with stdout captured; return (seconds, result, output)."""
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        result = fn(benchmark_dir)
+    return time.perf_counter() - start, result, out.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the benchmark-directory loader against the legacy one")
+    parser.add_argument("--benchmark-dir", type=Path, default=None, help="Existing benchmark directory to load (default: a synthetic tree)")
+    parser.add_argument("--runs", type=int, default=10000, help="Runs in the synthetic tree")
+    parser.add_argument("--workers", type=int, default=None, help="Loader thread pool size (default: ThreadPoolExecutor's)")
+    parser.add_argument("--repeat", type=int, default=3, help="Take the best of this many timings")
+    args = parser.parse_args()
+
+    tmp = None
+    if args.benchmark_dir is None:
+        tmp = Path(tempfile.mkdtemp(prefix="bench-aggregate-"))
+        benchmark_dir = tmp
+        start = time.perf_counter()
+        synthesize_tree(benchmark_dir, args.runs)
+        print(f"Synthesized {args.runs} runs in {time.perf_counter() - start:.1f}s: {benchmark_dir}")
+    else:
+        benchmark_dir = args.benchmark_dir
+
+    try:
+        loaders = {
+            "legacy": legacy_load_run_results,
+            "scandir+pool": lambda d: load_run_results(d, workers=args.workers),
+        }
+        best = {}
+        outputs = {}
+        for _ in range(args.repeat):
+            for name, fn in loaders.items():
+                seconds, result, printed = timed(fn, benchmark_dir)
+                best[name] = min(best.get(name, float("inf")), seconds)
+                outputs[name] = (result, printed)
+
+        identical = outputs["legacy"] == outputs["scandir+pool"]
+        runs = sum(len(v) for v in outputs["legacy"][0].values())
+        print(f"orjson: {'yes' if aggregate_benchmark.orjson is not None else 'no'}; {runs} runs loaded; identical output: {identical}")
+        print(f"{'loader':<14} {'best s':>8}")
+        for name, seconds in best.items():
+            print(f"{name:<14} {seconds:>8.3f}")
+        print(f"speedup: {best['legacy'] / best['scandir+pool']:.1f}x")
+        if not identical:
+            raise SystemExit(1)
+    finally:
+        if tmp is not None:
+            shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
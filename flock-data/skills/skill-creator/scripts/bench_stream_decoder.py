@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Micro-benchmark StreamDecoder against the old line-splitting reader.
+
+The old reader in run_single_query grew a str buffer with `buffer += chunk`,
+split off one line at a time with `buffer.split("\\n", 1)` (copying the rest
+of the buffer per line) and ran json.loads on every line. StreamDecoder
+frames lines in place and, subscribed to TriggerDetector.EVENTS, only parses
+lines that can matter for trigger detection.
+
+Both readers consume the whole transcript in fixed-size chunks, as a worker
+would when nothing settles the trigger early, and the CPU time each needs is
+reported per transcript.
+
+Usage:
+    python -m scripts.bench_stream_decoder --transcript run.jsonl [--transcript run2.jsonl.gz]
+    python -m scripts.bench_stream_decoder --size-mb 8
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from scripts.claude_cli import TriggerDetector
+from scripts.stream_decoder import StreamDecoder
+
+
+def legacy_read(data: bytes, chunk_size: int) -> int:
+    """Decode data the way run_single_query used to; return events parsed."""
+    parsed = 0
+    buffer = ""
+    for offset in range(0, len(data), chunk_size):
+        buffer += data[offset:offset + chunk_size].decode("utf-8", errors="replace")
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            parsed += 1
+    return parsed
+
+
+def decoder_read(data: bytes, chunk_size: int) -> StreamDecoder:
+    decoder = StreamDecoder(TriggerDetector.EVENTS)
+    for offset in range(0, len(data), chunk_size):
+        decoder.feed(data[offset:offset + chunk_size])
+    decoder.flush()
+    return decoder
+
+
+def synthesize_transcript(size_mb: float, seed: int = 0) -> bytes:
+    """Build a stream-json transcript shaped like a multi-turn claude run.
+
+    Each turn streams a text block as many small deltas, a tool call as
+    input_json_delta fragments, the full assistant message, and a large
+    user tool_result (e.g. a file read), which dominates the byte count.
+    """
+    rng = random.Random(seed)
+    words = ["skill", "query", "context", "the", "file", "report", "data", "a", "to", "of"]
+    lines = [json.dumps({
+        "type": "system", "subtype": "init",
+        "tools": [f"Tool{i}" for i in range(40)],
+        "slash_commands": [f"command-{i}" for i in range(200)],
+    })]
+
+    def stream(event: dict) -> str:
+        return json.dumps({"type": "stream_event", "event": event})
+
+    target = int(size_mb * 1024 * 1024)
+    size = len(lines[0])
+    turn = 0
+    while size < target:
+        turn += 1
+        text = " ".join(rng.choice(words) for _ in range(400))
+        tool_input = json.dumps({"file_path": f"/project/src/module_{turn}.py"})
+        turn_lines = [
+            stream({"type": "message_start", "message": {"id": f"msg_{turn}", "role": "assistant"}}),
+            stream({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}),
+        ]
+        for i in range(0, len(text), 12):
+            turn_lines.append(stream({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text[i:i + 12]}}))
+        turn_lines.append(stream({"type": "content_block_stop", "index": 0}))
+        turn_lines.append(stream({"type": "content_block_start", "index": 1, "content_block": {"type": "tool_use", "id": f"toolu_{turn}", "name": "Read", "input": {}}}))
+        for i in range(0, len(tool_input), 8):
+            turn_lines.append(stream({"type": "content_block_delta", "index": 1, "delta": {"type": "input_json_delta", "partial_json": tool_input[i:i + 8]}}))
+        turn_lines.append(stream({"type": "content_block_stop", "index": 1}))
+        turn_lines.append(stream({"type": "message_delta", "delta": {"stop_reason": "tool_use"}}))
+        turn_lines.append(stream({"type": "message_stop"}))
+        turn_lines.append(json.dumps({"type": "assistant", "message": {"role": "assistant", "content": [
+            {"type": "text", "text": text},
+            {"type": "tool_use", "id": f"toolu_{turn}", "name": "Read", "input": json.loads(tool_input)},
+        ]}}))
+        file_body = "\n".join(" ".join(rng.choice(words) for _ in range(12)) for _ in range(3000))
+        turn_lines.append(json.dumps({"type": "user", "message": {"role": "user", "content": [
+            {"type": "tool_result", "tool_use_id": f"toolu_{turn}", "content": file_body},
+        ]}}))
+        lines.extend(turn_lines)
+        size += sum(len(line) + 1 for line in turn_lines)
+    lines.append(json.dumps({"type": "result", "subtype": "success", "num_turns": turn}))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def load_transcript(path: Path) -> bytes:
+    if path.suffix == ".gz":
+        with gzip.open(path, "rb") as f:
+            return f.read()
+    return path.read_bytes()
+
+
+def best_cpu_time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        best = min(best, time.process_time() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark StreamDecoder against the legacy stream-json reader")
+    parser.add_argument("--transcript", action="append", default=[], help="Recorded stream-json transcript (.jsonl or .jsonl.gz); repeatable")
+    parser.add_argument("--size-mb", type=float, default=8.0, help="Size of the synthetic transcript used when no --transcript is given")
+    parser.add_argument("--chunk-size", type=int, default=8192, help="Bytes per simulated read")
+    parser.add_argument("--repeat", type=int, default=5, help="Take the best of this many timings")
+    args = parser.parse_args()
+
+    if args.transcript:
+        transcripts = [(path, load_transcript(Path(path))) for path in args.transcript]
+    else:
+        transcripts = [(f"synthetic-{args.size_mb:g}MB", synthesize_transcript(args.size_mb))]
+
+    print(f"{'transcript':<32} {'MB':>7} {'legacy ms':>10} {'decoder ms':>11} {'speedup':>8} {'parsed':>8} {'skipped':>8}")
+    for name, data in transcripts:
+        legacy = best_cpu_time(lambda: legacy_read(data, args.chunk_size), args.repeat)
+        new = best_cpu_time(lambda: decoder_read(data, args.chunk_size), args.repeat)
+        stats = decoder_read(data, args.chunk_size).stats
+        speedup = legacy / new if new > 0 else float("inf")
+        print(
+            f"{name[-32:]:<32} {len(data) / 1e6:>7.2f} {legacy * 1000:>10.1f} {new * 1000:>11.1f}"
+            f" {speedup:>7.1f}x {stats['parsed']:>8} {stats['skipped']:>8}"
+        )
+    print("\nCPU time per worker for one full transcript (best of %d)." % args.repeat, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Score every skill in a catalog with one `claude` call per query run.
+
+run_eval installs one candidate command file and asks, per query, whether
+that one skill fired, so measuring N skills costs N passes. Here every
+skill's command file is installed in each worker root at once, each query
+is run once (per --runs-per-query), and SkillChoiceDetector records which
+skill, if any, claude picked. The skills compete for every query, as they
+do in production.
+
+The per-skill eval sets are merged by query: a query is expected to pick
+the skill whose set marks it should_trigger (any of them, if several do),
+and to pick none if no set does. Output:
+
+    {
+      "skills": [{"skill_name": ..., "description": ...}],
+      "results": [{"query": ..., "expected": "skill" | null, "acceptable": [...],
+                   "choices": {"skill": 2, "(none)": 1}, "runs": 3,
+                   "chosen": "skill", "pass": true}],
+      "confusion": {"labels": [..., "(none)"], "matrix": [[runs, ...], ...]},
+      "per_skill": {"skill": <run_eval output for that skill's own eval set>},
+      "summary": {"total": ..., "passed": ..., "failed": ..., "errored": ..., "runs": ...,
+                  "concurrency": {...}}
+    }
+
+Matrix rows are the expected label and columns the chosen one, counted in
+runs. per_skill re-scores each skill's eval set in the usual run_eval
+format, counting a run as a trigger when that skill was the one picked.
+Runs that fail after every retry pick nothing: as in run_eval they are
+counted in a result's "errors" and left out of "choices", and a query with
+no successful run is marked with "error" and not passed.
+
+The journal, cache, hedging, early stopping and session pool of run_eval
+are not used here.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections import Counter
+from contextlib import nullcontext
+from pathlib import Path
+
+from scripts.claude_cli import SkillChoiceDetector
+from scripts.concurrency import AIMDController, FairShare, QueryFailed, max_window_for
+from scripts.run_eval import (
+    WorkerRoots,
+    _query_result,
+    find_project_root,
+    run_detector_in_root,
+)
+from scripts.run_fleet import discover_skills
+from scripts.utils import parse_skill_md
+
+NONE_LABEL = "(none)"
+
+
+def merge_eval_sets(eval_sets: dict[str, list[dict]]) -> list[dict]:
+    """Combine per-skill eval sets into one list of queries with expected skills."""
+    merged: dict[str, dict] = {}
+    for skill_name, items in eval_sets.items():
+        for item in items:
+            entry = merged.setdefault(item["query"], {"query": item["query"], "acceptable": []})
+            if item["should_trigger"]:
+                entry["acceptable"].append(skill_name)
+    for entry in merged.values():
+        entry["expected"] = entry["acceptable"][0] if entry["acceptable"] else None
+    return list(merged.values())
+
+
+async def run_choice_eval_async(
+    queries: list[dict],
+    skills: list[tuple[str, str]],
+    num_workers: int,
+    timeout: int,
+    project_root: Path,
+    runs_per_query: int = 1,
+    model: str | None = None,
+    max_workers: int | None = None,
+    max_retries: int = 2,
+    claude_bin: str = "claude",
+    fair_share: FairShare | None = None,
+) -> tuple[dict[str, list[str | None]], dict[str, int], dict]:
+    """Run every query with all skills installed.
+
+    skills is a list of (skill_name, description). Returns the skill picked
+    by each run of each query (None for none), the number of runs of each
+    query that still failed after max_retries (they picked nothing, so they
+    are not among the choices) and the concurrency summary.
+    """
+    controller = AIMDController(num_workers, max_window_for(num_workers, max_workers))
+    choices: dict[str, list[str | None]] = {q["query"]: [] for q in queries}
+    errors: dict[str, int] = {q["query"]: 0 for q in queries}
+
+    with WorkerRoots(controller.max_window, skills, project_root) as roots:
+        free_roots: asyncio.Queue[str] = asyncio.Queue()
+        for root in roots.roots:
+            free_roots.put_nowait(root)
+
+        async def attempt(query: str) -> str | None:
+            async with controller.slot() as started, (
+                fair_share.slot("choice") if fair_share is not None else nullcontext()
+            ):
+                if fair_share is not None:
+                    started = asyncio.get_running_loop().time()
+                root = free_roots.get_nowait()
+                try:
+                    chosen = await run_detector_in_root(
+                        query, SkillChoiceDetector(list(roots.clean_names)), "choice", timeout, root, model, claude_bin,
+                    )
+                except QueryFailed as e:
+                    controller.on_failure(e.reason, started)
+                    raise
+                finally:
+                    free_roots.put_nowait(root)
+            controller.on_success(asyncio.get_running_loop().time() - started)
+            return roots.clean_names.get(chosen)
+
+        async def run_job(query: str) -> None:
+            attempts = 0
+            while True:
+                try:
+                    choices[query].append(await attempt(query))
+                    return
+                except QueryFailed as e:
+                    attempts += 1
+                    if attempts > max_retries:
+                        print(f"Warning: query failed: {e.reason} after {attempts} attempts", file=sys.stderr)
+                        errors[query] += 1
+                        return
+                    controller.retries += 1
+                    await asyncio.sleep(controller.backoff_delay(attempts))
+
+        jobs = [asyncio.ensure_future(run_job(q["query"])) for q in queries for _ in range(runs_per_query)]
+        try:
+            await asyncio.gather(*jobs)
+        finally:
+            for job in jobs:
+                job.cancel()
+            await asyncio.gather(*jobs, return_exceptions=True)
+
+    return choices, errors, controller.summary()
+
+
+def run_choice_eval(*args, **kwargs) -> tuple[dict[str, list[str | None]], dict[str, int], dict]:
+    """Blocking wrapper around run_choice_eval_async(); same arguments."""
+    return asyncio.run(run_choice_eval_async(*args, **kwargs))
+
+
+def format_choice_results(
+    queries: list[dict],
+    skills: list[tuple[str, str]],
+    eval_sets: dict[str, list[dict]],
+    choices: dict[str, list[str | None]],
+    trigger_threshold: float,
+    concurrency: dict,
+    errors: dict[str, int] | None = None,
+) -> dict:
+    errors = errors or {}
+    labels = [name for name, _ in skills] + [NONE_LABEL]
+    index = {label: i for i, label in enumerate(labels)}
+    matrix = [[0] * len(labels) for _ in labels]
+
+    results = []
+    for q in queries:
+        picked = [c or NONE_LABEL for c in choices[q["query"]]]
+        counts = Counter(picked)
+        for label, n in counts.items():
+            matrix[index[q["expected"] or NONE_LABEL]][index[label]] += n
+        chosen = counts.most_common(1)[0][0] if counts else NONE_LABEL
+        passed = chosen in q["acceptable"] if q["acceptable"] else chosen == NONE_LABEL
+        result = {
+            "query": q["query"],
+            "expected": q["expected"],
+            "acceptable": q["acceptable"],
+            "choices": dict(counts),
+            "runs": len(picked),
+            "chosen": None if chosen == NONE_LABEL else chosen,
+            "pass": passed,
+        }
+        failed_runs = errors.get(q["query"], 0)
+        if failed_runs:
+            result["errors"] = failed_runs
+            if not picked:
+                # Nothing was measured, so there is nothing to score
+                result["error"] = f"all {failed_runs} runs failed"
+                result["pass"] = False
+        results.append(result)
+
+    descriptions = dict(skills)
+    per_skill = {}
+    for skill_name, items in eval_sets.items():
+        skill_results = [
+            _query_result(
+                item, [c == skill_name for c in choices[item["query"]]], trigger_threshold, errors.get(item["query"], 0),
+            )
+            for item in items
+        ]
+        skill_passed = sum(1 for r in skill_results if r["pass"])
+        per_skill[skill_name] = {
+            "skill_name": skill_name,
+            "description": descriptions[skill_name],
+            "results": skill_results,
+            "summary": {
+                "total": len(skill_results),
+                "passed": skill_passed,
+                "failed": len(skill_results) - skill_passed,
+                "errored": sum(1 for r in skill_results if "error" in r),
+            },
+        }
+
+    passed = sum(1 for r in results if r["pass"])
+    return {
+        "skills": [{"skill_name": name, "description": description} for name, description in skills],
+        "results": results,
+        "confusion": {"labels": labels, "matrix": matrix},
+        "per_skill": per_skill,
+        "summary": {
+            "total": len(results),
+            "passed": passed,
+            "failed": len(results) - passed,
+            "errored": sum(1 for r in results if "error" in r),
+            "runs": sum(r["runs"] for r in results),
+            "concurrency": concurrency,
+        },
+    }
+
+
+def format_confusion(confusion: dict) -> str:
+    """Plain-text table of a confusion matrix (rows expected, columns chosen)."""
+    labels = confusion["labels"]
+    corner = "expected \\ chosen"
+    width = max(len(label) for label in labels + [corner])
+    columns = [max(len(label), 4) for label in labels]
+    lines = [corner.ljust(width) + "  " + "  ".join(label.rjust(w) for label, w in zip(labels, columns))]
+    for label, row in zip(labels, confusion["matrix"]):
+        lines.append(label.ljust(width) + "  " + "  ".join(str(n).rjust(w) for n, w in zip(row, columns)))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate which skill each query triggers, with all skills installed at once")
+    parser.add_argument("--skills-root", default=str(Path(__file__).resolve().parents[2]), help="Directory whose subdirectories are skills (default: the catalog this script lives in)")
+    parser.add_argument("--eval-dir", default=None, help="Directory of <skill>.json eval sets (default: each skill's evals/trigger_eval.json)")
+    parser.add_argument("--skill", action="append", default=None, help="Only install this skill (directory name); repeatable")
+    parser.add_argument("--num-workers", type=int, default=10, help="Number of concurrent claude processes to start with")
+    parser.add_argument("--max-workers", type=int, default=None, help="Let adaptive concurrency grow up to this many claude processes (default: twice --num-workers)")
+    parser.add_argument("--timeout", type=int, default=30, help="Timeout per query in seconds")
+    parser.add_argument("--runs-per-query", type=int, default=3, help="Number of runs per query")
+    parser.add_argument("--trigger-threshold", type=float, default=0.5, help="Trigger rate threshold for the per-skill scores")
+    parser.add_argument("--max-retries", type=int, default=2, help="Retry a run this many times after a timeout, crash or rate limit")
+    parser.add_argument("--model", default=None, help="Model to use for claude -p (default: user's configured model)")
+    parser.add_argument("--claude-bin", default="claude", help="Executable to run instead of claude (e.g. scripts/fake_claude.py)")
+    parser.add_argument("--verbose", action="store_true", help="Print the confusion matrix and per-skill scores to stderr")
+    args = parser.parse_args()
+
+    found = discover_skills(Path(args.skills_root), Path(args.eval_dir) if args.eval_dir else None, args.skill)
+    skills = []
+    eval_sets = {}
+    for skill in found:
+        name, description, _ = parse_skill_md(skill["skill_path"])
+        skills.append((name, description))
+        if skill["eval_set"] is not None:
+            eval_sets[name] = json.loads(skill["eval_set"].read_text())
+    if not eval_sets:
+        print("Error: None of the skills has an eval set", file=sys.stderr)
+        sys.exit(1)
+
+    queries = merge_eval_sets(eval_sets)
+    if args.verbose:
+        print(f"Installing {len(skills)} skills; {len(queries)} queries from {len(eval_sets)} eval sets", file=sys.stderr)
+
+    choices, errors, concurrency = run_choice_eval(
+        queries,
+        skills,
+        num_workers=args.num_workers,
+        timeout=args.timeout,
+        project_root=find_project_root(),
+        runs_per_query=args.runs_per_query,
+        model=args.model,
+        max_workers=args.max_workers,
+        max_retries=args.max_retries,
+        claude_bin=args.claude_bin,
+    )
+    output = format_choice_results(queries, skills, eval_sets, choices, args.trigger_threshold, concurrency, errors)
+
+    if args.verbose:
+        summary = output["summary"]
+        separate = sum(len(items) for items in eval_sets.values()) * args.runs_per_query
+        print(f"Results: {summary['passed']}/{summary['total']} queries picked the expected skill", file=sys.stderr)
+        print(f"Runs: {summary['runs']} (separate per-skill evals: {separate})\n", file=sys.stderr)
+        print(format_confusion(output["confusion"]), file=sys.stderr)
+        print(file=sys.stderr)
+        for name, result in output["per_skill"].items():
+            print(f"{name}: {result['summary']['passed']}/{result['summary']['total']} passed", file=sys.stderr)
+
+    print(json.dumps(output, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Helpers shared by every script that drives the `claude` CLI.
+
+Kept free of imports from the eval scripts, so run_eval, session_pool and
+choice_eval can all build on it without importing each other.
+"""
+
+import os
+import subprocess
+from functools import lru_cache
+
+from scripts.stream_decoder import StreamEvent
+
+# Bump whenever TriggerDetector's notion of "triggered" changes, so cached
+# results recorded under the old detection logic are no longer reused.
+TRIGGER_DETECTION_VERSION = 1
+
+# Bytes requested per read from a claude child's stdout.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def claude_env() -> dict[str, str]:
+    """Return the environment for nested `claude` subprocesses.
+
+    Remove CLAUDECODE env var to allow nesting claude -p inside a
+    Claude Code session. The guard is for interactive terminal conflicts;
+    programmatic subprocess usage is safe.
+    """
+    return {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
+
+
+@lru_cache(maxsize=None)
+def claude_version(claude_bin: str = "claude") -> str:
+    """`claude --version` output, or "unknown" if it can't be run."""
+    try:
+        result = subprocess.run([claude_bin, "--version"], capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return "unknown"
+    return result.stdout.strip() if result.returncode == 0 else "unknown"
+
+
+class SkillChoiceDetector:
+    """Decide from claude's stream events which installed skill, if any, was used.
+
+    Feed StreamEvents (see stream_decoder.py) in order. feed() returns the
+    chosen clean name ("" for none) as soon as the outcome is known, and
+    None while it is still undecided. EVENTS lists the kinds the detector
+    looks at; decoders can subscribe to just these and skip everything else.
+    """
+
+    EVENTS = (
+        "tool_use_start",
+        "input_json_delta",
+        "content_block_stop",
+        "message_stop",
+        "assistant",
+        "result",
+    )
+
+    def __init__(self, clean_names: list[str]):
+        self.clean_names = list(clean_names)
+        self.chosen = ""
+        # Track state for stream event detection
+        self.pending_tool_name: str | None = None
+        self.accumulated_json = ""
+
+    @property
+    def triggered(self) -> bool:
+        return bool(self.chosen)
+
+    def _match(self, text: str) -> str:
+        return next((name for name in self.clean_names if name in text), "")
+
+    def feed(self, event: StreamEvent) -> str | None:
+        kind, data = event
+
+        # Early detection via stream events
+        if kind == "tool_use_start":
+            tool_name = data.get("content_block", {}).get("name", "")
+            if tool_name in ("Skill", "Read"):
+                self.pending_tool_name = tool_name
+                self.accumulated_json = ""
+            else:
+                return ""
+
+        elif kind == "input_json_delta" and self.pending_tool_name:
+            self.accumulated_json += data.get("delta", {}).get("partial_json", "")
+            match = self._match(self.accumulated_json)
+            if match:
+                self.chosen = match
+                return match
+
+        elif kind in ("content_block_stop", "message_stop"):
+            if self.pending_tool_name:
+                self.chosen = self._match(self.accumulated_json)
+                return self.chosen
+            if kind == "message_stop":
+                return ""
+
+        # Fallback: full assistant message
+        elif kind == "assistant":
+            message = data.get("message", {})
+            for content_item in message.get("content", []):
+                if content_item.get("type") != "tool_use":
+                    continue
+                tool_name = content_item.get("name", "")
+                tool_input = content_item.get("input", {})
+                if tool_name == "Skill":
+                    self.chosen = self.chosen or self._match(tool_input.get("skill", ""))
+                elif tool_name == "Read":
+                    self.chosen = self.chosen or self._match(tool_input.get("file_path", ""))
+                return self.chosen
+
+        elif kind == "result":
+            return self.chosen
+
+        return None
+
+    def outcome(self):
+        """Result when the stream ends without a decision."""
+        return self.chosen
+
+
+class TriggerDetector(SkillChoiceDetector):
+    """Decide from claude's stream events whether the skill triggered.
+
+    A SkillChoiceDetector for a single skill whose decisions are True/False.
+    """
+
+    def __init__(self, clean_name: str):
+        super().__init__([clean_name])
+        self.clean_name = clean_name
+
+    def feed(self, event: StreamEvent) -> bool | None:
+        decision = super().feed(event)
+        return None if decision is None else bool(decision)
+
+    def outcome(self) -> bool:
+        return self.triggered
+
+
+# Decoder subscription for one trigger run: what TriggerDetector needs, plus
+# system events (to spot rate limiting) and content_block_start (for tracing).
+RUN_EVENTS = TriggerDetector.EVENTS + ("content_block_start", "system")
+
+RATE_LIMIT_MARKERS = ("rate_limit", "rate limit", "overloaded", "429", "529")
+
+
+def is_rate_limit_event(event: StreamEvent) -> bool:
+    """Whether a stream event reports an API rate-limit/overload error."""
+    kind, data = event
+    if kind == "system":
+        return data.get("subtype") == "api_retry"
+    if kind == "assistant":
+        error = str(data.get("error") or "")
+    elif kind == "result" and data.get("is_error"):
+        error = f"{data.get('subtype', '')} {data.get('result', '')}"
+    else:
+        return False
+    error = error.lower()
+    return any(marker in error for marker in RATE_LIMIT_MARKERS)
@@ -0,0 +1,289 @@
+"""Adaptive (AIMD) concurrency control for run_eval.
+
+A fixed --num-workers either under-uses the available quota or trips rate
+limits, and the resulting timeouts used to be scored as non-triggers. The
+AIMDController instead treats the number of in-flight `claude` processes as
+a congestion window, in the style of TCP:
+
+- Slow start: until the first failure, every success grows the window by 1.
+- Additive increase: afterwards, the window grows by about 1 for each full
+  window of successful runs, as long as latency stays within latency_slack
+  of the best smoothed latency seen so far.
+- Multiplicative decrease: a timeout, a non-zero exit or a rate-limit error
+  shrinks the window by `decrease`. Only runs started after the last
+  decrease can trigger another, so one burst of failures counts once.
+
+Failed runs are retried by the caller after backoff_delay().
+
+HedgePolicy covers the opposite problem, a single straggler holding up a
+batch: it learns latency percentiles and says when a slow run should be
+raced against a duplicate.
+
+FairShare caps the total number of runs across several evals running at
+once (e.g. one loop per skill in run_fleet.py, each on its own thread and
+event loop), granting freed slots round-robin between them.
+"""
+
+import asyncio
+import bisect
+import math
+import random
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+
+
+class QueryFailed(Exception):
+    """A run ended without a usable answer and is worth retrying.
+
+    reason is "timeout", "exit" (non-zero exit or session died before a
+    decision), "rate_limit" or "spawn" (the executable could not be started).
+    """
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def max_window_for(num_workers: int, max_workers: int | None = None) -> int:
+    """Ceiling for a window that starts at num_workers.
+
+    max_workers if given, else twice the starting window, so additive
+    increase has room to find spare quota.
+    """
+    return max_workers or 2 * num_workers
+
+
+class AIMDController:
+    """Congestion window over concurrent runs, bounded by [min_window, max_window]."""
+
+    def __init__(
+        self,
+        initial_window: int,
+        max_window: int,
+        min_window: int = 1,
+        decrease: float = 0.5,
+        latency_slack: float = 2.0,
+    ):
+        self.min_window = min_window
+        self.max_window = max(max_window, min_window)
+        self.window = float(min(max(initial_window, min_window), self.max_window))
+        self.decrease = decrease
+        self.latency_slack = latency_slack
+
+        self.in_flight = 0
+        self.slow_start = True
+        self.peak_window = self.window
+        self.decreases = 0
+        self.retries = 0
+        self.failures: dict[str, int] = {}
+        self._latency_ewma: float | None = None
+        self._best_latency: float | None = None
+        self._last_decrease = 0.0
+        self._changed: asyncio.Condition | None = None
+
+    def _condition(self) -> asyncio.Condition:
+        # Created lazily so the controller is not tied to an event loop
+        # before the first run_eval actually starts.
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one unit of the window; yields the loop time the slot started."""
+        changed = self._condition()
+        async with changed:
+            await changed.wait_for(lambda: self.in_flight < int(self.window))
+            self.in_flight += 1
+        try:
+            yield asyncio.get_running_loop().time()
+        finally:
+            async with changed:
+                self.in_flight -= 1
+                changed.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        if self._latency_ewma is None:
+            self._latency_ewma = latency
+        else:
+            self._latency_ewma = 0.8 * self._latency_ewma + 0.2 * latency
+        if self._best_latency is None or self._latency_ewma < self._best_latency:
+            self._best_latency = self._latency_ewma
+
+        if self._latency_ewma > self.latency_slack * self._best_latency:
+            # Latency is climbing: hold the window rather than push harder.
+            return
+        if self.slow_start:
+            self.window += 1
+        else:
+            self.window += 1 / self.window
+        self.window = min(self.window, self.max_window)
+        self.peak_window = max(self.peak_window, self.window)
+        self._wake()
+
+    def on_failure(self, reason: str, started: float) -> None:
+        self.failures[reason] = self.failures.get(reason, 0) + 1
+        if started < self._last_decrease:
+            # Started under the old, larger window; already accounted for.
+            return
+        self.slow_start = False
+        self.window = max(self.min_window, self.window * self.decrease)
+        self.decreases += 1
+        self._last_decrease = asyncio.get_running_loop().time()
+
+    def _wake(self) -> None:
+        changed = self._condition()
+
+        async def notify():
+            async with changed:
+                changed.notify_all()
+
+        asyncio.ensure_future(notify())
+
+    @staticmethod
+    def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+        """Full-jitter exponential backoff for the given retry attempt (1-based)."""
+        return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+    def summary(self) -> dict:
+        return {
+            "window": round(self.window, 2),
+            "peak_window": round(self.peak_window, 2),
+            "max_window": self.max_window,
+            "decreases": self.decreases,
+            "retries": self.retries,
+            "failures": dict(self.failures),
+        }
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    # Nearest-rank percentile
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class HedgePolicy:
+    """Latency-aware deadlines for hedging slow runs.
+
+    Latencies of successful runs are collected per query and overall, from
+    earlier runs (e.g. a journal) and from the current batch. A run that is
+    still going after its query's percentile deadline (or the overall one,
+    while the query has fewer than min_samples) gets a hedged duplicate;
+    the first to finish wins and the other is killed. No more than
+    max_ratio of all runs are hedged, which bounds the extra spend.
+    """
+
+    def __init__(self, percentile: float = 90.0, min_samples: int = 5, max_ratio: float = 0.1):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_ratio = max_ratio
+        self._by_query: dict[str, list[float]] = {}
+        self._all: list[float] = []
+        self.runs = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.time_saved = 0.0
+
+    def observe(self, query: str, latency: float) -> None:
+        bisect.insort(self._by_query.setdefault(query, []), latency)
+        bisect.insort(self._all, latency)
+
+    def deadline(self, query: str) -> float | None:
+        """Seconds after which a run of query should be hedged (None: not yet known)."""
+        samples = self._by_query.get(query, [])
+        if len(samples) < self.min_samples:
+            samples = self._all
+        if len(samples) < self.min_samples:
+            return None
+        return _percentile(samples, self.percentile)
+
+    def allow_hedge(self) -> bool:
+        return self.hedges < self.max_ratio * max(self.runs, 1)
+
+    def summary(self) -> dict:
+        return {
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "time_saved": round(self.time_saved, 2),
+        }
+
+
+class FairShare:
+    """Global limit on concurrent runs, shared fairly between tenants.
+
+    Thread-safe and usable from several event loops at once. While slots
+    are contended, each freed slot goes to the next tenant (round-robin)
+    that has a run waiting, so a tenant with a long queue cannot starve
+    the others; within a tenant, waiters are served in order.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.in_use = 0
+        self.peak = 0
+        self.granted: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._waiters: dict[str, deque] = {}
+        # Tenants with waiters, in the order they get their next slot
+        self._turns: deque[str] = deque()
+
+    @asynccontextmanager
+    async def slot(self, tenant: str):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.in_use < self.capacity and not self._turns:
+                self._take(tenant)
+                waiter = None
+            else:
+                waiter = loop.create_future()
+                queue = self._waiters.setdefault(tenant, deque())
+                if not queue:
+                    self._turns.append(tenant)
+                queue.append((loop, waiter))
+        if waiter is not None:
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                with self._lock:
+                    queue = self._waiters.get(tenant)
+                    if queue and (loop, waiter) in queue:
+                        queue.remove((loop, waiter))
+                        if not queue:
+                            self._turns.remove(tenant)
+                        waiter = None
+                if waiter is not None and waiter.done() and not waiter.cancelled():
+                    # Granted just as we were cancelled: pass the slot on
+                    self._release()
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _take(self, tenant: str) -> None:
+        self.in_use += 1
+        self.peak = max(self.peak, self.in_use)
+        self.granted[tenant] = self.granted.get(tenant, 0) + 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_use -= 1
+            if not self._turns:
+                return
+            tenant = self._turns.popleft()
+            queue = self._waiters[tenant]
+            loop, waiter = queue.popleft()
+            if queue:
+                self._turns.append(tenant)
+            self._take(tenant)
+        loop.call_soon_threadsafe(self._grant, waiter)
+
+    def _grant(self, waiter: asyncio.Future) -> None:
+        if waiter.cancelled():
+            self._release()
+        else:
+            waiter.set_result(None)
+
+    def summary(self) -> dict:
+        return {"capacity": self.capacity, "peak": self.peak, "granted": dict(self.granted)}
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""Local stand-in for the `claude` CLI, for exercising run_eval offline.
+
+Point run_eval or run_loop at it with --claude-bin:
+
+    python -m scripts.run_eval --eval-set evals.json --skill-path my-skill \\
+        --claude-bin scripts/fake_claude.py --num-workers 1000
+
+It understands the two ways the trigger eval drives claude: `-p <query>
+--output-format stream-json` (backend "process"), and `--input-format
+stream-json` with user messages, `/clear` and interrupt control requests
+on stdin (backend "pool"). A `-p` with the prompt on stdin is answered as
+an improve_description call (see run_improver_mode), and `--version`
+reports a fixed version. The candidate skill is read from the command
+file in the working directory's .claude/commands/, as the real CLI would.
+With several command files installed (choice_eval.py), each run picks at
+most one of them.
+
+Each run either replays a recorded transcript or synthesizes one:
+
+- FAKE_CLAUDE_TRANSCRIPTS=<dir>: replay a transcript recorded by
+  `run_eval --record-transcripts <dir>` for the same query, with the
+  recorded skill name swapped for the current one and the recorded line
+  timings (scaled by FAKE_CLAUDE_SPEED, default 1; 0 = no delays).
+  Recorded failures replay as failures.
+- Otherwise, synthesize: trigger with a probability from the JSON model in
+  FAKE_CLAUDE_MODEL (defaults below), after a first-byte and a decision
+  latency drawn from configurable distributions, optionally injecting
+  timeouts, crashes and rate limits.
+
+    {
+      "seed": 0,
+      "trigger_probability": 0.5,
+      "queries": {"exact query text": 0.9},
+      "patterns": [{"match": "regex", "p": 0.8}],
+      "latency": {
+        "first_byte": {"dist": "lognormal", "median": 0.3, "sigma": 0.5},
+        "decision": {"dist": "uniform", "low": 0.5, "high": 2.0},
+        "clear": 0
+      },
+      "failures": {"timeout": 0.0, "exit": 0.0, "rate_limit": 0.0},
+      "sticky": false,
+      "ignore_clear": false,
+      "skills": {"skill-name": {"trigger_probability": 0.1, "patterns": [...]}},
+      "by_description": [{"match": "regex", "trigger_probability": 0.9, "queries": {...}}]
+    }
+
+A latency is a number (fixed seconds) or {"dist": "fixed" | "uniform" |
+"exponential" | "lognormal", ...} with value / low, high / mean / median,
+sigma; "clear" is how long a session takes to answer `/clear`.
+Probabilities come from "queries", then the first matching
+"patterns" entry, then "trigger_probability"; a skill listed under "skills"
+(by name, without the unique suffix) uses its own entries first. With
+several skills installed, a run uses one of them with probability
+1 - prod(1 - p_skill), picking a skill in proportion to its p_skill.
+The first "by_description" entry whose regex matches the installed
+description overrides the model's top-level keys, so descriptions can be
+made to score differently.
+
+In session mode `/clear` is handled locally like the real CLI does: a
+`conversation_reset` event, then a result marked local_command "clear".
+"sticky" models context leaking between queries: once a run uses a skill,
+every later run in the same conversation uses it too, until `/clear`.
+"ignore_clear" answers `/clear` as an ordinary prompt instead, so the
+conversation is never reset.
+
+Runs are deterministic: the n-th run of a given (description, query) draws
+from a generator seeded with (seed, description, query, n). n is claimed
+atomically from a counter directory, FAKE_CLAUDE_STATE (default: a
+fake-claude-state directory in the system temp dir); remove it to replay
+the same draws again. In replay mode n also picks which recording is used.
+"""
+
+import hashlib
+import json
+import math
+import os
+import queue
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run by path as an executable: make `scripts` importable.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.transcripts import TranscriptStore
+
+DEFAULT_MODEL = {
+    "seed": 0,
+    "trigger_probability": 0.5,
+    "queries": {},
+    "patterns": [],
+    "latency": {
+        "first_byte": {"dist": "lognormal", "median": 0.3, "sigma": 0.5},
+        "decision": {"dist": "uniform", "low": 0.5, "high": 2.0},
+    },
+    "failures": {},
+}
+
+
+def load_model() -> dict:
+    model = dict(DEFAULT_MODEL)
+    path = os.environ.get("FAKE_CLAUDE_MODEL")
+    if path:
+        model.update(json.loads(Path(path).read_text()))
+    return model
+
+
+def find_skills(cwd: Path) -> list[tuple[str, str]]:
+    """Return (clean_name, description) of every command file under cwd, by name."""
+    commands = sorted((cwd / ".claude" / "commands").glob("*.md"))
+    return [(command.stem, read_description(command)) for command in commands]
+
+
+def read_description(command: Path) -> str:
+    description_lines = []
+    in_description = False
+    for line in command.read_text().splitlines()[1:]:
+        if line == "---":
+            break
+        if line.startswith("description: |"):
+            in_description = True
+        elif in_description and line.startswith("  "):
+            description_lines.append(line[2:])
+    return "\n".join(description_lines)
+
+
+def claim_run_index(seed: int, description: str, query: str) -> int:
+    """Atomically claim the next run number for (seed, description, query)."""
+    state = Path(os.environ.get("FAKE_CLAUDE_STATE") or Path(tempfile.gettempdir()) / "fake-claude-state")
+    key = hashlib.sha256(f"{seed}\0{description}\0{query}".encode("utf-8")).hexdigest()[:24]
+    directory = state / key
+    directory.mkdir(parents=True, exist_ok=True)
+    n = 0
+    while True:
+        try:
+            os.close(os.open(directory / str(n), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return n
+        except FileExistsError:
+            n += 1
+
+
+def draw(spec, rng: random.Random) -> float:
+    if isinstance(spec, (int, float)):
+        return float(spec)
+    dist = spec.get("dist", "fixed")
+    if dist == "fixed":
+        return float(spec["value"])
+    if dist == "uniform":
+        return rng.uniform(spec["low"], spec["high"])
+    if dist == "exponential":
+        return rng.expovariate(1 / spec["mean"])
+    if dist == "lognormal":
+        return rng.lognormvariate(math.log(spec["median"]), spec["sigma"])
+    raise ValueError(f"Unknown latency distribution: {dist}")
+
+
+def trigger_probability(model: dict, query: str, clean_name: str = "") -> float:
+    skill = model.get("skills", {}).get(clean_name.rsplit("-skill-", 1)[0])
+    for source in ([skill] if skill else []) + [model]:
+        if query in source.get("queries", {}):
+            return source["queries"][query]
+        for rule in source.get("patterns", []):
+            if re.search(rule["match"], query, re.IGNORECASE):
+                return rule["p"]
+    return (skill or {}).get("trigger_probability", model["trigger_probability"])
+
+
+def choose_skill(model: dict, query: str, clean_names: list[str], rng: random.Random) -> str:
+    """Clean name of the skill one run uses, or "" (a single draw from rng)."""
+    probabilities = [trigger_probability(model, query, name) for name in clean_names]
+    p_none = math.prod(1 - p for p in probabilities)
+    roll = rng.random()
+    if roll >= 1 - p_none:
+        return ""
+    # Spread the trigger mass over the skills in proportion to their p
+    point = roll / (1 - p_none) * sum(probabilities)
+    for name, p in zip(clean_names, probabilities):
+        if point < p:
+            return name
+        point -= p
+    return clean_names[-1]
+
+
+def stream(event: dict) -> dict:
+    return {"type": "stream_event", "event": event}
+
+
+def synthesize(
+    model: dict, query: str, clean_names: list[str], rng: random.Random, carried: str = "",
+) -> tuple[list, str, str]:
+    """Build one run as [(offset, event dict)] plus its outcome and the skill it used.
+
+    carried, if set, is a skill the conversation already used; the run
+    uses it again instead of drawing one.
+    """
+    first_byte = draw(model["latency"]["first_byte"], rng)
+    decision = first_byte + draw(model["latency"]["decision"], rng)
+    events = [(first_byte, {"type": "system", "subtype": "init", "slash_commands": list(clean_names)})]
+
+    roll = rng.random()
+    for reason in ("timeout", "exit", "rate_limit"):
+        p = model["failures"].get(reason, 0.0)
+        if roll < p:
+            if reason == "rate_limit":
+                events.append((decision, {"type": "system", "subtype": "api_retry", "error": "rate_limit"}))
+                events.append((decision, {
+                    "type": "result", "subtype": "error_during_execution", "is_error": True,
+                    "result": "API Error: 429 rate_limit_error",
+                }))
+            return events, reason, ""
+        roll -= p
+
+    clean_name = carried or (choose_skill(model, query, clean_names, rng) if clean_names else "")
+    triggered = bool(clean_name)
+    events.append((first_byte, stream({"type": "message_start", "message": {"role": "assistant"}})))
+    if triggered:
+        tool_input = json.dumps({"skill": clean_name})
+        events.append((decision, stream({
+            "type": "content_block_start", "index": 0,
+            "content_block": {"type": "tool_use", "id": "toolu_fake", "name": "Skill", "input": {}},
+        })))
+        events.append((decision, stream({
+            "type": "content_block_delta", "index": 0,
+            "delta": {"type": "input_json_delta", "partial_json": tool_input},
+        })))
+        events.append((decision, stream({"type": "content_block_stop", "index": 0})))
+        content = [{"type": "tool_use", "id": "toolu_fake", "name": "Skill", "input": {"skill": clean_name}}]
+    else:
+        events.append((decision, stream({
+            "type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""},
+        })))
+        events.append((decision, stream({
+            "type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Sure."},
+        })))
+        events.append((decision, stream({"type": "content_block_stop", "index": 0})))
+        content = [{"type": "text", "text": "Sure."}]
+    events.append((decision, stream({"type": "message_stop"})))
+    events.append((decision, {"type": "assistant", "message": {"role": "assistant", "content": content}}))
+    events.append((decision, {"type": "result", "subtype": "success", "is_error": False, "result": ""}))
+    return events, "triggered" if triggered else "not_triggered", clean_name
+
+
+def replay(store: TranscriptStore, query: str, clean_name: str, n: int, speed: float) -> tuple[list, str]:
+    """Load the n-th recording of query (cycling) as [(offset, raw line)] plus its outcome."""
+    paths = store.transcripts(query)
+    if not paths:
+        raise SystemExit(f"fake_claude: no recorded transcript for query: {query[:80]}")
+    header, lines = store.read(paths[n % len(paths)])
+    recorded = header["clean_name"].encode("utf-8")
+    current = clean_name.encode("utf-8")
+    events = [
+        (offset * speed, line.replace(recorded, current))
+        for offset, line in zip(header["offsets"], lines)
+    ]
+    return events, header["outcome"]
+
+
+class Output:
+    """Serialized, flushed writes of stream-json lines to stdout."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def write(self, line) -> None:
+        if isinstance(line, dict):
+            line = json.dumps(line).encode("utf-8")
+        with self._lock:
+            sys.stdout.buffer.write(line + b"\n")
+            sys.stdout.buffer.flush()
+
+
+def ends_turn(events: list) -> bool:
+    """Whether the last event is the turn's `result` (recordings may stop earlier)."""
+    if not events:
+        return False
+    last = events[-1][1]
+    if isinstance(last, bytes):
+        try:
+            last = json.loads(last)
+        except json.JSONDecodeError:
+            return False
+    return isinstance(last, dict) and last.get("type") == "result"
+
+
+def play(events: list, outcome: str, out: Output, interrupted: threading.Event) -> str:
+    """Emit events on schedule. Returns "interrupted", "done" or a failure outcome."""
+    start = time.monotonic()
+    for offset, line in events:
+        if interrupted.wait(max(0.0, offset - (time.monotonic() - start))):
+            return "interrupted"
+        out.write(line)
+    if outcome == "timeout":
+        # Hang until killed (process mode) or interrupted (session mode).
+        interrupted.wait()
+        return "interrupted"
+    if outcome in ("exit", "rate_limit"):
+        return outcome
+    return "done"
+
+
+class Run:
+    """Plans runs for one fake process from the replay store or the model."""
+
+    def __init__(self):
+        self.model = load_model()
+        transcripts = os.environ.get("FAKE_CLAUDE_TRANSCRIPTS")
+        self.store = TranscriptStore(Path(transcripts)) if transcripts else None
+        self.speed = float(os.environ.get("FAKE_CLAUDE_SPEED", "1"))
+        skills = find_skills(Path.cwd())
+        self.clean_names = [clean_name for clean_name, _ in skills]
+        self.description = "\n".join(description for _, description in skills)
+        for rule in self.model.get("by_description", []):
+            if re.search(rule["match"], self.description, re.IGNORECASE):
+                self.model = {**self.model, **{k: v for k, v in rule.items() if k != "match"}}
+                break
+        # With "sticky", the skill this conversation has used so far
+        self.carried = ""
+
+    def plan(self, query: str) -> tuple[list, str]:
+        seed = self.model["seed"]
+        n = claim_run_index(seed, self.description, query)
+        if self.store is not None:
+            if len(self.clean_names) != 1:
+                raise SystemExit("fake_claude: replaying transcripts needs exactly one installed skill")
+            return replay(self.store, query, self.clean_names[0], n, self.speed)
+        rng = random.Random(f"{seed}\0{self.description}\0{query}\0{n}")
+        events, outcome, clean_name = synthesize(self.model, query, self.clean_names, rng, self.carried)
+        if self.model.get("sticky") and clean_name:
+            self.carried = clean_name
+        return events, outcome
+
+
+def run_print_mode(query: str) -> int:
+    out = Output()
+    events, outcome = Run().plan(query)
+    status = play(events, outcome, out, threading.Event())
+    return 1 if status in ("exit", "rate_limit") else 0
+
+
+def run_session_mode() -> int:
+    """Serve stream-json user messages from stdin until it closes."""
+    run = Run()
+    out = Output()
+    inbox: queue.Queue = queue.Queue()
+    interrupted = threading.Event()
+
+    def read_stdin():
+        for raw in sys.stdin.buffer:
+            try:
+                message = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+            if message.get("type") == "control_request":
+                if message.get("request", {}).get("subtype") == "interrupt":
+                    interrupted.set()
+                out.write({
+                    "type": "control_response",
+                    "response": {"subtype": "success", "request_id": message.get("request_id")},
+                })
+            else:
+                inbox.put(message)
+        inbox.put(None)
+
+    threading.Thread(target=read_stdin, daemon=True).start()
+    while True:
+        message = inbox.get()
+        if message is None:
+            return 0
+        if message.get("type") != "user":
+            continue
+        content = message.get("message", {}).get("content", "")
+        if isinstance(content, list):
+            content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
+        interrupted.clear()
+        if content.strip() == "/clear":
+            time.sleep(draw(run.model["latency"].get("clear", 0), random.Random()))
+            if run.model.get("ignore_clear"):
+                # Answered by the model like any prompt; the context stays
+                out.write({"type": "result", "subtype": "success", "is_error": False, "result": "", "num_turns": 1})
+                continue
+            # Run locally, as the real CLI does: no model turn
+            run.carried = ""
+            out.write({"type": "conversation_reset", "new_conversation_id": str(uuid.uuid4())})
+            out.write({
+                "type": "result", "subtype": "success", "is_error": False, "result": "",
+                "num_turns": 0, "local_command": "clear",
+            })
+            continue
+        events, outcome = run.plan(content)
+        status = play(events, outcome, out, interrupted)
+        if status == "exit":
+            return 1
+        if status == "interrupted":
+            out.write({"type": "result", "subtype": "error_during_execution", "is_error": True, "result": "Interrupted"})
+        elif not ends_turn(events):
+            out.write({"type": "result", "subtype": "success", "is_error": False, "result": ""})
+
+
+def text_response(segments: list[tuple[float, str]], chunk: int, delay: float) -> list:
+    """A streamed text-only turn as [(offset, event dict)].
+
+    Each (pause, text) segment starts pause seconds after the previous one
+    and is sent in deltas of chunk characters, delay seconds apart.
+    """
+    events = [
+        (0.0, {"type": "system", "subtype": "init"}),
+        (0.0, stream({"type": "message_start", "message": {"role": "assistant"}})),
+        (0.0, stream({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})),
+    ]
+    offset = 0.0
+    for pause, text in segments:
+        offset += pause
+        for i in range(0, len(text), chunk):
+            offset += delay
+            events.append((offset, stream({
+                "type": "content_block_delta", "index": 0,
+                "delta": {"type": "text_delta", "text": text[i:i + chunk]},
+            })))
+    text = "".join(text for _, text in segments)
+    events.append((offset, stream({"type": "content_block_stop", "index": 0})))
+    events.append((offset, stream({"type": "message_stop"})))
+    events.append((offset, {"type": "assistant", "message": {"role": "assistant", "content": [{"type": "text", "text": text}]}}))
+    events.append((offset, {"type": "result", "subtype": "success", "is_error": False, "result": text}))
+    return events
+
+
+def run_improver_mode() -> int:
+    """Answer an improve_description prompt read from stdin.
+
+    The model's "improver" entry sets the answers: the n-th prompt gets
+    descriptions[n % len] (a shortening request gets "rewrite") in
+    <new_description> tags, then "tail" after a pause of "tail_delay"
+    seconds, streamed in deltas of "chunk" characters "delay" seconds apart.
+    """
+    prompt = sys.stdin.read()
+    model = load_model()
+    improver = {
+        "descriptions": ["Use this skill for demo tasks."],
+        "rewrite": "Use this skill for demo tasks, in short.",
+        "tail": "",
+        "tail_delay": 0.0,
+        "chunk": 64,
+        "delay": 0.0,
+        **model.get("improver", {}),
+    }
+    if "Rewrite it to be under 1024 characters" in prompt:
+        description = improver["rewrite"]
+    else:
+        n = claim_run_index(model["seed"], "improver", "")
+        description = improver["descriptions"][n % len(improver["descriptions"])]
+    segments = [(0.0, f"<new_description>{description}</new_description>")]
+    if improver["tail"]:
+        segments.append((improver["tail_delay"], improver["tail"]))
+    play(text_response(segments, improver["chunk"], improver["delay"]), "done", Output(), threading.Event())
+    return 0
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    if args == ["--version"]:
+        print("0.0.0 (fake_claude)")
+        return 0
+    if "--input-format" in args and args[args.index("--input-format") + 1] == "stream-json":
+        return run_session_mode()
+    if "-p" in args:
+        query = args[args.index("-p") + 1] if args.index("-p") + 1 < len(args) else "-"
+        return run_improver_mode() if query.startswith("-") else run_print_mode(query)
+    print("fake_claude: only `-p [query]` and `--input-format stream-json` are supported", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,33 +13,8 @@ import sys
 from pathlib import Path
 
 
-def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "") -> str:
-    """Generate HTML report from loop output data. If auto_refresh is True, adds a meta refresh tag."""
-    history = data.get("history", [])
-    holdout = data.get("holdout", 0)
-    title_prefix = html.escape(skill_name + " \u2014 ") if skill_name else ""
-
-    # Get all unique queries from train and test sets, with should_trigger info
-    train_queries: list[dict] = []
-    test_queries: list[dict] = []
-    if history:
-        for r in history[0].get("train_results", history[0].get("results", [])):
-            train_queries.append({"query": r["query"], "should_trigger": r.get("should_trigger", True)})
-        if history[0].get("test_results"):
-            for r in history[0].get("test_results", []):
-                test_queries.append({"query": r["query"], "should_trigger": r.get("should_trigger", True)})
-
-    refresh_tag = '    <meta http-equiv="refresh" content="5">\n' if auto_refresh else ""
-
-    html_parts = ["""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-""" + refresh_tag + """    <title>""" + title_prefix + """Skill Description Optimization</title>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@500;600&family=Lora:wght@400;500&display=swap" rel="stylesheet">
-    <style>
+# Shared with the live report shell (live_report.py)
+REPORT_STYLE = """    <style>
         body {
             font-family: 'Lora', Georgia, serif;
             max-width: 100%;
@@ -132,6 +107,15 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
         .train-label { color: #b0aea5; font-size: 10px; }
         .test-label { color: #6a9bcc; font-size: 10px; font-weight: bold; }
         .best-row { background: #f5f8f2; }
+        .eliminated-row { opacity: 0.55; }
+        .not-run { color: #d1cfc5; }
+        .fate {
+            font-family: 'Poppins', sans-serif;
+            font-size: 10px;
+            color: #b0aea5;
+            display: block;
+            margin-top: 4px;
+        }
         th.positive-col { border-bottom: 3px solid #788c5d; }
         th.negative-col { border-bottom: 3px solid #c44; }
         th.test-col.positive-col { border-bottom: 3px solid #788c5d; }
@@ -144,7 +128,35 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
         .swatch-test { background: #6a9bcc; }
         .swatch-train { background: #141413; }
     </style>
-</head>
+"""
+
+def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "") -> str:
+    """Generate HTML report from loop output data. If auto_refresh is True, adds a meta refresh tag."""
+    history = data.get("history", [])
+    holdout = data.get("holdout", 0)
+    title_prefix = html.escape(skill_name + " \u2014 ") if skill_name else ""
+
+    # Get all unique queries from train and test sets, with should_trigger info
+    train_queries: list[dict] = []
+    test_queries: list[dict] = []
+    if history:
+        for r in history[0].get("train_results", history[0].get("results", [])):
+            train_queries.append({"query": r["query"], "should_trigger": r.get("should_trigger", True)})
+        if history[0].get("test_results"):
+            for r in history[0].get("test_results", []):
+                test_queries.append({"query": r["query"], "should_trigger": r.get("should_trigger", True)})
+
+    refresh_tag = '    <meta http-equiv="refresh" content="5">\n' if auto_refresh else ""
+
+    html_parts = ["""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+""" + refresh_tag + """    <title>""" + title_prefix + """Skill Description Optimization</title>
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@500;600&family=Lora:wght@400;500&display=swap" rel="stylesheet">
+""" + REPORT_STYLE + """</head>
 <body>
     <h1>""" + title_prefix + """Skill Description Optimization</h1>
     <div class="explainer">
@@ -217,7 +229,7 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
         test_total = h.get("test_total")
         description = h.get("description", "")
         train_results = h.get("train_results", h.get("results", []))
-        test_results = h.get("test_results", [])
+        test_results = h.get("test_results") or []
 
         # Create lookups for results by query
         train_by_query = {r["query"]: r for r in train_results}
@@ -254,17 +266,24 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
         test_class = score_class(test_correct, test_runs)
 
         row_class = "best-row" if iteration == best_iter else ""
+        if h.get("partial") and h.get("fate"):
+            row_class = "eliminated-row"
+        fate = f'<span class="fate">{html.escape(h["fate"])}</span>' if h.get("fate") else ""
 
         html_parts.append(f"""            <tr class="{row_class}">
                 <td>{iteration}</td>
                 <td><span class="score {train_class}">{train_correct}/{train_runs}</span></td>
                 <td><span class="score {test_class}">{test_correct}/{test_runs}</span></td>
-                <td class="description">{html.escape(description)}</td>
+                <td class="description">{html.escape(description)}{fate}</td>
 """)
 
         # Add result for each train query
         for qinfo in train_queries:
-            r = train_by_query.get(qinfo["query"], {})
+            r = train_by_query.get(qinfo["query"])
+            if r is None:
+                # Not evaluated (candidate eliminated or aborted early)
+                html_parts.append('                <td class="result not-run">&middot;</td>\n')
+                continue
             did_pass = r.get("pass", False)
             triggers = r.get("triggers", 0)
             runs = r.get("runs", 0)
@@ -276,7 +295,10 @@ def generate_html(data: dict, auto_refresh: bool = False, skill_name: str = "")
 
         # Add result for each test query (with different background)
         for qinfo in test_queries:
-            r = test_by_query.get(qinfo["query"], {})
+            r = test_by_query.get(qinfo["query"])
+            if r is None:
+                html_parts.append('                <td class="result test-result not-run">&middot;</td>\n')
+                continue
             did_pass = r.get("pass", False)
             triggers = r.get("triggers", 0)
             runs = r.get("runs", 0)
@@ -10,20 +10,110 @@ import argparse
 import json
 import os
 import re
+import signal
 import subprocess
 import sys
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
 
+from scripts import tracing
+from scripts.claude_cli import claude_version
+from scripts.response_cache import ResponseCache, open_response_cache
+from scripts.stream_decoder import StreamDecoder
 from scripts.utils import parse_skill_md
 
 
-def _call_claude(prompt: str, model: str | None, timeout: int = 300) -> str:
+OPEN_TAG = "<new_description>"
+CLOSE_TAG = "</new_description>"
+
+# Hard limit on description length; longer ones get truncated
+DESCRIPTION_LIMIT = 1024
+
+
+class Cancelled(Exception):
+    """An improver call was stopped through its CancelToken."""
+
+
+class CancelToken:
+    """Lets another thread stop improver calls that are in flight.
+
+    cancel() kills the claude process of every _call_claude running with
+    this token (they then raise Cancelled), and later calls with it raise
+    Cancelled without starting claude.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._processes: set[subprocess.Popen] = set()
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            processes = list(self._processes)
+        for process in processes:
+            _kill(process)
+
+    def _attach(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            if not self.cancelled:
+                self._processes.add(process)
+                return
+        _kill(process)
+
+    def _detach(self, process: subprocess.Popen) -> None:
+        with self._lock:
+            self._processes.discard(process)
+
+
+def _call_claude(
+    prompt: str,
+    model: str | None,
+    timeout: int = 300,
+    cache: ResponseCache | None = None,
+    stats: dict | None = None,
+    cancel: CancelToken | None = None,
+    on_over_limit: Callable[[str], None] | None = None,
+) -> str:
     """Run `claude -p` with the prompt on stdin and return the text response.
 
     Prompt goes over stdin (not argv) because it embeds the full SKILL.md
     body and can easily exceed comfortable argv length.
+
+    The response is streamed (stream-json with partial messages) and claude
+    is stopped as soon as </new_description> arrives, or as soon as the
+    open description is already over DESCRIPTION_LIMIT; the text then ends
+    there, with no closing tag in the second case. on_over_limit, if given,
+    is called with that partial text the moment the limit is passed, before
+    claude is stopped, so the caller can start the rewrite right away; it
+    must not block.
+
+    With a cache, a response already stored for this prompt, model and
+    CLI version is returned without calling claude; the hit or miss is
+    counted in stats ({"hits": n, "misses": n}) if given. Responses cut off
+    over the limit are not cached: they are not a complete answer.
+
+    With a cancel token, cancelling it kills claude and raises Cancelled.
     """
-    cmd = ["claude", "-p", "--output-format", "text"]
+    if cancel is not None and cancel.cancelled:
+        raise Cancelled()
+    if cache is not None:
+        key = cache.make_key(prompt, model, claude_version())
+        cached = cache.get(key)
+        if stats is not None:
+            stats["hits" if cached is not None else "misses"] += 1
+        if cached is not None:
+            return cached
+
+    cmd = [
+        "claude", "-p",
+        "--output-format", "stream-json",
+        "--verbose",
+        "--include-partial-messages",
+    ]
     if model:
         cmd.extend(["--model", model])
 
@@ -32,33 +122,273 @@ def _call_claude(prompt: str, model: str | None, timeout: int = 300) -> str:
     # programmatic subprocess usage is safe. Same pattern as run_eval.py.
     env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
 
-    result = subprocess.run(
-        cmd,
-        input=prompt,
-        capture_output=True,
-        text=True,
-        env=env,
-        timeout=timeout,
-    )
-    if result.returncode != 0:
-        raise RuntimeError(
-            f"claude -p exited {result.returncode}\nstderr: {result.stderr}"
+    with tracing.span("_call_claude", lane="improver", prompt_chars=len(prompt)), tempfile.TemporaryFile() as stderr:
+        # In its own process group, so stopping it also stops its children
+        # (which would otherwise hold stdout open)
+        process = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=stderr, env=env, start_new_session=True,
         )
-    return result.stdout
+        if cancel is not None:
+            cancel._attach(process)
+        timed_out = threading.Event()
+
+        def expire():
+            timed_out.set()
+            _kill(process)
+
+        timer = threading.Timer(timeout, expire)
+        timer.start()
+        try:
+            text, stopped = _read_response(process, prompt)
+            if stopped == "over_limit" and on_over_limit is not None:
+                on_over_limit(text)
+        finally:
+            timer.cancel()
+            # Stopping early: the rest of the response is not needed
+            if process.poll() is None:
+                _kill(process)
+            returncode = process.wait()
+            if cancel is not None:
+                cancel._detach(process)
+        if stopped is None and cancel is not None and cancel.cancelled:
+            raise Cancelled()
+        if stopped is None and timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+        if stopped is None and returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(
+                f"claude -p exited {returncode}\nstderr: {stderr.read().decode(errors='replace')}"
+            )
+    if cache is not None and stopped != "over_limit":
+        cache.put(key, text)
+    return text
+
+
+def _kill(process: subprocess.Popen) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _read_response(process: subprocess.Popen, prompt: str) -> tuple[str, str | None]:
+    """Stream the response text; stop as soon as the description is settled.
+
+    Returns (text, stopped): stopped is "closed" once </new_description>
+    has been written (text ends with it), "over_limit" once the open
+    description is already too long to need the rest, else None.
+    """
+    try:
+        process.stdin.write(prompt.encode("utf-8"))
+        process.stdin.close()
+    except BrokenPipeError:
+        pass
+
+    decoder = StreamDecoder(("content_block_delta", "result"))
+    text = ""
+    result = None
+    while True:
+        chunk = os.read(process.stdout.fileno(), 64 * 1024)
+        for event in decoder.feed(chunk) if chunk else decoder.flush():
+            if event.kind == "result":
+                result = event.data.get("result")
+                continue
+            delta = event.data.get("delta", {})
+            if delta.get("type") != "text_delta":
+                continue
+            text += delta.get("text", "")
+            close = text.find(CLOSE_TAG)
+            if close != -1:
+                return text[:close + len(CLOSE_TAG)], "closed"
+            open_ = text.find(OPEN_TAG)
+            if open_ != -1 and len(text[open_ + len(OPEN_TAG):].lstrip().lstrip('"').rstrip()) > DESCRIPTION_LIMIT + 1:
+                return text, "over_limit"
+        if not chunk:
+            # Without partial messages only the final result carries text
+            return text or (result if isinstance(result, str) else ""), None
+
+
+# Attempts kept verbatim in the prompt, and the character budget for the
+# whole history section (roughly 4 characters per token).
+HISTORY_KEEP = 3
+HISTORY_BUDGET = 12000
+
+HISTORY_HEADER = "PREVIOUS ATTEMPTS (do NOT repeat these — try something structurally different):\n\n"
+
+
+# Directions for candidates written in parallel from the same results, so
+# they don't all make the same obvious edit (candidate i gets
+# CANDIDATE_ANGLES[i % len]).
+CANDIDATE_ANGLES = (
+    "make small, targeted edits to the current description and keep what works",
+    "rewrite it around the user intents and goals the skill serves",
+    "sharpen the boundary: say what neighbouring tasks it is not for",
+    "make it as short and distinctive as you can",
+    "organize it around concrete situations and phrasings that should trigger it",
+    "start from scratch with a different sentence structure",
+)
+
+# Candidates at least this similar to a scored description are rewordings
+SIMILARITY_THRESHOLD = 0.7
+
+
+def _shingles(text: str, k: int = 2) -> set[tuple[str, ...]]:
+    """Word k-grams of the lowercased text with punctuation removed."""
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    if len(words) < k:
+        return {tuple(words)}
+    return {tuple(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def description_similarity(a: str, b: str) -> float:
+    """Jaccard similarity of two descriptions' word-bigram shingles.
+
+    Differences in case, punctuation and whitespace don't count, so
+    rewordings that only touch those score 1.0.
+    """
+    sa, sb = _shingles(a), _shingles(b)
+    return len(sa & sb) / len(sa | sb) if sa | sb else 1.0
 
 
-def improve_description(
+def _closest(description: str, others: list[str]) -> tuple[str | None, float]:
+    """The most similar of others to description, and that similarity."""
+    best, best_similarity = None, 0.0
+    for other in others:
+        similarity = description_similarity(description, other)
+        if similarity > best_similarity:
+            best, best_similarity = other, similarity
+    return best, best_similarity
+
+
+def _score_str(h: dict) -> str:
+    train_s = f"{h.get('train_passed', h.get('passed', 0))}/{h.get('train_total', h.get('total', 0))}"
+    test_s = f"{h.get('test_passed', '?')}/{h.get('test_total', '?')}" if h.get('test_passed') is not None else None
+    return f"train={train_s}" + (f", test={test_s}" if test_s else "")
+
+
+def _format_attempt(
+    h: dict, hidden: set[str] = frozenset(), hidden_label: str = "queries that passed in every attempt",
+) -> str:
+    """One <attempt> block; result lines for queries in hidden are left out."""
+    text = f'<attempt {_score_str(h)}>\n'
+    text += f'Description: "{h["description"]}"\n'
+    if "results" in h:
+        text += "Train results:\n"
+        for r in h["results"]:
+            if r["query"] in hidden:
+                continue
+            status = "PASS" if r["pass"] else "FAIL"
+            text += f'  [{status}] "{r["query"][:80]}" (triggered {r["triggers"]}/{r["runs"]})\n'
+        shown = sum(1 for r in h["results"] if r["query"] not in hidden)
+        if shown < len(h["results"]):
+            text += f"  ({len(h['results']) - shown} {hidden_label} not shown)\n"
+    if h.get("note"):
+        text += f'Note: {h["note"]}\n'
+    return text + "</attempt>\n\n"
+
+
+def format_history(history: list[dict]) -> str:
+    """Every attempt with its full per-query results (the uncompacted history)."""
+    if not history:
+        return ""
+    return HISTORY_HEADER + "".join(_format_attempt(h) for h in history)
+
+
+def compact_history(history: list[dict], keep: int = HISTORY_KEEP, budget: int = HISTORY_BUDGET) -> str:
+    """The history section of the prompt, bounded in size.
+
+    The last `keep` attempts are shown verbatim, minus result lines for
+    queries that passed in every attempt. Older attempts are reduced to
+    their score and description plus, per query that ever failed, how
+    often it passed and how often its outcome flipped between attempts.
+    If that is still over `budget` characters, fewer attempts are kept
+    verbatim, then the oldest summarized descriptions and the least
+    informative flip lines are dropped, then the summary of older attempts
+    as a whole, then the passing result lines of the current attempt. As a
+    last resort the text is cut off, so it never exceeds `budget`.
+    """
+    if not history:
+        return ""
+
+    outcomes: dict[str, list[bool]] = {}
+    for h in history:
+        for r in h.get("results", []):
+            outcomes.setdefault(r["query"], []).append(r["pass"])
+    always_passed = {q for q, passes in outcomes.items() if all(passes)} if len(history) > 1 else set()
+
+    def render(keep: int, descriptions: int, flip_lines: int, summarize: bool = True, hide_passing: bool = False) -> str:
+        older, recent = history[:-keep] if keep else history, history[-keep:] if keep else []
+        text = HISTORY_HEADER
+        if older and not summarize:
+            text += f"({len(older)} earlier attempts not shown)\n\n"
+        elif older:
+            text += f"<earlier_attempts count={len(older)}>\n"
+            shown = older[len(older) - descriptions:] if descriptions else []
+            if len(shown) < len(older):
+                text += f"({len(older) - len(shown)} oldest attempts not shown)\n"
+            for h in shown:
+                text += f'- {_score_str(h)}: "{h["description"]}"\n'
+            stats = []
+            for q in outcomes:
+                passes = [r["pass"] for h in older for r in h.get("results", []) if r["query"] == q]
+                if not passes or q in always_passed:
+                    continue
+                flips = sum(1 for a, b in zip(passes, passes[1:]) if a != b)
+                stats.append((flips, -sum(passes), q, passes))
+            stats.sort(key=lambda s: (s[0], s[1]), reverse=True)
+            if stats:
+                text += "Per-query outcomes over these attempts:\n"
+            for flips, _, q, passes in stats[:flip_lines]:
+                text += (
+                    f'  "{q[:80]}": passed {sum(passes)}/{len(passes)}, flipped {flips}x, '
+                    f'last {"PASS" if passes[-1] else "FAIL"}\n'
+                )
+            if len(stats) > flip_lines:
+                text += f"  ({len(stats) - flip_lines} more queries not shown)\n"
+            text += "</earlier_attempts>\n\n"
+        if hide_passing:
+            return text + "".join(
+                _format_attempt(h, {r["query"] for r in h.get("results", []) if r["pass"]}, "passing queries")
+                for h in recent
+            )
+        return text + "".join(_format_attempt(h, always_passed) for h in recent)
+
+    keep = min(keep, len(history))
+    descriptions = len(history)
+    text = render(keep, descriptions, len(outcomes))
+    # Shed detail until it fits, always keeping the current attempt verbatim
+    while len(text) > budget and keep > 1:
+        keep -= 1
+        text = render(keep, descriptions, len(outcomes))
+    flip_lines = len(outcomes)
+    while len(text) > budget and (descriptions > 0 or flip_lines > 0):
+        if descriptions > 0:
+            descriptions -= 1
+        else:
+            flip_lines = max(0, flip_lines - 5)
+        text = render(keep, descriptions, flip_lines)
+    if len(text) > budget:
+        text = render(keep, 0, 0, summarize=False)
+    if len(text) > budget:
+        text = render(keep, 0, 0, summarize=False, hide_passing=True)
+    if len(text) > budget:
+        marker = "\n(rest of the history cut to fit)\n\n"
+        text = text[:max(0, budget - len(marker))] + marker if budget > len(marker) else text[:budget]
+    return text
+
+
+def build_prompt(
     skill_name: str,
     skill_content: str,
     current_description: str,
     eval_results: dict,
     history: list[dict],
-    model: str,
     test_results: dict | None = None,
-    log_dir: Path | None = None,
-    iteration: int | None = None,
-) -> str:
-    """Call Claude to improve the description based on eval results."""
+    angle: str | None = None,
+    history_keep: int | None = HISTORY_KEEP,
+    history_budget: int = HISTORY_BUDGET,
+) -> tuple[str, int]:
+    """Return the improver prompt and the length it would have uncompacted."""
     failed_triggers = [
         r for r in eval_results["results"]
         if r["should_trigger"] and not r["pass"]
@@ -100,22 +430,9 @@ Current scores ({scores_summary}):
             prompt += f'  - "{r["query"]}" (triggered {r["triggers"]}/{r["runs"]} times)\n'
         prompt += "\n"
 
-    if history:
-        prompt += "PREVIOUS ATTEMPTS (do NOT repeat these — try something structurally different):\n\n"
-        for h in history:
-            train_s = f"{h.get('train_passed', h.get('passed', 0))}/{h.get('train_total', h.get('total', 0))}"
-            test_s = f"{h.get('test_passed', '?')}/{h.get('test_total', '?')}" if h.get('test_passed') is not None else None
-            score_str = f"train={train_s}" + (f", test={test_s}" if test_s else "")
-            prompt += f'<attempt {score_str}>\n'
-            prompt += f'Description: "{h["description"]}"\n'
-            if "results" in h:
-                prompt += "Train results:\n"
-                for r in h["results"]:
-                    status = "PASS" if r["pass"] else "FAIL"
-                    prompt += f'  [{status}] "{r["query"][:80]}" (triggered {r["triggers"]}/{r["runs"]})\n'
-            if h.get("note"):
-                prompt += f'Note: {h["note"]}\n'
-            prompt += "</attempt>\n\n"
+    full_history = format_history(history)
+    history_text = full_history if history_keep is None else compact_history(history, history_keep, history_budget)
+    prompt += history_text
 
     prompt += f"""</scores_summary>
 
@@ -138,65 +455,258 @@ Here are some tips that we've found to work well in writing these descriptions:
 - If you're getting lots of failures after repeated attempts, change things up. Try different sentence structures or wordings.
 
 I'd encourage you to be creative and mix up the style in different iterations since you'll have multiple opportunities to try different approaches and we'll just grab the highest-scoring one at the end. 
-
+"""
+    if angle:
+        prompt += f"""
+Several candidate descriptions are being written in parallel from these same results. For this one, {angle}.
+"""
+    prompt += """
 Please respond with only the new description text in <new_description> tags, nothing else."""
 
-    text = _call_claude(prompt, model)
+    return prompt, len(prompt) - len(history_text) + len(full_history)
 
-    match = re.search(r"<new_description>(.*?)</new_description>", text, re.DOTALL)
-    description = match.group(1).strip().strip('"') if match else text.strip().strip('"')
 
-    transcript: dict = {
-        "iteration": iteration,
-        "prompt": prompt,
-        "response": text,
-        "parsed_description": description,
-        "char_count": len(description),
-        "over_limit": len(description) > 1024,
-    }
+def _extract_description(text: str) -> str:
+    match = re.search(r"<new_description>(.*?)(?:</new_description>|$)", text, re.DOTALL)
+    return match.group(1).strip().strip('"') if match else text.strip().strip('"')
 
+
+def _shorten(
+    prompt: str,
+    description: str,
+    model: str | None,
+    transcript: dict,
+    cache: ResponseCache | None = None,
+    cancel: CancelToken | None = None,
+) -> str:
+    """Ask for a rewrite of an over-long description; record it in transcript."""
     # Safety net: the prompt already states the 1024-char hard limit, but if
     # the model blew past it anyway, make one fresh single-turn call that
     # quotes the too-long version and asks for a shorter rewrite. (The old
     # SDK path did this as a true multi-turn; `claude -p` is one-shot, so we
     # inline the prior output into the new prompt instead.)
-    if len(description) > 1024:
-        shorten_prompt = (
-            f"{prompt}\n\n"
-            f"---\n\n"
+    if transcript.get("cut_off"):
+        problem = (
+            f"A previous attempt started this description and was stopped once it "
+            f"passed the 1024-character hard limit, at {len(description)} characters:\n\n"
+            f'"{description}..."\n\n'
+        )
+    else:
+        problem = (
             f"A previous attempt produced this description, which at "
             f"{len(description)} characters is over the 1024-character hard limit:\n\n"
             f'"{description}"\n\n'
-            f"Rewrite it to be under 1024 characters while keeping the most "
-            f"important trigger words and intent coverage. Respond with only "
-            f"the new description in <new_description> tags."
         )
-        shorten_text = _call_claude(shorten_prompt, model)
-        match = re.search(r"<new_description>(.*?)</new_description>", shorten_text, re.DOTALL)
-        shortened = match.group(1).strip().strip('"') if match else shorten_text.strip().strip('"')
-
-        transcript["rewrite_prompt"] = shorten_prompt
-        transcript["rewrite_response"] = shorten_text
-        transcript["rewrite_description"] = shortened
-        transcript["rewrite_char_count"] = len(shortened)
-        description = shortened
+    shorten_prompt = (
+        f"{prompt}\n\n"
+        f"---\n\n"
+        f"{problem}"
+        f"Rewrite it to be under 1024 characters while keeping the most "
+        f"important trigger words and intent coverage. Respond with only "
+        f"the new description in <new_description> tags."
+    )
+    shorten_text = _call_claude(shorten_prompt, model, cache=cache, stats=transcript.get("response_cache"), cancel=cancel)
+    shortened = _extract_description(shorten_text)
+
+    transcript["rewrite_prompt"] = shorten_prompt
+    transcript["rewrite_response"] = shorten_text
+    transcript["rewrite_description"] = shortened
+    transcript["rewrite_char_count"] = len(shortened)
+    return shortened
+
+
+def _ask(
+    prompt: str,
+    uncompacted_chars: int,
+    model: str | None,
+    transcript: dict,
+    rewriter: ThreadPoolExecutor,
+    cache: ResponseCache | None = None,
+    cancel: CancelToken | None = None,
+    wanted: Callable[[str], bool] | None = None,
+) -> Future | None:
+    """Ask claude for a description and record the exchange in transcript.
+
+    When the response is cut off over the limit, the shortening rewrite is
+    submitted to rewriter at once, while the first claude is still being
+    stopped, and its Future is returned; otherwise None. wanted, if given,
+    can veto that rewrite for the partial description.
+    """
+    stats = {"hits": 0, "misses": 0} if cache is not None else None
+    transcript.update(prompt=prompt, prompt_chars=len(prompt), uncompacted_prompt_chars=uncompacted_chars)
+    if stats is not None:
+        transcript["response_cache"] = stats
+    rewrite: list[Future] = []
+
+    def start_rewrite(text: str) -> None:
+        description = _extract_description(text)
+        if wanted is None or wanted(description):
+            transcript["cut_off"] = True
+            rewrite.append(rewriter.submit(_shorten, prompt, description, model, transcript, cache, cancel))
+
+    text = _call_claude(prompt, model, cache=cache, stats=stats, cancel=cancel, on_over_limit=start_rewrite)
+    description = _extract_description(text)
+    transcript.update(
+        response=text,
+        parsed_description=description,
+        char_count=len(description),
+        over_limit=len(description) > DESCRIPTION_LIMIT,
+        cut_off=OPEN_TAG in text and CLOSE_TAG not in text,
+    )
+    return rewrite[0] if rewrite else None
 
-    transcript["final_description"] = description
 
+def _write_log(log_dir: Path | None, iteration: int | None, suffix: str, transcript: dict) -> None:
     if log_dir:
         log_dir.mkdir(parents=True, exist_ok=True)
-        log_file = log_dir / f"improve_iter_{iteration or 'unknown'}.json"
+        log_file = log_dir / f"improve_iter_{iteration or 'unknown'}{suffix}.json"
         log_file.write_text(json.dumps(transcript, indent=2))
 
+
+def improve_description(
+    skill_name: str,
+    skill_content: str,
+    current_description: str,
+    eval_results: dict,
+    history: list[dict],
+    model: str,
+    test_results: dict | None = None,
+    log_dir: Path | None = None,
+    iteration: int | None = None,
+    candidate: int | None = None,
+    angle: str | None = None,
+    history_keep: int | None = HISTORY_KEEP,
+    history_budget: int = HISTORY_BUDGET,
+    response_cache: ResponseCache | None = None,
+    cancel: CancelToken | None = None,
+) -> str:
+    """Call Claude to improve the description based on eval results.
+
+    When several candidates are proposed from the same results, candidate
+    numbers their log files and angle steers each one in a different
+    direction.
+
+    History is compacted with compact_history(history, history_keep,
+    history_budget); history_keep=None embeds every attempt in full.
+    With a response_cache, the transcript counts its hits and misses.
+    Cancelling cancel stops the call (see CancelToken).
+    """
+    prompt, uncompacted_chars = build_prompt(
+        skill_name, skill_content, current_description, eval_results, history,
+        test_results, angle, history_keep, history_budget,
+    )
+    transcript: dict = {"iteration": iteration}
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="improver") as rewriter:
+        rewrite = _ask(prompt, uncompacted_chars, model, transcript, rewriter, response_cache, cancel)
+        description = transcript["parsed_description"]
+        if rewrite is not None:
+            description = rewrite.result()
+        elif len(description) > DESCRIPTION_LIMIT:
+            description = _shorten(prompt, description, model, transcript, response_cache, cancel)
+    transcript["final_description"] = description
+
+    _write_log(log_dir, iteration, f"_cand{candidate}" if candidate is not None else "", transcript)
     return description
 
 
+def improve_description_candidates(
+    skill_name: str,
+    skill_content: str,
+    current_description: str,
+    eval_results: dict,
+    history: list[dict],
+    model: str,
+    n_candidates: int,
+    test_results: dict | None = None,
+    log_dir: Path | None = None,
+    iteration: int | None = None,
+    history_keep: int | None = HISTORY_KEEP,
+    history_budget: int = HISTORY_BUDGET,
+    similarity_threshold: float = SIMILARITY_THRESHOLD,
+    response_cache: ResponseCache | None = None,
+    cancel: CancelToken | None = None,
+) -> list[str]:
+    """Write n_candidates descriptions concurrently and drop near-duplicates.
+
+    Candidate i is steered by CANDIDATE_ANGLES[i % len]. A candidate is
+    dropped when it is a near-duplicate (see description_similarity) of the
+    current description, of any description in history, or of an earlier
+    candidate, so no eval pass is spent on a rewording of something already
+    scored. Only survivors over the 1024-character limit get the shortening
+    rewrite; for a response cut off over the limit, it starts as soon as the
+    cut-off is detected unless the partial description already duplicates a
+    scored one. Returns the survivors in candidate order, which is empty if
+    every candidate was a duplicate. All candidates go into one
+    improve_iter_<n>_candidates.json log. Cancelling cancel stops every
+    call (see CancelToken).
+    """
+    prompts = [
+        build_prompt(
+            skill_name, skill_content, current_description, eval_results, history,
+            test_results, CANDIDATE_ANGLES[i % len(CANDIDATE_ANGLES)], history_keep, history_budget,
+        )
+        for i in range(n_candidates)
+    ]
+    scored = [current_description] + [h["description"] for h in history]
+    transcripts = [
+        {"candidate": i, "angle": CANDIDATE_ANGLES[(i - 1) % len(CANDIDATE_ANGLES)]}
+        for i in range(1, n_candidates + 1)
+    ]
+    with (
+        ThreadPoolExecutor(max_workers=n_candidates, thread_name_prefix="improver") as pool,
+        ThreadPoolExecutor(max_workers=n_candidates, thread_name_prefix="improver") as rewriter,
+    ):
+        rewrites = list(pool.map(
+            lambda p, t: _ask(
+                p[0], p[1], model, t, rewriter, response_cache, cancel,
+                wanted=lambda d: _closest(d, scored)[1] < similarity_threshold,
+            ),
+            prompts, transcripts,
+        ))
+
+        survivors = []
+        for transcript in transcripts:
+            match, similarity = _closest(
+                transcript["parsed_description"], scored + [t["parsed_description"] for t in survivors],
+            )
+            transcript["similarity"] = round(similarity, 3)
+            if similarity >= similarity_threshold:
+                transcript["duplicate_of"] = match
+            else:
+                survivors.append(transcript)
+
+        # Shorten the survivors that need it and are not being shortened yet, concurrently
+        started = {t["candidate"]: rewrite for t, rewrite in zip(transcripts, rewrites) if rewrite is not None}
+        for t in survivors:
+            if t["over_limit"] and t["candidate"] not in started:
+                started[t["candidate"]] = rewriter.submit(
+                    _shorten, t["prompt"], t["parsed_description"], model, t, response_cache, cancel,
+                )
+        for t in survivors:
+            rewrite = started.get(t["candidate"])
+            t["final_description"] = rewrite.result() if rewrite is not None else t["parsed_description"]
+
+    _write_log(log_dir, iteration, "_candidates", {
+        "iteration": iteration,
+        "n_candidates": n_candidates,
+        "similarity_threshold": similarity_threshold,
+        "survivors": [t["candidate"] for t in survivors],
+        "candidates": transcripts,
+    })
+    return [t["final_description"] for t in survivors]
+
+
 def main():
     parser = argparse.ArgumentParser(description="Improve a skill description based on eval results")
     parser.add_argument("--eval-results", required=True, help="Path to eval results JSON (from run_eval.py)")
     parser.add_argument("--skill-path", required=True, help="Path to skill directory")
     parser.add_argument("--history", default=None, help="Path to history JSON (previous attempts)")
     parser.add_argument("--model", required=True, help="Model for improvement")
+    parser.add_argument("--history-keep", type=int, default=HISTORY_KEEP, help="Previous attempts shown verbatim; older ones are summarized")
+    parser.add_argument("--history-budget", type=int, default=HISTORY_BUDGET, help="Character budget for the history section of the prompt")
+    parser.add_argument("--full-history", action="store_true", help="Embed every previous attempt in full (no compaction)")
+    parser.add_argument("--response-cache", default=None, metavar="DIR", help="Reuse claude responses cached in DIR (default: $SKILL_CREATOR_RESPONSE_CACHE, else no cache)")
+    parser.add_argument("--no-response-cache", action="store_true", help="Always call claude, even if $SKILL_CREATOR_RESPONSE_CACHE is set")
     parser.add_argument("--verbose", action="store_true", help="Print thinking to stderr")
     args = parser.parse_args()
 
@@ -217,6 +727,7 @@ def main():
         print(f"Current: {current_description}", file=sys.stderr)
         print(f"Score: {eval_results['summary']['passed']}/{eval_results['summary']['total']}", file=sys.stderr)
 
+    response_cache = open_response_cache(args.response_cache, args.no_response_cache)
     new_description = improve_description(
         skill_name=name,
         skill_content=content,
@@ -224,8 +735,16 @@ def main():
         eval_results=eval_results,
         history=history,
         model=args.model,
+        history_keep=None if args.full_history else args.history_keep,
+        history_budget=args.history_budget,
+        response_cache=response_cache,
     )
 
+    if response_cache is not None:
+        if args.verbose:
+            print(f"Response cache: {response_cache.hits} hits, {response_cache.misses} misses", file=sys.stderr)
+        response_cache.close()
+
     if args.verbose:
         print(f"Improved: {new_description}", file=sys.stderr)
 
@@ -0,0 +1,170 @@
+"""Append-only JSONL journal that makes eval runs and loops resumable.
+
+Every completed `claude` run and every finished loop iteration is appended
+as one JSON line as soon as it is known:
+
+    {"type": "run", "description": <hash>, "model": ..., "trigger_threshold": 0.5,
+     "query": ..., "run_idx": 0, "triggered": true, "latency": 3.2}
+    {"type": "iteration", "iteration": 1, "entry": {...history entry...},
+     "next_description": "...", "exit_reason": null, "screened": [...]}
+
+"screened" holds the entries of candidates that lost to next_description
+on the train set (run_loop --n-candidates), if any. Successive halving
+(run_loop --search halving) records each round's proposals as soon as
+they are written, and each finished round:
+
+    {"type": "proposals", "round": 1, "descriptions": [...]}
+    {"type": "round", "round": 1, "entries": [...history entries...],
+     "spent": 120, "exit_reason": null}
+
+Lines are flushed to the OS immediately and fsynced in batches (every
+fsync_every records or fsync_interval seconds, and on iteration records
+and close), so a crash loses at most the last unsynced batch of runs.
+Reopening the same journal loads what it already holds: run_eval skips runs
+that are recorded for the same description, model and trigger threshold,
+and run_loop rebuilds its history from the iteration or round records. A
+torn final line from a crash (one without its newline) is dropped from the
+file before anything new is appended.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+
+def description_hash(description: str) -> str:
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()[:16]
+
+
+class Journal:
+    """One journal file, opened for appending and pre-loaded with its records."""
+
+    def __init__(self, path: Path, fsync_every: int = 64, fsync_interval: float = 1.0):
+        self.path = Path(path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.runs: dict[tuple, bool] = {}
+        # Latencies of journaled runs, per query (any description)
+        self.latencies: dict[str, list[float]] = {}
+        self.iterations: list[dict] = []
+        self.rounds: list[dict] = []
+        # round -> descriptions proposed in it
+        self.proposals: dict[int, list[str]] = {}
+        end = self._load()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        if end is not None and self._file.tell() > end:
+            self._file.truncate(end)
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _load(self) -> int | None:
+        """Load the newline-terminated records; return the offset just past the last one."""
+        if not self.path.exists():
+            return None
+        end = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                end += len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("type") == "run":
+                    # Records written before model and threshold were keyed have
+                    # neither, and never match a lookup.
+                    key = (
+                        record["description"], record.get("model"), record.get("trigger_threshold"),
+                        record["query"], record["run_idx"],
+                    )
+                    self.runs[key] = record["triggered"]
+                    self.latencies.setdefault(record["query"], []).append(record["latency"])
+                elif record.get("type") == "iteration":
+                    self.iterations.append(record)
+                elif record.get("type") == "round":
+                    self.rounds.append(record)
+                elif record.get("type") == "proposals":
+                    self.proposals[record["round"]] = record["descriptions"]
+        return end
+
+    def lookup_run(
+        self, description: str, query: str, run_idx: int, model: str | None, trigger_threshold: float,
+    ) -> bool | None:
+        """Recorded outcome of a run under these settings, or None if it has not completed yet."""
+        return self.runs.get((description_hash(description), model, trigger_threshold, query, run_idx))
+
+    def record_run(
+        self,
+        description: str,
+        query: str,
+        run_idx: int,
+        model: str | None,
+        trigger_threshold: float,
+        triggered: bool,
+        latency: float,
+    ) -> None:
+        key = (description_hash(description), model, trigger_threshold, query, run_idx)
+        self.runs[key] = triggered
+        latency = round(latency, 3)
+        self.latencies.setdefault(query, []).append(latency)
+        self._append({
+            "type": "run",
+            "description": key[0],
+            "model": model,
+            "trigger_threshold": trigger_threshold,
+            "query": query,
+            "run_idx": run_idx,
+            "triggered": triggered,
+            "latency": latency,
+        })
+
+    def record_iteration(
+        self,
+        iteration: int,
+        entry: dict,
+        next_description: str | None,
+        exit_reason: str | None = None,
+        screened: list[dict] | None = None,
+    ) -> None:
+        record = {
+            "type": "iteration",
+            "iteration": iteration,
+            "entry": entry,
+            "next_description": next_description,
+            "exit_reason": exit_reason,
+        }
+        if screened:
+            record["screened"] = screened
+        self.iterations.append(record)
+        self._append(record, sync=True)
+
+    def record_proposals(self, round_num: int, descriptions: list[str]) -> None:
+        self.proposals[round_num] = list(descriptions)
+        self._append({"type": "proposals", "round": round_num, "descriptions": list(descriptions)}, sync=True)
+
+    def record_round(self, round_num: int, entries: list[dict], spent: int, exit_reason: str | None = None) -> None:
+        record = {"type": "round", "round": round_num, "entries": entries, "spent": spent, "exit_reason": exit_reason}
+        self.rounds.append(record)
+        self._append(record, sync=True)
+
+    def _append(self, record: dict, sync: bool = False) -> None:
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if sync or self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
@@ -0,0 +1,441 @@
+"""Live run_loop report: a static page that tails an append-only event log.
+
+Instead of rewriting the whole report every iteration, LiveReport writes
+one static HTML shell and appends one NDJSON line per event to
+<report>.events.ndjson next to it:
+
+    {"type": "start", "queries": [...], "original_description": ..., ...}
+    {"type": "row", "row": 3, "label": "2", "description": "..."}
+    {"type": "run", "row": 3, "query": "...", "triggered": true}
+    {"type": "result", "row": 3, "query": "...", "passed": false}
+    {"type": "entry", "row": 3, "label": "2", "fate": ..., "passes": {...}, ...}
+    {"type": "status", "message": "..."}
+    {"type": "done", "best_row": 3, "best_description": ..., ...}
+
+With serve=True, a small local HTTP server serves the shell and streams
+the log to it as server-sent events; the event id is the byte offset, so
+a reconnecting page resumes where it stopped. Every update is then one
+appended line on disk and one table cell (plus two running scores) in the
+browser, however long the history gets.
+
+Without a server (the default), a page opened from disk cannot read the
+log, so the file itself is a snapshot: the shell with the events so far
+embedded, reloading itself every few seconds. It is rewritten on every
+row, history entry and status change, and at most every SNAPSHOT_SECONDS
+for runs and settled queries.
+
+Either way, run_loop's final report is written with
+generate_report.generate_html() over the shell once the loop is done.
+"""
+
+import html
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from scripts.generate_report import REPORT_STYLE
+
+KEEPALIVE_SECONDS = 15.0
+SNAPSHOT_SECONDS = 5.0
+
+
+class LiveReport:
+    """Event log + shell for one run_loop report, optionally served over HTTP."""
+
+    def __init__(self, path: Path, skill_name: str = "", serve: bool = False):
+        self.path = Path(path)
+        self.events_path = self.path.with_name(f"{self.path.stem}.events.ndjson")
+        self.skill_name = skill_name
+        self.url: str | None = None
+        self.closed = False
+        self._changed = threading.Condition()
+        self._generation = 0
+        self._streams = 0
+        self._next_row = 1
+        # Row currently collecting runs for each description
+        self._rows: dict[str, int] = {}
+        self._iteration_rows: dict[object, int] = {}
+        self._server: ThreadingHTTPServer | None = None
+        # Events so far, for the static snapshot (no server only)
+        self._snapshot: list[dict] | None = None if serve else []
+        self._snapshot_at = 0.0
+        self._snapshot_stale = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.events_path, "w", encoding="utf-8")
+        if serve:
+            self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+            self._server.daemon_threads = True
+            self._server.live = self
+            self.url = f"http://127.0.0.1:{self._server.server_address[1]}/"
+            threading.Thread(target=self._server.serve_forever, name="live-report", daemon=True).start()
+        self.shell = render_shell(skill_name, self.url)
+        if serve:
+            self.path.write_text(self.shell)
+        else:
+            self._write_snapshot()
+
+    def emit(self, event_type: str, **fields) -> None:
+        event = {"type": event_type, **fields}
+        line = json.dumps(event)
+        with self._changed:
+            if self.closed:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+            self._generation += 1
+            self._changed.notify_all()
+            if self._snapshot is not None:
+                self._snapshot.append(event)
+                self._snapshot_stale = True
+                if event_type not in ("run", "result") or time.monotonic() - self._snapshot_at >= SNAPSHOT_SECONDS:
+                    self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        # Replaced atomically, so a page reloading meanwhile never sees half a file
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(render_shell(self.skill_name, None, snapshot=self._snapshot))
+        os.replace(tmp, self.path)
+        self._snapshot_at = time.monotonic()
+        self._snapshot_stale = False
+
+    def start(self, train_set: list[dict], test_set: list[dict], **meta) -> None:
+        queries = [
+            {"query": q["query"], "should_trigger": q["should_trigger"], "split": split}
+            for split, items in (("train", train_set), ("test", test_set))
+            for q in items
+        ]
+        self.emit("start", queries=queries, **meta)
+
+    def row(self, label: str, description: str) -> int:
+        """Open a table row; runs for description are credited to it from now on."""
+        with self._changed:
+            row, self._next_row = self._next_row, self._next_row + 1
+            self._rows[description] = row
+        self.emit("row", row=row, label=str(label), description=description)
+        return row
+
+    def on_run(self, description: str, query: str, triggered: bool) -> None:
+        """run_eval on_run callback."""
+        row = self._rows.get(description) or self.row("…", description)
+        self.emit("run", row=row, query=query, triggered=triggered)
+
+    def wrap_on_result(self, chained=None):
+        """run_eval on_result callback that reports each settled query, then defers to chained."""
+        def on_result(description: str, result: dict) -> bool:
+            row = self._rows.get(description)
+            if row is not None:
+                self.emit("result", row=row, query=result["query"], passed=result["pass"])
+            return chained(description, result) if chained is not None else False
+        return on_result
+
+    def entry(self, entry: dict) -> None:
+        """Finish the row of a history entry: final label, fate, flags and pass/fail per query."""
+        row = self._rows.get(entry["description"]) or self.row(entry["iteration"], entry["description"])
+        self._iteration_rows[entry["iteration"]] = row
+        passes = {r["query"]: r["pass"] for r in entry["train_results"] + (entry.get("test_results") or [])}
+        self.emit(
+            "entry",
+            row=row,
+            label=str(entry["iteration"]),
+            fate=entry.get("fate"),
+            note=entry.get("note"),
+            partial=bool(entry.get("partial")),
+            estimated=bool(entry.get("estimated")),
+            # Also covers queries that sent no result event (surrogate
+            # predictions, entries restored from a journal)
+            passes=passes,
+        )
+
+    def status(self, message: str) -> None:
+        self.emit("status", message=message)
+
+    def done(self, output: dict) -> None:
+        best = next((h for h in output["history"] if h["description"] == output["best_description"]), None)
+        self.emit(
+            "done",
+            best_row=self._iteration_rows.get(best["iteration"]) if best else None,
+            best_description=output["best_description"],
+            best_score=output["best_score"],
+            exit_reason=output["exit_reason"],
+        )
+
+    def close(self, grace: float = 2.0) -> None:
+        """Stop accepting events; give connected pages a moment to read the last ones.
+
+        Write the final report over the shell after this, not before.
+        """
+        with self._changed:
+            if self._snapshot_stale and not self.closed:
+                self._write_snapshot()
+            self.closed = True
+            self._changed.notify_all()
+            self._changed.wait_for(lambda: self._streams == 0, timeout=grace)
+        self._file.close()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: ThreadingHTTPServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        live: LiveReport = self.server.live
+        if self.path in ("/", "/index.html"):
+            body = live.shell.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/events":
+            self._stream(live)
+        else:
+            self.send_error(404)
+
+    def _stream(self, live: LiveReport) -> None:
+        try:
+            offset = int(self.headers.get("Last-Event-ID") or 0)
+        except ValueError:
+            offset = 0
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        with live._changed:
+            live._streams += 1
+        try:
+            with open(live.events_path, "rb") as f:
+                f.seek(offset)
+                pending = b""
+                while True:
+                    with live._changed:
+                        generation = live._generation
+                        closed = live.closed
+                    chunk = f.read()
+                    if chunk:
+                        pending += chunk
+                        *lines, pending = pending.split(b"\n")
+                        for line in lines:
+                            offset += len(line) + 1
+                            self.wfile.write(b"id: %d\ndata: %s\n\n" % (offset, line))
+                        self.wfile.flush()
+                        continue
+                    if closed:
+                        break
+                    with live._changed:
+                        changed = live._changed.wait_for(
+                            lambda: live._generation != generation or live.closed, timeout=KEEPALIVE_SECONDS,
+                        )
+                    if not changed:
+                        self.wfile.write(b": keepalive\n\n")
+                        self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with live._changed:
+                live._streams -= 1
+                live._changed.notify_all()
+
+
+def render_shell(skill_name: str, url: str | None, snapshot: list[dict] | None = None) -> str:
+    """The static page; everything after the header is built from events.
+
+    With a snapshot, those events are embedded and replayed, and the page
+    reloads itself to pick up the next snapshot.
+    """
+    title_prefix = html.escape(skill_name + " — ") if skill_name else ""
+    where = (
+        f'Live updates are served at <a href="{html.escape(url)}">{html.escape(url)}</a>; '
+        f"this file is replaced by the full report when the run finishes."
+        if url else "This file is replaced by the full report when the run finishes."
+    )
+    done = any(event["type"] == "done" for event in snapshot or [])
+    refresh_tag = (
+        f'    <meta http-equiv="refresh" content="{SNAPSHOT_SECONDS:g}">\n' if snapshot is not None and not done else ""
+    )
+    # "</" would end the script element early
+    snapshot_json = json.dumps(snapshot).replace("</", "<\\/")
+    return """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+""" + refresh_tag + """    <title>""" + title_prefix + """Skill Description Optimization (live)</title>
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@500;600&family=Lora:wght@400;500&display=swap" rel="stylesheet">
+""" + REPORT_STYLE + """    <style>
+        .pending { color: #b0aea5; }
+        #status { font-family: 'Poppins', sans-serif; font-size: 13px; color: #b0aea5; margin-bottom: 10px; }
+    </style>
+</head>
+<body>
+    <h1>""" + title_prefix + """Skill Description Optimization</h1>
+    <div class="explainer">
+        <strong>Optimizing your skill's description.</strong> Results appear here as each query run finishes. Each row is a description attempt; the columns are the eval queries (train, then held-out test in blue). Green checkmarks mean the skill triggered correctly (or correctly didn't trigger), red crosses mean it got it wrong. <span id="where">""" + where + """</span>
+    </div>
+    <div class="summary">
+        <p><strong>Original:</strong> <span id="original"></span></p>
+        <p class="best"><strong>Best:</strong> <span id="best">in progress</span></p>
+        <p><strong>Best Score:</strong> <span id="best-score">in progress</span> | <strong>Exit:</strong> <span id="exit">running</span></p>
+    </div>
+    <div id="status"></div>
+    <div class="legend">
+        <span style="font-weight:600">Query columns:</span>
+        <span class="legend-item"><span class="legend-swatch swatch-positive"></span> Should trigger</span>
+        <span class="legend-item"><span class="legend-swatch swatch-negative"></span> Should NOT trigger</span>
+        <span class="legend-item"><span class="legend-swatch swatch-train"></span> Train</span>
+        <span class="legend-item"><span class="legend-swatch swatch-test"></span> Test</span>
+    </div>
+    <div class="table-container">
+    <table>
+        <thead><tr id="head">
+            <th>Iter</th><th>Train</th><th>Test</th><th class="query-col">Description</th>
+        </tr></thead>
+        <tbody id="rows"></tbody>
+    </table>
+    </div>
+<script>
+(function () {
+    const queries = new Map();   // query -> {index, should_trigger, split}
+    const rows = new Map();      // row id -> row state
+    const text = (el, s) => { el.textContent = s; return el; };
+    const make = (tag, cls) => { const el = document.createElement(tag); if (cls) el.className = cls; return el; };
+
+    function scoreClass(correct, total) {
+        if (total > 0 && correct / total >= 0.8) return "score score-good";
+        if (total > 0 && correct / total >= 0.5) return "score score-ok";
+        return "score score-bad";
+    }
+
+    function renderScore(row, split) {
+        const s = row.scores[split];
+        row[split + "Score"].className = scoreClass(s.correct, s.runs);
+        text(row[split + "Score"], s.correct + "/" + s.runs);
+    }
+
+    function renderCell(row, query) {
+        const q = queries.get(query);
+        const c = row.counts.get(query) || {triggers: 0, runs: 0, passed: null};
+        const cell = row.cells[q.index];
+        const base = "result" + (q.split === "test" ? " test-result" : "");
+        if (c.passed === null) {
+            cell.className = base + " pending";
+            cell.replaceChildren(text(make("span"), "\\u2026"));
+        } else {
+            cell.className = base + (c.passed ? " pass" : " fail");
+            cell.replaceChildren(text(make("span"), c.passed ? "\\u2713" : "\\u2717"));
+        }
+        if (c.runs) cell.appendChild(text(make("span", "rate"), c.triggers + "/" + c.runs));
+    }
+
+    const handlers = {
+        start(e) {
+            text(document.getElementById("original"), e.original_description || "");
+            const head = document.getElementById("head");
+            e.queries.forEach((q, index) => {
+                queries.set(q.query, {index: index, should_trigger: q.should_trigger, split: q.split});
+                const polarity = q.should_trigger ? "positive-col" : "negative-col";
+                head.appendChild(text(make("th", (q.split === "test" ? "test-col " : "") + polarity), q.query));
+            });
+        },
+        row(e) {
+            const tr = make("tr");
+            const label = text(make("td"), e.label);
+            const trainScore = make("span"), testScore = make("span");
+            tr.appendChild(label);
+            tr.appendChild(make("td")).appendChild(trainScore);
+            tr.appendChild(make("td")).appendChild(testScore);
+            const desc = text(make("td", "description"), e.description);
+            tr.appendChild(desc);
+            const cells = [];
+            for (const q of queries.values()) {
+                cells.push(tr.appendChild(make("td", "result not-run" + (q.split === "test" ? " test-result" : ""))));
+            }
+            const row = {tr, label, desc, cells, trainScore, testScore, counts: new Map(),
+                         scores: {train: {correct: 0, runs: 0}, test: {correct: 0, runs: 0}}};
+            rows.set(e.row, row);
+            renderScore(row, "train");
+            renderScore(row, "test");
+            document.getElementById("rows").appendChild(tr);
+        },
+        run(e) {
+            const row = rows.get(e.row), q = queries.get(e.query);
+            if (!row || !q) return;
+            const c = row.counts.get(e.query) || {triggers: 0, runs: 0, passed: null};
+            c.runs += 1;
+            if (e.triggered) c.triggers += 1;
+            row.counts.set(e.query, c);
+            const s = row.scores[q.split];
+            s.runs += 1;
+            if (e.triggered === q.should_trigger) s.correct += 1;
+            renderScore(row, q.split);
+            renderCell(row, e.query);
+        },
+        result(e) {
+            const row = rows.get(e.row);
+            if (!row || !queries.has(e.query)) return;
+            const c = row.counts.get(e.query) || {triggers: 0, runs: 0, passed: null};
+            c.passed = e.passed;
+            row.counts.set(e.query, c);
+            renderCell(row, e.query);
+        },
+        entry(e) {
+            const row = rows.get(e.row);
+            if (!row) return;
+            text(row.label, e.label);
+            if (e.passes) {
+                for (const [query, passed] of Object.entries(e.passes)) {
+                    if (!queries.has(query)) continue;
+                    const c = row.counts.get(query) || {triggers: 0, runs: 0, passed: null};
+                    c.passed = passed;
+                    row.counts.set(query, c);
+                    renderCell(row, query);
+                }
+            }
+            if (e.partial) row.tr.className = "eliminated-row";
+            const fate = e.fate || (e.partial || e.estimated ? e.note : null);
+            if (fate) row.desc.appendChild(text(make("span", "fate"), fate));
+        },
+        status(e) {
+            text(document.getElementById("status"), e.message);
+        },
+        done(e) {
+            text(document.getElementById("best"), e.best_description);
+            text(document.getElementById("best-score"), e.best_score);
+            text(document.getElementById("exit"), e.exit_reason);
+            text(document.getElementById("status"), "Finished.");
+            const best = rows.get(e.best_row);
+            if (best) best.tr.className = "best-row";
+            if (source) source.close();
+        },
+    };
+
+    const snapshot = """ + snapshot_json + """;
+    let source = null;
+    if (snapshot) {
+        for (const e of snapshot) {
+            const handler = handlers[e.type];
+            if (handler) handler(e);
+        }
+        return;
+    }
+    if (location.protocol === "file:") return;
+    source = new EventSource("/events");
+    source.onmessage = (message) => {
+        const e = JSON.parse(message.data);
+        const handler = handlers[e.type];
+        if (handler) handler(e);
+    };
+})();
+</script>
+</body>
+</html>
+"""
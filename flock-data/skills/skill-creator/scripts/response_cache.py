@@ -0,0 +1,104 @@
+"""On-disk cache of improver responses for improve_description.
+
+A `claude -p` text response is keyed by the SHA-256 of the prompt, the
+model and the claude CLI version, so rerunning the loop from the same
+history, or repeating a shortening rewrite, replays the earlier response
+instead of calling claude. Responses live in a small SQLite database
+capped at max_bytes of response text; least-recently-used rows are
+evicted first.
+
+The cache is opt-in: pass --response-cache DIR or set
+SKILL_CREATOR_RESPONSE_CACHE to a directory. --no-response-cache bypasses
+it even when the environment variable is set.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+ENV_VAR = "SKILL_CREATOR_RESPONSE_CACHE"
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ResponseCache:
+    """SQLite-backed, byte-capped LRU cache of claude responses.
+
+    Safe to share between threads and between concurrent loops: calls are
+    serialized on a lock, SQLite serializes writers across processes, and
+    every write is a single autocommitted statement, so a reader never
+    sees a half-written response.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / "responses.sqlite3"
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(prompt: str, model: str | None, cli_version: str) -> str:
+        payload = json.dumps([prompt, model or "", cli_version], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        with self.lock:
+            row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            # Storing it would evict everything, itself included
+            return
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._evict()
+
+    def _evict(self) -> int:
+        """Drop least-recently-used rows until the total size fits max_bytes."""
+        cursor = self.conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS running FROM responses)"
+            " WHERE running > ?)",
+            (self.max_bytes,),
+        )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+def open_response_cache(cache_dir: str | None, disabled: bool = False) -> ResponseCache | None:
+    """The cache in cache_dir, else in $SKILL_CREATOR_RESPONSE_CACHE, else None."""
+    cache_dir = cache_dir or os.environ.get(ENV_VAR)
+    if disabled or not cache_dir:
+        return None
+    return ResponseCache(Path(cache_dir).expanduser())
@@ -6,19 +6,34 @@ for a set of queries. Outputs results as JSON.
 """
 
 import argparse
+import asyncio
 import json
-import os
-import select
-import subprocess
 import sys
-import time
+import tempfile
 import uuid
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import AsyncExitStack, nullcontext
 from pathlib import Path
-
+from statistics import NormalDist
+from typing import Callable
+
+from scripts import tracing
+from scripts.claude_cli import (
+    RUN_EVENTS,
+    STREAM_CHUNK_SIZE,
+    TRIGGER_DETECTION_VERSION,
+    SkillChoiceDetector,
+    TriggerDetector,
+    claude_env,
+    is_rate_limit_event,
+)
+from scripts.concurrency import AIMDController, FairShare, HedgePolicy, QueryFailed, max_window_for
+from scripts.journal import Journal
+from scripts.session_pool import SessionPool
+from scripts.stream_decoder import StreamDecoder
+from scripts.transcripts import TranscriptRecorder, TranscriptStore
+from scripts.trigger_cache import TriggerCache, cli_identity, default_cache_dir
 from scripts.utils import parse_skill_md
 
-
 def find_project_root() -> Path:
     """Find the project root by walking up from cwd looking for .claude/.
 
@@ -32,214 +47,655 @@ def find_project_root() -> Path:
     return current
 
 
-def run_single_query(
-    query: str,
+def make_clean_name(skill_name: str) -> str:
+    """Return a unique command name for one candidate description.
+
+    The unique suffix is what the stream detection looks for, so the
+    candidate is never confused with a real skill of the same name.
+    """
+    return f"{skill_name}-skill-{uuid.uuid4().hex[:8]}"
+
+
+def write_command_file(
+    project_root: str,
     skill_name: str,
     skill_description: str,
+    clean_name: str | None = None,
+) -> tuple[str, Path]:
+    """Create the temporary command file that exposes the skill to claude.
+
+    Returns (clean_name, command_file). A fresh clean_name is generated
+    unless one is given.
+    """
+    clean_name = clean_name or make_clean_name(skill_name)
+    project_commands_dir = Path(project_root) / ".claude" / "commands"
+    command_file = project_commands_dir / f"{clean_name}.md"
+
+    project_commands_dir.mkdir(parents=True, exist_ok=True)
+    # Use YAML block scalar to avoid breaking on quotes in description
+    indented_desc = "\n  ".join(skill_description.split("\n"))
+    command_content = (
+        f"---\n"
+        f"description: |\n"
+        f"  {indented_desc}\n"
+        f"---\n\n"
+        f"# {skill_name}\n\n"
+        f"This skill handles: {skill_description}\n"
+    )
+    command_file.write_text(command_content)
+    return clean_name, command_file
+
+
+class WorkerRoots:
+    """Isolated project roots, one per worker, for a single run_eval call.
+
+    Each root is a throwaway directory whose .claude/commands/ holds exactly
+    the command files for skills, a list of (skill_name, description): one
+    for the description under test in run_eval, every skill of the catalog
+    in choice_eval. They are written once when the roots are built. Running
+    every `claude` child from its own worker's root keeps concurrent queries
+    from seeing each other's candidate skills in available_skills. The real
+    project's settings files are symlinked in so permissions and model
+    settings still apply.
+    """
+
+    SHARED_SETTINGS = ("settings.json", "settings.local.json")
+
+    def __init__(self, num_workers: int, skills: list[tuple[str, str]], project_root: Path):
+        self.num_workers = num_workers
+        self.skills = skills
+        self.project_root = Path(project_root)
+        # clean name -> skill name, in the order of skills
+        self.clean_names = {make_clean_name(name): name for name, _ in skills}
+        self.roots: list[str] = []
+        self._tmpdir: tempfile.TemporaryDirectory | None = None
+
+    def __enter__(self) -> "WorkerRoots":
+        self._tmpdir = tempfile.TemporaryDirectory(prefix=f"{next(iter(self.clean_names), 'skills')}-")
+        base = Path(self._tmpdir.name)
+        for worker in range(self.num_workers):
+            root = base / f"worker-{worker}"
+            for clean_name, (name, description) in zip(self.clean_names, self.skills):
+                write_command_file(str(root), name, description, clean_name)
+            for name in self.SHARED_SETTINGS:
+                settings = self.project_root / ".claude" / name
+                if settings.is_file():
+                    (root / ".claude" / name).symlink_to(settings.resolve())
+            self.roots.append(str(root))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
+
+async def run_query_in_root(
+    query: str,
+    clean_name: str,
     timeout: int,
     project_root: str,
     model: str | None = None,
+    claude_bin: str = "claude",
+    recorder: TranscriptRecorder | None = None,
 ) -> bool:
-    """Run a single query and return whether the skill was triggered.
+    """Run `claude -p` in a root that already holds clean_name's command file.
 
-    Creates a command file in .claude/commands/ so it appears in Claude's
-    available_skills list, then runs `claude -p` with the raw query.
     Uses --include-partial-messages to detect triggering early from
     stream events (content_block_start) rather than waiting for the
     full assistant message, which only arrives after tool execution.
+    Raises QueryFailed on timeout, non-zero exit, rate limiting or when
+    claude_bin cannot be started. claude_bin replaces the `claude` executable (e.g. fake_claude.py);
+    a recorder, if given, receives every stdout chunk.
     """
-    unique_id = uuid.uuid4().hex[:8]
-    clean_name = f"{skill_name}-skill-{unique_id}"
-    project_commands_dir = Path(project_root) / ".claude" / "commands"
-    command_file = project_commands_dir / f"{clean_name}.md"
+    return await run_detector_in_root(
+        query, TriggerDetector(clean_name), clean_name, timeout, project_root, model, claude_bin, recorder,
+    )
+
 
+async def run_detector_in_root(
+    query: str,
+    detector: SkillChoiceDetector,
+    lane: str,
+    timeout: int,
+    project_root: str,
+    model: str | None = None,
+    claude_bin: str = "claude",
+    recorder: TranscriptRecorder | None = None,
+):
+    """Run `claude -p` in project_root until detector decides; return its decision."""
+    cmd = [
+        claude_bin,
+        "-p", query,
+        "--output-format", "stream-json",
+        "--verbose",
+        "--include-partial-messages",
+    ]
+    if model:
+        cmd.extend(["--model", model])
+
+    # Timestamps of the stages traced for this query (see tracing.py)
+    marks = {"start": tracing.now()}
     try:
-        project_commands_dir.mkdir(parents=True, exist_ok=True)
-        # Use YAML block scalar to avoid breaking on quotes in description
-        indented_desc = "\n  ".join(skill_description.split("\n"))
-        command_content = (
-            f"---\n"
-            f"description: |\n"
-            f"  {indented_desc}\n"
-            f"---\n\n"
-            f"# {skill_name}\n\n"
-            f"This skill handles: {skill_description}\n"
-        )
-        command_file.write_text(command_content)
-
-        cmd = [
-            "claude",
-            "-p", query,
-            "--output-format", "stream-json",
-            "--verbose",
-            "--include-partial-messages",
-        ]
-        if model:
-            cmd.extend(["--model", model])
-
-        # Remove CLAUDECODE env var to allow nesting claude -p inside a
-        # Claude Code session. The guard is for interactive terminal conflicts;
-        # programmatic subprocess usage is safe.
-        env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
-
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
             cwd=project_root,
-            env=env,
+            env=claude_env(),
         )
+    except OSError:
+        raise QueryFailed("spawn") from None
+    marks["spawned"] = tracing.now()
+
+    decoder = StreamDecoder(RUN_EVENTS)
+
+    async def read_until_decided():
+        while True:
+            chunk = await process.stdout.read(STREAM_CHUNK_SIZE)
+            marks.setdefault("first_byte", tracing.now())
+            if recorder is not None:
+                recorder.feed(chunk)
+            events = decoder.feed(chunk) if chunk else decoder.flush()
+            for event in events:
+                if is_rate_limit_event(event):
+                    raise QueryFailed("rate_limit")
+                if event.kind in ("content_block_start", "tool_use_start"):
+                    marks.setdefault("first_block", tracing.now())
+                decision = detector.feed(event)
+                if decision is not None:
+                    marks["decided"] = tracing.now()
+                    return decision
+            if not chunk:
+                if await process.wait() != 0:
+                    raise QueryFailed("exit")
+                return detector.outcome()
 
-        triggered = False
-        start_time = time.time()
-        buffer = ""
-        # Track state for stream event detection
-        pending_tool_name = None
-        accumulated_json = ""
-
-        try:
-            while time.time() - start_time < timeout:
-                if process.poll() is not None:
-                    remaining = process.stdout.read()
-                    if remaining:
-                        buffer += remaining.decode("utf-8", errors="replace")
-                    break
-
-                ready, _, _ = select.select([process.stdout], [], [], 1.0)
-                if not ready:
-                    continue
-
-                chunk = os.read(process.stdout.fileno(), 8192)
-                if not chunk:
-                    break
-                buffer += chunk.decode("utf-8", errors="replace")
-
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        event = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
-
-                    # Early detection via stream events
-                    if event.get("type") == "stream_event":
-                        se = event.get("event", {})
-                        se_type = se.get("type", "")
-
-                        if se_type == "content_block_start":
-                            cb = se.get("content_block", {})
-                            if cb.get("type") == "tool_use":
-                                tool_name = cb.get("name", "")
-                                if tool_name in ("Skill", "Read"):
-                                    pending_tool_name = tool_name
-                                    accumulated_json = ""
-                                else:
-                                    return False
-
-                        elif se_type == "content_block_delta" and pending_tool_name:
-                            delta = se.get("delta", {})
-                            if delta.get("type") == "input_json_delta":
-                                accumulated_json += delta.get("partial_json", "")
-                                if clean_name in accumulated_json:
-                                    return True
-
-                        elif se_type in ("content_block_stop", "message_stop"):
-                            if pending_tool_name:
-                                return clean_name in accumulated_json
-                            if se_type == "message_stop":
-                                return False
-
-                    # Fallback: full assistant message
-                    elif event.get("type") == "assistant":
-                        message = event.get("message", {})
-                        for content_item in message.get("content", []):
-                            if content_item.get("type") != "tool_use":
-                                continue
-                            tool_name = content_item.get("name", "")
-                            tool_input = content_item.get("input", {})
-                            if tool_name == "Skill" and clean_name in tool_input.get("skill", ""):
-                                triggered = True
-                            elif tool_name == "Read" and clean_name in tool_input.get("file_path", ""):
-                                triggered = True
-                            return triggered
-
-                    elif event.get("type") == "result":
-                        return triggered
-        finally:
-            # Clean up process on any exit path (return, exception, timeout)
-            if process.poll() is None:
-                process.kill()
-                process.wait()
-
-        return triggered
+    try:
+        return await asyncio.wait_for(read_until_decided(), timeout)
+    except asyncio.TimeoutError:
+        raise QueryFailed("timeout") from None
     finally:
-        if command_file.exists():
-            command_file.unlink()
-
-
-def run_eval(
+        # Clean up process on any exit path (return, exception, timeout)
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        _trace_query(f"{lane}/{Path(project_root).name}", marks, detector.triggered)
+
+
+def _trace_query(lane: str, marks: dict[str, float], triggered: bool) -> None:
+    """Record a query span plus one sub-span per stage it got through."""
+    if not tracing.enabled():
+        return
+    end = tracing.now()
+    tracing.record("query", marks["start"], end, lane, triggered=triggered)
+    stages = [
+        ("query.spawn", "start", "spawned"),
+        ("query.first_byte", "spawned", "first_byte"),
+        ("query.first_content_block", "first_byte", "first_block"),
+        ("query.decision", "first_block", "decided"),
+    ]
+    for name, begin, finish in stages:
+        if begin in marks and finish in marks:
+            tracing.record(name, marks[begin], marks[finish], lane)
+
+
+def runs_still_needed(triggers: int, runs: int, planned: int, threshold: float) -> int:
+    """Return the fewest further runs that could settle a query's pass/fail.
+
+    The outcome is whether triggers/planned >= threshold once all planned
+    runs are in. It is settled early when enough triggers have already
+    been seen to clear the threshold, or too few remain possible to reach
+    it. Returns 0 when the outcome can no longer change.
+    """
+    pass_at = next((k for k in range(planned + 1) if k / planned >= threshold), planned + 1)
+    need_triggers = pass_at - triggers
+    need_misses = (planned - pass_at + 1) - (runs - triggers)
+    if need_triggers <= 0 or need_misses <= 0:
+        return 0
+    return min(need_triggers, need_misses, planned - runs)
+
+
+def confidently_decided(triggers: int, runs: int, threshold: float, confidence: float) -> bool:
+    """Whether the Wilson score interval for the trigger rate excludes threshold."""
+    if runs == 0:
+        return False
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    rate = triggers / runs
+    denom = 1 + z * z / runs
+    center = (rate + z * z / (2 * runs)) / denom
+    margin = z * ((rate * (1 - rate) + z * z / (4 * runs)) / runs) ** 0.5 / denom
+    return center - margin >= threshold or center + margin < threshold
+
+
+class _Candidate:
+    """Per-description state inside one run_eval_many_async() call."""
+
+    def __init__(self, description: str, clean_name: str, worker_roots: WorkerRoots, pool):
+        self.description = description
+        self.clean_name = clean_name
+        self.worker_roots = worker_roots
+        self.pool = pool
+        # There is a root for every slot the window can ever grant, so a
+        # run holding a slot always finds a free root of its candidate.
+        self.free_roots: asyncio.Queue[str] = asyncio.Queue()
+        for root in worker_roots.roots:
+            self.free_roots.put_nowait(root)
+        self.query_triggers: dict[str, list[bool]] = {}
+        # Runs that still failed after every retry; not part of the trigger rate
+        self.query_errors: dict[str, int] = {}
+        # Queries whose runs all finished (not cut short by an abort)
+        self.completed: set[str] = set()
+        self.aborted = asyncio.Event()
+
+
+async def run_eval_many_async(
     eval_set: list[dict],
     skill_name: str,
-    description: str,
+    descriptions: list[str],
     num_workers: int,
     timeout: int,
     project_root: Path,
     runs_per_query: int = 1,
     trigger_threshold: float = 0.5,
     model: str | None = None,
-) -> dict:
-    """Run the full eval set and return results."""
-    results = []
-
-    with ProcessPoolExecutor(max_workers=num_workers) as executor:
-        future_to_info = {}
-        for item in eval_set:
-            for run_idx in range(runs_per_query):
-                future = executor.submit(
-                    run_single_query,
-                    item["query"],
-                    skill_name,
-                    description,
-                    timeout,
-                    str(project_root),
-                    model,
-                )
-                future_to_info[future] = (item, run_idx)
-
-        query_triggers: dict[str, list[bool]] = {}
-        query_items: dict[str, dict] = {}
-        for future in as_completed(future_to_info):
-            item, _ = future_to_info[future]
-            query = item["query"]
-            query_items[query] = item
-            if query not in query_triggers:
-                query_triggers[query] = []
+    backend: str = "process",
+    recycle_after: int = 20,
+    cache: TriggerCache | None = None,
+    early_stop: str = "off",
+    confidence: float = 0.95,
+    max_workers: int | None = None,
+    max_retries: int = 2,
+    claude_bin: str = "claude",
+    transcript_store: TranscriptStore | None = None,
+    journal: Journal | None = None,
+    hedge: bool = False,
+    hedge_percentile: float = 90.0,
+    priorities: dict[str, float] | None = None,
+    on_result: Callable[[str, dict], bool] | None = None,
+    on_run: Callable[[str, str, bool], None] | None = None,
+    fair_share: FairShare | None = None,
+) -> list[dict]:
+    """Run the full eval set against several descriptions in one batch.
+
+    Returns one result dict per description, in order, each in the format
+    of run_eval_async(). All (description, query, run) jobs share a single
+    concurrency window and are interleaved across candidates, so comparing
+    several wordings takes about one eval pass of wall-clock time rather
+    than one per description. Every description gets its own WorkerRoots
+    (and, with backend="pool", its own SessionPool), so a run only ever
+    sees the candidate it is scoring.
+
+    All runs are driven from one event loop; each worker runs them from its
+    own isolated project root (see WorkerRoots). backend="process" spawns
+    one `claude -p` per (query, run). backend="pool" keeps one persistent
+    `claude` session per worker (see session_pool.py) and recycles it after
+    recycle_after queries; each description's session counts are reported
+    under summary["pool"].
+
+    With a cache, runs already recorded for this exact (description, query,
+    model, run index, claude_bin) are taken from it instead of calling claude, and new
+    outcomes are written back. Failed runs are never cached.
+
+    early_stop="off" runs every query runs_per_query times. "exact" launches
+    each query's runs incrementally and stops once the pass/fail outcome can
+    no longer change. "confidence" additionally stops, cancelling runs still
+    in flight, once the trigger rate is on one side of the threshold at the
+    given confidence level. The per-query runs/triggers report what actually
+    ran.
+
+    Concurrency starts at num_workers and is adapted by an AIMDController
+    up to max_workers (default: twice num_workers) and down on timeouts,
+    non-zero exits, rate limits and failed spawns. Failed runs are retried
+    up to max_retries times with jittered backoff. A run that still fails is
+    an error, not a non-trigger: it is left out of the query's triggers/runs
+    and counted in the result's "errors", and a query with no successful run
+    is marked with "error" instead of being scored (summary["errored"]
+    counts these). The controller's final state, including every failed
+    attempt by reason, is reported under summary["concurrency"].
+
+    claude_bin replaces the `claude` executable, e.g. with fake_claude.py
+    for offline runs. With a transcript_store (backend="process" only), the
+    raw stream-json of every run is recorded there for later replay.
+
+    With a journal, every completed run is appended to it as it finishes,
+    and runs the journal already holds for the same description, model and
+    trigger_threshold are not run again, so an interrupted call resumes
+    where it stopped.
+
+    hedge=True races a duplicate against any run still going after the
+    hedge_percentile latency of its query (learned from the journal and the
+    runs so far; see HedgePolicy), keeps whichever finishes first and kills
+    the other. Hedge counts, wins and time saved (an upper bound: the
+    timeout the slow run could still have used) are reported under
+    summary["hedging"].
+
+    priorities (query -> score, e.g. from surrogate.TriggerSurrogate) makes
+    higher-scoring queries start first; results keep the eval set's order.
+
+    on_result(description, result) is called with each query's result as
+    soon as that query is settled. Returning True aborts the description:
+    its outstanding runs are cancelled, and its output lists only the
+    completed queries and has summary["aborted"] set.
+
+    on_run(description, query, triggered) is called for every run as soon
+    as its outcome is known, including runs taken from the journal or cache
+    but not runs that failed.
+
+    With a fair_share, every run also needs one of its slots, requested
+    under skill_name, on top of this call's own window. This is how
+    several evals running at once share one global worker budget.
+    """
+    if transcript_store is not None and backend != "process":
+        raise ValueError("Recording transcripts requires backend='process'")
+
+    query_items: dict[str, dict] = {}
+    for item in eval_set:
+        query_items[item["query"]] = item
+
+    async with AsyncExitStack() as stack:
+        stack.enter_context(tracing.span(
+            "run_eval", queries=len(query_items), runs_per_query=runs_per_query, descriptions=len(descriptions),
+        ))
+        controller = AIMDController(num_workers, max_window_for(num_workers, max_workers))
+        hedging = HedgePolicy(hedge_percentile) if hedge else None
+        if hedging is not None and journal is not None:
+            for query, latencies in journal.latencies.items():
+                for latency in latencies:
+                    hedging.observe(query, latency)
+        cli = cli_identity(claude_bin) if cache is not None else None
+        candidates: list[_Candidate] = []
+        for description in descriptions:
+            worker_roots = stack.enter_context(
+                WorkerRoots(controller.max_window, [(skill_name, description)], project_root)
+            )
+            [clean_name] = worker_roots.clean_names
+            pool = None
+            if backend == "pool":
+                pool = await stack.enter_async_context(SessionPool(
+                    clean_name, model=model, recycle_after=recycle_after, claude_bin=claude_bin,
+                ))
+            candidate = _Candidate(description, clean_name, worker_roots, pool)
+            for query in query_items:
+                candidate.query_triggers[query] = []
+                candidate.query_errors[query] = 0
+            candidates.append(candidate)
+
+        def save_transcript(candidate: _Candidate, query: str, recorder: TranscriptRecorder, outcome: str) -> None:
+            transcript_store.save(
+                recorder, outcome, query=query, skill_name=skill_name, description=candidate.description,
+                clean_name=candidate.clean_name, model=model,
+            )
+
+        async def attempt(
+            candidate: _Candidate, query: str, running: asyncio.Event | None = None,
+        ) -> tuple[bool, float]:
+            """Run one (description, query) once in a slot; return (triggered, latency).
+
+            running, if given, is set once the run holds its slot.
+            """
+            async with controller.slot() as started, (
+                fair_share.slot(skill_name) if fair_share is not None else nullcontext()
+            ):
+                if fair_share is not None:
+                    # Waiting for the shared budget is not run latency
+                    started = asyncio.get_running_loop().time()
+                if running is not None:
+                    running.set()
+                root = candidate.free_roots.get_nowait()
+                recorder = TranscriptRecorder() if transcript_store is not None else None
+                try:
+                    if candidate.pool is not None:
+                        # Latency stops at the answer, not after the /clear reset
+                        triggered, finished = await candidate.pool.run_query(query, timeout, root)
+                    else:
+                        triggered = await run_query_in_root(
+                            query, candidate.clean_name, timeout, root, model, claude_bin, recorder,
+                        )
+                        finished = asyncio.get_running_loop().time()
+                except QueryFailed as e:
+                    controller.on_failure(e.reason, started)
+                    if recorder is not None:
+                        save_transcript(candidate, query, recorder, e.reason)
+                    raise
+                finally:
+                    candidate.free_roots.put_nowait(root)
+            latency = finished - started
+            controller.on_success(latency)
+            if recorder is not None:
+                save_transcript(candidate, query, recorder, "triggered" if triggered else "not_triggered")
+            return triggered, latency
+
+        async def hedged_attempt(candidate: _Candidate, query: str) -> tuple[bool, float]:
+            """attempt(), raced against a duplicate once it outlives its hedge deadline."""
+            loop = asyncio.get_running_loop()
+            running = asyncio.Event()
+            primary = asyncio.ensure_future(attempt(candidate, query, running))
+            pending = {primary}
             try:
-                query_triggers[query].append(future.result())
-            except Exception as e:
-                print(f"Warning: query failed: {e}", file=sys.stderr)
-                query_triggers[query].append(False)
-
-    for query, triggers in query_triggers.items():
-        item = query_items[query]
-        trigger_rate = sum(triggers) / len(triggers)
-        should_trigger = item["should_trigger"]
-        if should_trigger:
-            did_pass = trigger_rate >= trigger_threshold
-        else:
-            did_pass = trigger_rate < trigger_threshold
-        results.append({
-            "query": query,
-            "should_trigger": should_trigger,
-            "trigger_rate": trigger_rate,
-            "triggers": sum(triggers),
-            "runs": len(triggers),
-            "pass": did_pass,
-        })
+                if hedging is None:
+                    return await primary
+                hedging.runs += 1
+                # The deadline counts from when the primary gets a slot, and
+                # uses the latencies known by then.
+                slot_wait = asyncio.ensure_future(running.wait())
+                await asyncio.wait({primary, slot_wait}, return_when=asyncio.FIRST_COMPLETED)
+                slot_wait.cancel()
+                deadline = hedging.deadline(query)
+                if primary.done() or deadline is None:
+                    return await primary
+                started = loop.time()
+                failure = None
+                done, pending = await asyncio.wait(pending, timeout=deadline)
+                if done:
+                    # Finished within the deadline: no hedge.
+                    return primary.result()
+                if hedging.allow_hedge():
+                    hedging.hedges += 1
+                    pending.add(asyncio.ensure_future(attempt(candidate, query)))
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            if task is not primary:
+                                hedging.hedge_wins += 1
+                                # The primary would have run at most until the timeout.
+                                hedging.time_saved += max(0.0, timeout - (loop.time() - started))
+                            return task.result()
+                        failure = failure or task.exception()
+                raise failure
+            finally:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        async def run_job(candidate: _Candidate, query: str) -> tuple[bool, float]:
+            """Run one (description, query) with retries; return (triggered, latency)."""
+            attempts = 0
+            while True:
+                try:
+                    triggered, latency = await hedged_attempt(candidate, query)
+                except QueryFailed as e:
+                    failure = e
+                else:
+                    if hedging is not None:
+                        hedging.observe(query, latency)
+                    return triggered, latency
+                attempts += 1
+                if attempts > max_retries:
+                    raise QueryFailed(f"{failure.reason} after {attempts} attempts")
+                controller.retries += 1
+                await asyncio.sleep(controller.backoff_delay(attempts))
+
+        def settled(triggers: list[bool], planned: int) -> bool:
+            if len(triggers) >= planned:
+                return True
+            if early_stop == "off":
+                return False
+            if runs_still_needed(sum(triggers), len(triggers), planned, trigger_threshold) == 0:
+                return True
+            return early_stop == "confidence" and confidently_decided(
+                sum(triggers), len(triggers), trigger_threshold, confidence,
+            )
+
+        async def run_query_runs(candidate: _Candidate, query: str) -> None:
+            triggers = candidate.query_triggers[query]
+
+            def planned() -> int:
+                # Errored runs cannot be made up, so the outcome is decided
+                # over the runs that can still succeed.
+                return runs_per_query - candidate.query_errors[query]
+
+            def add_run(triggered: bool) -> None:
+                triggers.append(triggered)
+                if on_run is not None:
+                    on_run(candidate.description, query, triggered)
+            next_run = 0
+            in_flight: dict[asyncio.Task, tuple[int, str | None]] = {}
+            try:
+                while not settled(triggers, planned()) and not candidate.aborted.is_set():
+                    if early_stop == "off":
+                        wanted = runs_per_query
+                    else:
+                        wanted = runs_still_needed(
+                            sum(triggers), len(triggers), planned(), trigger_threshold,
+                        ) or 1
+                    while len(in_flight) < wanted and next_run < runs_per_query:
+                        run_idx, next_run = next_run, next_run + 1
+                        if journal is not None:
+                            journaled = journal.lookup_run(
+                                candidate.description, query, run_idx, model, trigger_threshold,
+                            )
+                            if journaled is not None:
+                                add_run(journaled)
+                                continue
+                        key = None
+                        if cache is not None:
+                            key = TriggerCache.make_key(
+                                skill_name, candidate.description, query, model, run_idx, TRIGGER_DETECTION_VERSION, cli,
+                            )
+                            cached = cache.get(key)
+                            if cached is not None:
+                                add_run(cached)
+                                continue
+                        in_flight[asyncio.ensure_future(run_job(candidate, query))] = (run_idx, key)
+                    if not in_flight:
+                        break
+
+                    abort_wait = asyncio.ensure_future(candidate.aborted.wait())
+                    try:
+                        done, _ = await asyncio.wait({*in_flight, abort_wait}, return_when=asyncio.FIRST_COMPLETED)
+                    finally:
+                        abort_wait.cancel()
+                    if candidate.aborted.is_set():
+                        return
+                    done.discard(abort_wait)
+                    for task in done:
+                        run_idx, key = in_flight.pop(task)
+                        try:
+                            triggered, latency = task.result()
+                        except Exception as e:
+                            print(f"Warning: run failed, not scored: {e}", file=sys.stderr)
+                            candidate.query_errors[query] += 1
+                            continue
+                        add_run(triggered)
+                        if cache is not None:
+                            cache.put(key, triggered)
+                        if journal is not None:
+                            journal.record_run(
+                                candidate.description, query, run_idx, model, trigger_threshold, triggered, latency,
+                            )
+                if candidate.aborted.is_set():
+                    return
+                candidate.completed.add(query)
+                if on_result is not None:
+                    result = _query_result(
+                        query_items[query], triggers, trigger_threshold, candidate.query_errors[query],
+                    )
+                    if on_result(candidate.description, result):
+                        candidate.aborted.set()
+            finally:
+                for task in in_flight:
+                    task.cancel()
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+        # Query-major order, so the window is shared round-robin between
+        # candidates instead of finishing one description before the next.
+        query_order = list(query_items)
+        if priorities:
+            query_order.sort(key=lambda q: priorities.get(q, 0.0), reverse=True)
+        query_jobs = [
+            asyncio.ensure_future(run_query_runs(candidate, query))
+            for query in query_order
+            for candidate in candidates
+        ]
+        try:
+            for next_done in asyncio.as_completed(query_jobs):
+                await next_done
+        finally:
+            for job in query_jobs:
+                job.cancel()
+            await asyncio.gather(*query_jobs, return_exceptions=True)
+
+    outputs = []
+    for candidate in candidates:
+        query_triggers = candidate.query_triggers
+        if candidate.aborted.is_set():
+            query_triggers = {q: t for q, t in query_triggers.items() if q in candidate.completed}
+        output = _format_results(
+            skill_name, candidate.description, query_items, query_triggers, trigger_threshold, controller.summary(),
+            candidate.query_errors,
+        )
+        if candidate.aborted.is_set():
+            output["summary"]["aborted"] = True
+        if candidate.pool is not None:
+            output["summary"]["pool"] = dict(candidate.pool.stats)
+        outputs.append(output)
+    if hedging is not None:
+        for output in outputs:
+            output["summary"]["hedging"] = hedging.summary()
+    return outputs
+
+
+def _query_result(item: dict, triggers: list[bool], trigger_threshold: float, errors: int = 0) -> dict:
+    # A query can settle with no runs at all (early stop with a threshold <= 0)
+    trigger_rate = sum(triggers) / len(triggers) if triggers else 0.0
+    should_trigger = item["should_trigger"]
+    if should_trigger:
+        did_pass = trigger_rate >= trigger_threshold
+    else:
+        did_pass = trigger_rate < trigger_threshold
+    result = {
+        "query": item["query"],
+        "should_trigger": should_trigger,
+        "trigger_rate": trigger_rate,
+        "triggers": sum(triggers),
+        "runs": len(triggers),
+        "pass": did_pass,
+    }
+    if errors:
+        result["errors"] = errors
+        if not triggers:
+            # Nothing was measured, so there is nothing to score
+            result["error"] = f"all {errors} runs failed"
+            result["pass"] = False
+    return result
+
+
+def _format_results(
+    skill_name: str,
+    description: str,
+    query_items: dict[str, dict],
+    query_triggers: dict[str, list[bool]],
+    trigger_threshold: float,
+    concurrency: dict,
+    query_errors: dict[str, int] | None = None,
+) -> dict:
+    query_errors = query_errors or {}
+    results = [
+        _query_result(query_items[query], triggers, trigger_threshold, query_errors.get(query, 0))
+        for query, triggers in query_triggers.items()
+    ]
 
     passed = sum(1 for r in results if r["pass"])
     total = len(results)
@@ -252,20 +708,66 @@ def run_eval(
             "total": total,
             "passed": passed,
             "failed": total - passed,
+            "errored": sum(1 for r in results if "error" in r),
+            "concurrency": concurrency,
         },
     }
 
 
+async def run_eval_async(
+    eval_set: list[dict],
+    skill_name: str,
+    description: str,
+    num_workers: int,
+    timeout: int,
+    project_root: Path,
+    **kwargs,
+) -> dict:
+    """Run the full eval set against one description and return results.
+
+    Takes the same keyword options as run_eval_many_async().
+    """
+    [output] = await run_eval_many_async(
+        eval_set, skill_name, [description], num_workers, timeout, project_root, **kwargs,
+    )
+    return output
+
+
+def run_eval(*args, **kwargs) -> dict:
+    """Blocking wrapper around run_eval_async(); same arguments."""
+    return asyncio.run(run_eval_async(*args, **kwargs))
+
+
+def run_eval_many(*args, **kwargs) -> list[dict]:
+    """Blocking wrapper around run_eval_many_async(); same arguments."""
+    return asyncio.run(run_eval_many_async(*args, **kwargs))
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run trigger evaluation for a skill description")
     parser.add_argument("--eval-set", required=True, help="Path to eval set JSON file")
     parser.add_argument("--skill-path", required=True, help="Path to skill directory")
-    parser.add_argument("--description", default=None, help="Override description to test")
-    parser.add_argument("--num-workers", type=int, default=10, help="Number of parallel workers")
+    parser.add_argument("--description", action="append", default=None, help="Override description to test; repeat to compare several in one batch")
+    parser.add_argument("--num-workers", type=int, default=10, help="Number of concurrent claude processes to start with")
     parser.add_argument("--timeout", type=int, default=30, help="Timeout per query in seconds")
     parser.add_argument("--runs-per-query", type=int, default=3, help="Number of runs per query")
     parser.add_argument("--trigger-threshold", type=float, default=0.5, help="Trigger rate threshold")
     parser.add_argument("--model", default=None, help="Model to use for claude -p (default: user's configured model)")
+    parser.add_argument("--backend", choices=["process", "pool"], default="process", help="'process' spawns claude -p per query; 'pool' reuses one persistent claude session per worker")
+    parser.add_argument("--recycle-after", type=int, default=20, help="With --backend pool, restart a worker's session after this many queries")
+    parser.add_argument("--cache-dir", default=None, help="Directory for the trigger result cache (default: ~/.cache/skill-creator/trigger-cache)")
+    parser.add_argument("--no-cache", action="store_true", help="Always call claude; neither read nor write the trigger result cache")
+    parser.add_argument("--max-workers", type=int, default=None, help="Let adaptive concurrency grow up to this many claude processes (default: twice --num-workers)")
+    parser.add_argument("--max-retries", type=int, default=2, help="Retry a run this many times after a timeout, crash or rate limit")
+    parser.add_argument("--early-stop", choices=["off", "exact", "confidence"], default="off", help="Stop a query's runs once its pass/fail is settled ('exact') or clear at --confidence ('confidence')")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level for --early-stop confidence")
+    parser.add_argument("--claude-bin", default="claude", help="Executable to run instead of claude (e.g. scripts/fake_claude.py)")
+    parser.add_argument("--record-transcripts", default=None, metavar="DIR", help="Record every run's raw stream-json under DIR for replay by fake_claude.py")
+    parser.add_argument("--hedge", action="store_true", help="Race a duplicate run against runs slower than their --hedge-percentile latency")
+    parser.add_argument("--hedge-percentile", type=float, default=90.0, help="Latency percentile after which a run is hedged")
+    journal_group = parser.add_mutually_exclusive_group()
+    journal_group.add_argument("--journal", default=None, help="Record completed runs in this new JSONL journal, so an interrupted eval can be resumed")
+    journal_group.add_argument("--resume", default=None, metavar="JOURNAL", help="Resume an interrupted eval from its journal (rerun with the same arguments)")
     parser.add_argument("--verbose", action="store_true", help="Print progress to stderr")
     args = parser.parse_args()
 
@@ -277,33 +779,92 @@ def main():
         sys.exit(1)
 
     name, original_description, content = parse_skill_md(skill_path)
-    description = args.description or original_description
+    descriptions = args.description or [original_description]
     project_root = find_project_root()
 
     if args.verbose:
-        print(f"Evaluating: {description}", file=sys.stderr)
+        for description in descriptions:
+            print(f"Evaluating: {description}", file=sys.stderr)
+
+    cache = None if args.no_cache else TriggerCache(Path(args.cache_dir) if args.cache_dir else default_cache_dir())
+    if args.journal and Path(args.journal).exists():
+        print(f"Error: {args.journal} already exists; use --resume to continue from it", file=sys.stderr)
+        sys.exit(1)
+    if args.resume and not Path(args.resume).is_file():
+        print(f"Error: No journal found at {args.resume}", file=sys.stderr)
+        sys.exit(1)
+    journal_path = args.journal or args.resume
+    journal = Journal(Path(journal_path)) if journal_path else None
+    if journal is not None and args.verbose and journal.runs:
+        print(f"Resuming: {len(journal.runs)} runs already in {journal_path}", file=sys.stderr)
 
-    output = run_eval(
+    outputs = run_eval_many(
         eval_set=eval_set,
         skill_name=name,
-        description=description,
+        descriptions=descriptions,
         num_workers=args.num_workers,
         timeout=args.timeout,
         project_root=project_root,
         runs_per_query=args.runs_per_query,
         trigger_threshold=args.trigger_threshold,
         model=args.model,
+        backend=args.backend,
+        recycle_after=args.recycle_after,
+        cache=cache,
+        early_stop=args.early_stop,
+        confidence=args.confidence,
+        max_workers=args.max_workers,
+        max_retries=args.max_retries,
+        claude_bin=args.claude_bin,
+        transcript_store=TranscriptStore(Path(args.record_transcripts)) if args.record_transcripts else None,
+        journal=journal,
+        hedge=args.hedge,
+        hedge_percentile=args.hedge_percentile,
     )
 
+    if journal is not None:
+        journal.close()
+
+    if cache is not None:
+        if args.verbose:
+            print(f"Cache: {cache.hits} hits, {cache.misses} misses", file=sys.stderr)
+        cache.close()
+
     if args.verbose:
-        summary = output["summary"]
-        print(f"Results: {summary['passed']}/{summary['total']} passed", file=sys.stderr)
-        for r in output["results"]:
-            status = "PASS" if r["pass"] else "FAIL"
-            rate_str = f"{r['triggers']}/{r['runs']}"
-            print(f"  [{status}] rate={rate_str} expected={r['should_trigger']}: {r['query'][:70]}", file=sys.stderr)
-
-    print(json.dumps(output, indent=2))
+        concurrency = outputs[0]["summary"]["concurrency"]
+        print(
+            f"Concurrency: window={concurrency['window']} peak={concurrency['peak_window']}"
+            f" decreases={concurrency['decreases']} retries={concurrency['retries']}",
+            file=sys.stderr,
+        )
+        hedging = outputs[0]["summary"].get("hedging")
+        if hedging:
+            print(
+                f"Hedging: {hedging['hedges']} hedges, {hedging['hedge_wins']} won, up to {hedging['time_saved']}s saved",
+                file=sys.stderr,
+            )
+        for output in outputs:
+            summary = output["summary"]
+            if len(outputs) > 1:
+                print(f"\nDescription: {output['description']}", file=sys.stderr)
+            errored = f", {summary['errored']} errored" if summary["errored"] else ""
+            print(f"Results: {summary['passed']}/{summary['total']} passed{errored}", file=sys.stderr)
+            pool = summary.get("pool")
+            if pool:
+                print(
+                    f"Sessions: {pool['sessions_started']} started, {pool['sessions_recycled']} recycled,"
+                    f" {pool['failed_resets']} failed resets, {pool['queries']} queries",
+                    file=sys.stderr,
+                )
+            runs_made = sum(r["runs"] for r in output["results"])
+            print(f"Runs: {runs_made}/{summary['total'] * args.runs_per_query}", file=sys.stderr)
+            for r in output["results"]:
+                status = "ERROR" if "error" in r else "PASS" if r["pass"] else "FAIL"
+                rate_str = f"{r['triggers']}/{r['runs']}"
+                print(f"  [{status}] rate={rate_str} expected={r['should_trigger']}: {r['query'][:70]}", file=sys.stderr)
+
+    # A single description keeps the original single-object output.
+    print(json.dumps(outputs[0] if len(outputs) == 1 else outputs, indent=2))
 
 
 if __name__ == "__main__":
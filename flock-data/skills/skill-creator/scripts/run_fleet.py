@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""Optimize the descriptions of every skill in a catalog in one run.
+
+Discovers the skills under --skills-root (every directory with a SKILL.md)
+and their trigger eval sets, then runs one run_loop per skill, all at the
+same time. A single FairShare caps the number of `claude` eval runs in
+flight across the whole fleet at --num-workers and hands freed slots to
+the skills round-robin, so a skill with a large eval set cannot starve the
+others. Skills with the most eval work start first, so the catalog
+finishes in about the time of its largest skill rather than the sum of
+all of them.
+
+A skill's eval set is <--eval-dir>/<skill dir name>.json if given,
+otherwise <skill dir>/evals/trigger_eval.json. Skills without one are
+listed as skipped.
+
+Output goes to a timestamped directory under --results-dir:
+
+    index.json              one entry per skill: status, scores, best description
+    <skill>/results.json    run_loop output
+    <skill>/report.html     run_loop report
+    <skill>/journal.jsonl   resumable journal (see --resume)
+    <skill>/logs/           improve_description transcripts
+    trace.json              fleet-wide Chrome trace
+
+index.json is rewritten as each skill finishes, so an interrupted fleet
+still leaves a usable index; --resume keeps the entries of skills that
+finished and continues the others from their journals. With --time-limit,
+no skill starts and no loop begins a new iteration after the limit; loops
+in progress finish their current iteration.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from scripts import tracing
+from scripts.concurrency import FairShare
+from scripts.generate_report import generate_html
+from scripts.journal import Journal
+from scripts.run_loop import run_loop
+from scripts.response_cache import open_response_cache
+from scripts.trigger_cache import TriggerCache, default_cache_dir
+from scripts.utils import parse_skill_md
+
+DEFAULT_EVAL_NAME = "evals/trigger_eval.json"
+
+
+def discover_skills(skills_root: Path, eval_dir: Path | None = None, only: list[str] | None = None) -> list[dict]:
+    """Skills under skills_root with the path of their eval set (None if missing)."""
+    skills = []
+    for skill_dir in sorted(p for p in skills_root.iterdir() if (p / "SKILL.md").is_file()):
+        if only and skill_dir.name not in only:
+            continue
+        candidates = [eval_dir / f"{skill_dir.name}.json"] if eval_dir else []
+        candidates.append(skill_dir / DEFAULT_EVAL_NAME)
+        eval_path = next((c for c in candidates if c.is_file()), None)
+        skills.append({"skill": skill_dir.name, "skill_path": skill_dir, "eval_set": eval_path})
+    return skills
+
+
+class FleetIndex:
+    """index.json for a fleet run, rewritten atomically on every update.
+
+    An index already at path (a resumed fleet) is merged: its skill
+    entries are kept, and it keeps its "started" time, with the time of
+    this run added as "resumed".
+    """
+
+    def __init__(self, path: Path, **meta):
+        self.path = path
+        self._lock = threading.Lock()
+        self.data = {**meta, "skills": {}}
+        if path.is_file():
+            previous = json.loads(path.read_text())
+            self.data.update(
+                started=previous.get("started", meta.get("started")),
+                resumed=meta.get("started"),
+                skills=previous.get("skills", {}),
+            )
+
+    def update(self, skill: str, **fields) -> None:
+        with self._lock:
+            self.data["skills"].setdefault(skill, {}).update(fields)
+            self._write()
+
+    def finish(self, **fields) -> None:
+        with self._lock:
+            self.data.update(fields)
+            self._write()
+
+    def _write(self) -> None:
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(json.dumps(self.data, indent=2))
+        os.replace(tmp, self.path)
+
+
+def run_fleet(
+    skills: list[dict],
+    fleet_dir: Path,
+    model: str,
+    num_workers: int,
+    max_parallel_skills: int | None,
+    time_limit: float | None,
+    cache_dir: Path | None,
+    verbose: bool,
+    **loop_options,
+) -> dict:
+    """Run every skill's loop under one shared worker budget; returns the index data.
+
+    Each loop starts its adaptive window at its share of num_workers and
+    may grow into slots the others leave free, up to num_workers. Skills
+    an existing index lists as done are not run again.
+    """
+    started = time.time()
+    deadline = time.monotonic() + time_limit if time_limit else None
+    fair_share = FairShare(num_workers)
+    index = FleetIndex(
+        fleet_dir / "index.json",
+        started=time.strftime("%Y-%m-%d %H:%M:%S"),
+        model=model,
+        num_workers=num_workers,
+        time_limit=time_limit,
+    )
+
+    runnable = []
+    for skill in skills:
+        if index.data["skills"].get(skill["skill"], {}).get("status") == "done":
+            if verbose:
+                print(f"[{skill['skill']}] already done", file=sys.stderr)
+            continue
+        if skill["eval_set"] is None:
+            index.update(skill["skill"], skill_path=str(skill["skill_path"]), status="skipped", reason="no eval set")
+            continue
+        skill["queries"] = json.loads(skill["eval_set"].read_text())
+        index.update(skill["skill"], skill_path=str(skill["skill_path"]), eval_set=str(skill["eval_set"]), status="pending")
+        runnable.append(skill)
+    # Largest eval sets first, so the longest loops are not the last to start
+    runnable.sort(key=lambda s: len(s["queries"]), reverse=True)
+    parallel_skills = min(max_parallel_skills or len(runnable), len(runnable)) or 1
+    loop_workers = max(1, num_workers // parallel_skills)
+
+    def run_skill(skill: dict) -> None:
+        name = skill["skill"]
+        if deadline is not None and time.monotonic() >= deadline:
+            index.update(name, status="skipped", reason="time limit reached before it started")
+            return
+        out_dir = fleet_dir / name
+        out_dir.mkdir(parents=True, exist_ok=True)
+        index.update(name, status="running")
+        if verbose:
+            print(f"[{name}] started ({len(skill['queries'])} queries)", file=sys.stderr)
+        t0 = time.time()
+        cache = TriggerCache(cache_dir) if cache_dir else None
+        journal = Journal(out_dir / "journal.jsonl")
+        try:
+            with tracing.span("skill", lane=f"fleet:{name}", skill=name):
+                output = run_loop(
+                    eval_set=skill["queries"],
+                    skill_path=skill["skill_path"],
+                    description_override=None,
+                    num_workers=loop_workers,
+                    max_workers=num_workers,
+                    model=model,
+                    verbose=False,
+                    log_dir=out_dir / "logs",
+                    cache=cache,
+                    journal=journal,
+                    fair_share=fair_share,
+                    deadline=deadline,
+                    **loop_options,
+                )
+        except Exception as e:
+            (out_dir / "error.txt").write_text(traceback.format_exc())
+            index.update(name, status="error", error=f"{type(e).__name__}: {e}", elapsed=round(time.time() - t0, 1))
+            print(f"[{name}] failed: {e}", file=sys.stderr)
+            return
+        finally:
+            journal.close()
+            if cache is not None:
+                cache.close()
+
+        skill_name, _, _ = parse_skill_md(skill["skill_path"])
+        (out_dir / "results.json").write_text(json.dumps(output, indent=2))
+        (out_dir / "report.html").write_text(generate_html(output, auto_refresh=False, skill_name=skill_name))
+        index.update(
+            name,
+            status="done",
+            exit_reason=output["exit_reason"],
+            original_description=output["original_description"],
+            best_description=output["best_description"],
+            best_score=output["best_score"],
+            best_train_score=output["best_train_score"],
+            best_test_score=output["best_test_score"],
+            iterations_run=output["iterations_run"],
+            elapsed=round(time.time() - t0, 1),
+            results=f"{name}/results.json",
+            report=f"{name}/report.html",
+        )
+        if verbose:
+            print(f"[{name}] done: best {output['best_score']} after {output['iterations_run']} iterations "
+                  f"({time.time() - t0:.0f}s, {output['exit_reason']})", file=sys.stderr)
+
+    with ThreadPoolExecutor(max_workers=parallel_skills, thread_name_prefix="skill") as pool:
+        for future in [pool.submit(run_skill, skill) for skill in runnable]:
+            future.result()
+
+    index.finish(
+        finished=time.strftime("%Y-%m-%d %H:%M:%S"),
+        elapsed=round(time.time() - started, 1),
+        fair_share=fair_share.summary(),
+    )
+    return index.data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the description optimization loop for every skill in a catalog")
+    parser.add_argument("--skills-root", default=str(Path(__file__).resolve().parents[2]), help="Directory whose subdirectories are skills (default: the catalog this script lives in)")
+    parser.add_argument("--eval-dir", default=None, help=f"Directory of <skill>.json eval sets (default: each skill's {DEFAULT_EVAL_NAME})")
+    parser.add_argument("--skill", action="append", default=None, help="Only optimize this skill (directory name); repeatable")
+    parser.add_argument("--model", required=True, help="Model for triggering and improvement")
+    parser.add_argument("--num-workers", type=int, default=20, help="Maximum concurrent claude eval runs across all skills")
+    parser.add_argument("--max-parallel-skills", type=int, default=None, help="Run at most this many skill loops at once (default: all)")
+    parser.add_argument("--time-limit", type=float, default=None, help="Seconds after which no skill or iteration is started")
+    parser.add_argument("--timeout", type=int, default=30, help="Timeout per query in seconds")
+    parser.add_argument("--max-iterations", type=int, default=5, help="Max improvement iterations per skill")
+    parser.add_argument("--runs-per-query", type=int, default=3, help="Number of runs per query")
+    parser.add_argument("--trigger-threshold", type=float, default=0.5, help="Trigger rate threshold")
+    parser.add_argument("--holdout", type=float, default=0.4, help="Fraction of each eval set to hold out for testing (0 to disable)")
+    parser.add_argument("--backend", choices=["process", "pool"], default="process", help="'process' spawns claude -p per query; 'pool' reuses one persistent claude session per worker")
+    parser.add_argument("--early-stop", choices=["off", "exact", "confidence"], default="off", help="Stop a query's runs once its pass/fail is settled")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level for --early-stop confidence")
+    parser.add_argument("--max-retries", type=int, default=2, help="Retry a run this many times after a timeout, crash or rate limit")
+    parser.add_argument("--claude-bin", default="claude", help="Executable to run trigger evals with instead of claude")
+    parser.add_argument("--search", choices=["linear", "halving"], default="linear", help="Search strategy for each skill (see run_loop --search)")
+    parser.add_argument("--candidates", type=int, default=4, help="With --search halving, descriptions proposed in parallel per round")
+    parser.add_argument("--budget", type=int, default=None, help="With --search halving, claude calls each skill may spend")
+    parser.add_argument("--cache-dir", default=None, help="Directory for the trigger result cache (default: ~/.cache/skill-creator/trigger-cache)")
+    parser.add_argument("--no-cache", action="store_true", help="Always call claude; neither read nor write the trigger result cache")
+    parser.add_argument("--response-cache", default=None, metavar="DIR", help="Reuse improver responses cached in DIR, shared by all skills (default: $SKILL_CREATOR_RESPONSE_CACHE, else no cache)")
+    parser.add_argument("--no-response-cache", action="store_true", help="Always call claude for improvements, even if $SKILL_CREATOR_RESPONSE_CACHE is set")
+    parser.add_argument("--results-dir", required=True, help="Write the fleet's outputs to a timestamped subdirectory here")
+    parser.add_argument("--resume", default=None, metavar="DIR", help="Resume an interrupted fleet from its timestamped directory (rerun with the same arguments)")
+    parser.add_argument("--verbose", action="store_true", help="Print per-skill progress to stderr")
+    args = parser.parse_args()
+
+    skills_root = Path(args.skills_root)
+    skills = discover_skills(skills_root, Path(args.eval_dir) if args.eval_dir else None, args.skill)
+    if not skills:
+        print(f"Error: No skills found under {skills_root}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.resume:
+        fleet_dir = Path(args.resume)
+        if not (fleet_dir / "index.json").is_file():
+            print(f"Error: No index.json found in {fleet_dir}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        fleet_dir = Path(args.results_dir) / time.strftime("%Y-%m-%d_%H%M%S")
+        fleet_dir.mkdir(parents=True, exist_ok=True)
+    tracing.enable()
+
+    if args.verbose:
+        with_evals = sum(1 for s in skills if s["eval_set"])
+        print(f"Fleet: {with_evals}/{len(skills)} skills have eval sets; {args.num_workers} workers shared", file=sys.stderr)
+
+    response_cache = open_response_cache(args.response_cache, args.no_response_cache)
+    data = run_fleet(
+        skills,
+        fleet_dir,
+        model=args.model,
+        num_workers=args.num_workers,
+        max_parallel_skills=args.max_parallel_skills,
+        time_limit=args.time_limit,
+        cache_dir=None if args.no_cache else (Path(args.cache_dir) if args.cache_dir else default_cache_dir()),
+        verbose=args.verbose,
+        timeout=args.timeout,
+        max_iterations=args.max_iterations,
+        runs_per_query=args.runs_per_query,
+        trigger_threshold=args.trigger_threshold,
+        holdout=args.holdout,
+        backend=args.backend,
+        early_stop=args.early_stop,
+        confidence=args.confidence,
+        max_retries=args.max_retries,
+        claude_bin=args.claude_bin,
+        search=args.search,
+        candidates=args.candidates,
+        budget=args.budget,
+        response_cache=response_cache,
+    )
+    if response_cache is not None:
+        response_cache.close()
+
+    tracing.write_trace(fleet_dir / "trace.json")
+    print(json.dumps(data, indent=2))
+    if args.verbose:
+        print(f"\n{'skill':<28} {'status':<8} {'best':>8}  exit", file=sys.stderr)
+        for name, entry in data["skills"].items():
+            print(f"{name:<28} {entry['status']:<8} {entry.get('best_score', '-'):>8}  "
+                  f"{entry.get('exit_reason') or entry.get('reason') or entry.get('error', '')}", file=sys.stderr)
+        print(f"\nFleet finished in {data['elapsed']:.0f}s: {fleet_dir}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
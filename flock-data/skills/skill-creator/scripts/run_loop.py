@@ -8,16 +8,31 @@ overfitting.
 
 import argparse
 import json
+import math
 import random
 import sys
 import tempfile
 import time
 import webbrowser
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
+from scripts import tracing
 from scripts.generate_report import generate_html
-from scripts.improve_description import improve_description
-from scripts.run_eval import find_project_root, run_eval
+from scripts.improve_description import (
+    HISTORY_BUDGET,
+    HISTORY_KEEP,
+    CancelToken,
+    improve_description,
+    improve_description_candidates,
+)
+from scripts.concurrency import FairShare
+from scripts.journal import Journal
+from scripts.live_report import LiveReport
+from scripts.run_eval import find_project_root, run_eval, run_eval_many
+from scripts.surrogate import TriggerSurrogate
+from scripts.response_cache import ResponseCache, open_response_cache
+from scripts.trigger_cache import TriggerCache, default_cache_dir
 from scripts.utils import parse_skill_md
 
 
@@ -44,6 +59,361 @@ def split_eval_set(eval_set: list[dict], holdout: float, seed: int = 42) -> tupl
     return train_set, test_set
 
 
+def make_history_entry(
+    iteration: int,
+    description: str,
+    results: list[dict],
+    train_set: list[dict],
+    test_set: list[dict],
+) -> dict:
+    """Build one history entry from run_eval results over train + test."""
+    # Split results back into train/test by matching queries
+    train_queries_set = {q["query"] for q in train_set}
+    train_result_list = [r for r in results if r["query"] in train_queries_set]
+    test_result_list = [r for r in results if r["query"] not in train_queries_set]
+
+    train_passed = sum(1 for r in train_result_list if r["pass"])
+    train_total = len(train_result_list)
+    train_summary = {"passed": train_passed, "failed": train_total - train_passed, "total": train_total}
+
+    if test_set:
+        test_passed = sum(1 for r in test_result_list if r["pass"])
+        test_total = len(test_result_list)
+        test_summary = {"passed": test_passed, "failed": test_total - test_passed, "total": test_total}
+    else:
+        test_summary = None
+
+    entry = {
+        "iteration": iteration,
+        "description": description,
+        "train_passed": train_summary["passed"],
+        "train_failed": train_summary["failed"],
+        "train_total": train_summary["total"],
+        "train_results": train_result_list,
+        "test_passed": test_summary["passed"] if test_summary else None,
+        "test_failed": test_summary["failed"] if test_summary else None,
+        "test_total": test_summary["total"] if test_summary else None,
+        "test_results": test_result_list if test_summary else None,
+        # For backward compat with report generator
+        "passed": train_summary["passed"],
+        "failed": train_summary["failed"],
+        "total": train_summary["total"],
+        "results": train_result_list,
+    }
+    predicted = sum(1 for r in results if r.get("predicted"))
+    if predicted:
+        entry["estimated"] = True
+        entry["note"] = (
+            f"Scores are estimates: {predicted} of {len(results)} queries were predicted by the "
+            f"local surrogate, not run. Only measured results are listed."
+        )
+    return entry
+
+
+def fill_predicted(
+    surrogate: TriggerSurrogate,
+    description: str,
+    all_queries: list[dict],
+    measured: list[dict],
+    trigger_threshold: float,
+) -> list[dict]:
+    """Complete measured results with surrogate predictions, in eval set order."""
+    by_query = {r["query"]: r for r in measured}
+    missing = [q["query"] for q in all_queries if q["query"] not in by_query]
+    predictions = surrogate.predict(description, missing)
+    results = []
+    for item in all_queries:
+        r = by_query.get(item["query"])
+        if r is None:
+            rate = predictions[item["query"]]
+            passed = rate >= trigger_threshold if item["should_trigger"] else rate < trigger_threshold
+            r = {
+                "query": item["query"],
+                "should_trigger": item["should_trigger"],
+                "trigger_rate": rate,
+                "triggers": 0,
+                "runs": 0,
+                "pass": passed,
+                "predicted": True,
+            }
+        results.append(r)
+    return results
+
+
+def is_complete(entry: dict) -> bool:
+    """Whether a history entry scored the whole eval set (not aborted or estimated)."""
+    return not entry.get("partial") and not entry.get("estimated")
+
+
+def failure_budget(train_set: list[dict], best_train_passed: int):
+    """on_result callback for run_eval: abort once train failures rule out matching best_train_passed.
+
+    A candidate that can still tie on train is kept: the final pick is by
+    test score, where it may do better. A query whose every run errored is
+    not held against it either: that says nothing about the description.
+    """
+    train_queries = {q["query"] for q in train_set}
+    failures = 0
+
+    def on_result(description: str, result: dict) -> bool:
+        nonlocal failures
+        if result["query"] in train_queries and not result["pass"] and "error" not in result:
+            failures += 1
+        return len(train_queries) - failures < best_train_passed
+
+    return on_result
+
+
+def measured_only(entry: dict) -> dict:
+    """A history entry with only measured results (for prompts).
+
+    Surrogate predictions and queries whose every run errored say nothing
+    about the description, so both are left out.
+    """
+    return {
+        k: [r for r in v if not r.get("predicted") and "error" not in r] if k in ("results", "train_results") else v
+        for k, v in entry.items()
+    }
+
+
+def halving_schedule(n_candidates: int, n_train: int) -> list[int]:
+    """Train slice size for each rung until one of n_candidates is left.
+
+    Each rung keeps the better half of the candidates and doubles the
+    slice, ending at about half the train set (the survivor then gets the
+    full set).
+    """
+    rungs = max(1, math.ceil(math.log2(n_candidates)))
+    return [min(n_train, max(2, math.ceil(n_train / 2 ** (rungs - i)))) for i in range(rungs)]
+
+
+def interleave_by_label(queries: list[dict], rng: random.Random) -> list[dict]:
+    """Shuffle queries so that every prefix has a balanced mix of should/shouldn't trigger."""
+    pos = [q for q in queries if q["should_trigger"]]
+    neg = [q for q in queries if not q["should_trigger"]]
+    rng.shuffle(pos)
+    rng.shuffle(neg)
+    # Merge by position in each list, so the two classes stay proportional
+    keyed = [((i + 0.5) / len(pos), q) for i, q in enumerate(pos)] + [((i + 0.5) / len(neg), q) for i, q in enumerate(neg)]
+    return [q for _, q in sorted(keyed, key=lambda item: item[0])]
+
+
+def successive_halving(
+    history: list[dict],
+    description: str,
+    train_set: list[dict],
+    test_set: list[dict],
+    propose,
+    evaluate,
+    runs_per_query: int,
+    candidates: int,
+    budget: int | None,
+    max_rounds: int,
+    verbose: bool,
+    on_candidate=None,
+    on_entry=None,
+    deadline: float | None = None,
+    seed: int = 42,
+    journal: Journal | None = None,
+) -> tuple[str, int]:
+    """Population-based search; appends every candidate to history.
+
+    Each round asks propose(iteration, description, entries, k) for up to
+    k = `candidates` descriptions, written in parallel from the incumbent (the best fully scored description so far), runs
+    them on a small random slice of the train set, keeps the better half
+    and doubles the slice until one is left. The incumbent takes part using
+    its existing results, so it costs nothing to re-check. A survivor other
+    than the incumbent is then scored on the full train and test sets.
+
+    evaluate(queries, descriptions) returns one run_eval result list per
+    description. Spend is counted in `claude` calls: trigger runs (scored
+    or failed) plus one per proposal, starting with the full evaluation of
+    the starting description; a budget that cannot cover that evaluation
+    is a ValueError. A round is shrunk to fit the remaining budget, and the
+    search stops once not even two candidates fit, or once the
+    time.monotonic() deadline has passed.
+
+    on_candidate(label, description) is called as a proposal joins a round
+    and on_entry(entry) as each history entry is added (live reporting).
+
+    With a journal, each round's proposals are recorded as soon as they are
+    written and each round's entries once it ends. A journal that already
+    holds rounds (with history restored from them, see run_loop) continues
+    after the last one, with the same spend and the same query slices;
+    a round cut short is replayed from its recorded proposals, and its
+    trigger runs from the journal's run records.
+
+    Returns (exit_reason, claude_calls).
+    """
+    all_queries = train_set + test_set
+    spent = 0
+    first_round = 1
+    if journal is not None and journal.rounds:
+        spent = journal.rounds[-1]["spent"]
+        first_round = journal.rounds[-1]["round"] + 1
+
+    def cost(results: list[dict]) -> int:
+        return sum(r["runs"] + r.get("errors", 0) for r in results)
+
+    def end_round(round_num: int, entries: list[dict], exit_reason: str | None = None) -> None:
+        if journal is not None:
+            journal.record_round(round_num, entries, spent, exit_reason)
+
+    def finish(round_num: int, exit_reason: str) -> tuple[str, int]:
+        end_round(round_num, [], exit_reason)
+        return exit_reason, spent
+
+    if not history:
+        initial_cost = len(all_queries) * runs_per_query
+        if budget is not None and budget < initial_cost:
+            raise ValueError(
+                f"A budget of {budget} claude calls does not cover scoring the starting description "
+                f"({initial_cost} calls)"
+            )
+        if verbose:
+            print(f"\nScoring the starting description on all {len(all_queries)} queries...", file=sys.stderr)
+        [results] = evaluate(all_queries, [description])
+        spent += cost(results)
+        entry = make_history_entry(1, description, results, train_set, test_set)
+        entry.update(round=0, candidate=0, fate="starting description")
+        history.append(entry)
+        if on_entry:
+            on_entry(entry)
+        end_round(0, [entry])
+    # Same rule as at the end of each round: a full score at least as good takes over
+    incumbent = None
+    for h in history:
+        if is_complete(h) and (incumbent is None or h["train_passed"] >= incumbent["train_passed"]):
+            incumbent = h
+
+    for round_num in range(first_round, max_rounds + 1):
+        if incumbent["train_failed"] == 0:
+            return finish(round_num - 1, f"all_passed (round {round_num - 1})")
+
+        if deadline is not None and time.monotonic() >= deadline:
+            return finish(round_num - 1, f"deadline (round {round_num - 1})")
+
+        # Largest round that fits what is left of the budget
+        plan = None
+        for k in range(candidates, 1, -1):
+            sizes = halving_schedule(k + 1, len(train_set))
+            alive, estimate, prev = k + 1, k, 0
+            for size in sizes:
+                estimate += (alive - 1) * (size - prev) * runs_per_query
+                alive, prev = math.ceil(alive / 2), size
+            estimate += (len(train_set) - prev + len(test_set)) * runs_per_query
+            if budget is None or spent + estimate <= budget:
+                plan = k, sizes
+                break
+        if plan is None:
+            return finish(round_num - 1, f"budget ({spent}/{budget} claude calls)")
+        k, sizes = plan
+
+        if verbose:
+            print(f"\n{'='*60}", file=sys.stderr)
+            print(f"Round {round_num}/{max_rounds}: {k} candidates, slices {sizes} of {len(train_set)} train queries", file=sys.stderr)
+            print(f"Incumbent ({incumbent['train_passed']}/{incumbent['train_total']}): {incumbent['description']}", file=sys.stderr)
+            print(f"{'='*60}", file=sys.stderr)
+
+        iteration = len(history) + 1
+        round_start = len(history)
+        if journal is not None and round_num in journal.proposals:
+            proposals = journal.proposals[round_num]
+        else:
+            prompt_history = [h for h in history if h is not incumbent] + [incumbent]
+            with tracing.span("propose_candidates", lane="improver", round=round_num, candidates=k):
+                proposals = propose(iteration, incumbent["description"], prompt_history, k)
+            if journal is not None:
+                journal.record_proposals(round_num, proposals)
+        spent += k
+
+        # Candidate 0 is the incumbent; identical proposals are run once
+        field: list[dict] = [{"candidate": 0, "description": incumbent["description"],
+                              "results": {r["query"]: r for r in incumbent["train_results"]}}]
+        seen = {incumbent["description"]}
+        for i, proposal in enumerate(proposals, 1):
+            if proposal not in seen:
+                seen.add(proposal)
+                field.append({"candidate": i, "description": proposal, "results": {}})
+                if on_candidate:
+                    on_candidate(f"r{round_num}.{i}", proposal)
+        if len(field) == 1:
+            if verbose:
+                print("All proposals repeat the incumbent; trying again.", file=sys.stderr)
+            end_round(round_num, [])
+            continue
+
+        # Seeded per round, so a resumed search draws the same slices
+        order = interleave_by_label(train_set, random.Random(f"{seed}:{round_num}"))
+        alive = field
+        for rung, size in enumerate(sizes, 1):
+            if len(alive) == 1:
+                break
+            fresh = [c for c in alive if c["candidate"] != 0]
+            new_queries = [q for q in order[:size] if q["query"] not in fresh[0]["results"]]
+            if new_queries:
+                outputs = evaluate(new_queries, [c["description"] for c in fresh])
+                for c, results in zip(fresh, outputs):
+                    c["results"].update((r["query"], r) for r in results)
+                    spent += cost(results)
+            for c in alive:
+                c["passed"] = sum(1 for q in order[:size] if c["results"][q["query"]]["pass"])
+            # Stable sort: ties go to the incumbent, then to earlier candidates
+            ranked = sorted(alive, key=lambda c: -c["passed"])
+            alive, dropped = ranked[:math.ceil(len(ranked) / 2)], ranked[math.ceil(len(ranked) / 2):]
+            if verbose:
+                print(f"Rung {rung} ({size} queries): " + ", ".join(
+                    f"#{c['candidate']} {c['passed']}/{size}" + ("" if c in alive else " (out)") for c in ranked
+                ), file=sys.stderr)
+            for c in dropped:
+                if c["candidate"] == 0:
+                    continue
+                entry = make_history_entry(iteration, c["description"], list(c["results"].values()), train_set, test_set)
+                entry.update(
+                    round=round_num,
+                    candidate=c["candidate"],
+                    partial=True,
+                    fate=f"eliminated in round {round_num}, rung {rung} ({c['passed']}/{size} on the slice)",
+                    note=f"Eliminated by successive halving after {size} of {len(train_set)} train queries.",
+                )
+                history.append(entry)
+                if on_entry:
+                    on_entry(entry)
+                iteration += 1
+
+        winner = alive[0]
+        if winner["candidate"] == 0:
+            if verbose:
+                print(f"Round {round_num}: the incumbent held.", file=sys.stderr)
+            end_round(round_num, history[round_start:])
+            continue
+        rest = [q for q in all_queries if q["query"] not in winner["results"]]
+        [results] = evaluate(rest, [winner["description"]])
+        spent += cost(results)
+        measured = {**winner["results"], **{r["query"]: r for r in results}}
+        entry = make_history_entry(iteration, winner["description"], [measured[q["query"]] for q in all_queries], train_set, test_set)
+        beat = entry["train_passed"] >= incumbent["train_passed"]
+        entry.update(
+            round=round_num,
+            candidate=winner["candidate"],
+            fate=f"won round {round_num}" + ("" if beat else ", but not the incumbent on the full train set"),
+        )
+        history.append(entry)
+        if on_entry:
+            on_entry(entry)
+        if beat:
+            incumbent = entry
+        if verbose:
+            print(f"Round {round_num} winner #{winner['candidate']}: train {entry['train_passed']}/{entry['train_total']}"
+                  + (f", test {entry['test_passed']}/{entry['test_total']}" if test_set else "")
+                  + f" ({spent} claude calls so far)", file=sys.stderr)
+        end_round(round_num, history[round_start:])
+
+    if incumbent["train_failed"] == 0:
+        return finish(max_rounds, f"all_passed (round {max_rounds})")
+    return finish(max_rounds, f"max_rounds ({max_rounds})")
+
+
 def run_loop(
     eval_set: list[dict],
     skill_path: Path,
@@ -56,14 +426,108 @@ def run_loop(
     holdout: float,
     model: str,
     verbose: bool,
-    live_report_path: Path | None = None,
+    live_report: LiveReport | None = None,
     log_dir: Path | None = None,
+    backend: str = "process",
+    recycle_after: int = 20,
+    cache: TriggerCache | None = None,
+    early_stop: str = "off",
+    confidence: float = 0.95,
+    max_workers: int | None = None,
+    max_retries: int = 2,
+    claude_bin: str = "claude",
+    journal: Journal | None = None,
+    hedge: bool = False,
+    hedge_percentile: float = 90.0,
+    surrogate_mode: str = "off",
+    surrogate_budget: float = 0.5,
+    abort_hopeless: bool = False,
+    pipeline: bool = False,
+    speculate_at: float = 1.0,
+    search: str = "linear",
+    candidates: int = 4,
+    budget: int | None = None,
+    fair_share: FairShare | None = None,
+    deadline: float | None = None,
+    history_keep: int | None = HISTORY_KEEP,
+    history_budget: int = HISTORY_BUDGET,
+    n_candidates: int = 1,
+    response_cache: ResponseCache | None = None,
+    live_report_path: Path | None = None,
 ) -> dict:
-    """Run the eval + improvement loop."""
+    """Run the eval + improvement loop.
+
+    With a live_report, every run, settled query and history entry is
+    streamed to it as it happens (see live_report.py). Older callers can
+    still pass live_report_path (or a path as live_report) instead: the
+    loop then opens a LiveReport there itself and, once done, closes it
+    and writes the final report over it.
+
+    fair_share makes every eval run also take a slot of that shared,
+    fleet-wide budget (see run_fleet.py). Once the time.monotonic()
+    deadline has passed, no further iteration (or round) is started.
+
+    With a journal, each eval run and each finished iteration is recorded
+    as it completes. If the journal already holds iterations, the loop
+    picks up after the last one instead of starting over.
+
+    surrogate_mode="order" has a TriggerSurrogate, calibrated on every
+    iteration's results, start the most uncertain queries first.
+    "budget" additionally runs only the most uncertain surrogate_budget
+    share of queries after the first iteration and predicts the rest; such
+    iterations are marked "estimated" in history, the improver only sees
+    measured results, and an estimated best candidate is re-evaluated on
+    the full set; the best is then chosen among fully measured iterations.
+    An estimated iteration never ends the loop as all_passed.
+
+    abort_hopeless runs the queries that failed in the previous iteration
+    first and stops evaluating a candidate as soon as its train failures
+    show it can no longer match the best train score so far. Such
+    iterations are kept in history with "partial" set and only the
+    queries that completed, and are never picked as best.
+
+    pipeline starts improve_description in a background thread as soon as
+    an iteration's train results are in (train queries are run first), so
+    the next proposal is written while the test queries are still running.
+    With speculate_at < 1 it starts once that fraction of train queries is
+    done, from those results alone. Either way the improver sees train
+    results only; if no train query has failed yet, it waits for the
+    normal, serial path.
+
+    search="halving" replaces the linear loop with successive_halving():
+    max_iterations counts rounds of `candidates` parallel proposals, and
+    budget caps the total number of `claude` calls. Every candidate is
+    kept in history with its "round", "candidate" and "fate"; eliminated
+    ones are "partial". The surrogate, abort and pipeline options apply to
+    linear search only; with a journal, halving resumes after its last
+    finished round.
+
+    history_keep and history_budget bound the history embedded in each
+    improver prompt (see improve_description.compact_history).
+
+    n_candidates > 1 has linear search write that many descriptions
+    concurrently per iteration, drop near-duplicates of ones already scored
+    (see improve_description_candidates), and screen the rest on the train
+    set in one run_eval_many batch; the one passing the most train queries
+    is evaluated next (with the trigger cache or a journal, its screening
+    runs are reused), and the others are added to history as "partial",
+    "screened_out" entries, so later prompts show them. If every proposal
+    is a near-duplicate, the loop stops (exit reason "no_new_description").
+    Halving always dedups its proposals.
+
+    With a response_cache, improver calls whose prompt, model and CLI
+    version were seen before reuse the stored response.
+    """
     project_root = find_project_root()
     name, original_description, content = parse_skill_md(skill_path)
     current_description = description_override or original_description
 
+    if isinstance(live_report, (str, Path)):
+        live_report_path, live_report = live_report, None
+    owns_report = live_report is None and live_report_path is not None
+    if owns_report:
+        live_report = LiveReport(Path(live_report_path), skill_name=name)
+
     # Split into train/test if holdout > 0
     if holdout > 0:
         train_set, test_set = split_eval_set(eval_set, holdout)
@@ -73,159 +537,400 @@ def run_loop(
         train_set = eval_set
         test_set = []
 
-    history = []
-    exit_reason = "unknown"
-
-    for iteration in range(1, max_iterations + 1):
-        if verbose:
-            print(f"\n{'='*60}", file=sys.stderr)
-            print(f"Iteration {iteration}/{max_iterations}", file=sys.stderr)
-            print(f"Description: {current_description}", file=sys.stderr)
-            print(f"{'='*60}", file=sys.stderr)
-
-        # Evaluate train + test together in one batch for parallelism
-        all_queries = train_set + test_set
-        t0 = time.time()
-        all_results = run_eval(
-            eval_set=all_queries,
-            skill_name=name,
-            description=current_description,
-            num_workers=num_workers,
-            timeout=timeout,
-            project_root=project_root,
+    eval_kwargs = dict(
+        skill_name=name,
+        num_workers=num_workers,
+        timeout=timeout,
+        project_root=project_root,
+        runs_per_query=runs_per_query,
+        trigger_threshold=trigger_threshold,
+        model=model,
+        backend=backend,
+        recycle_after=recycle_after,
+        cache=cache,
+        early_stop=early_stop,
+        confidence=confidence,
+        max_workers=max_workers,
+        max_retries=max_retries,
+        claude_bin=claude_bin,
+        journal=journal,
+        hedge=hedge,
+        hedge_percentile=hedge_percentile,
+        fair_share=fair_share,
+    )
+    if live_report is not None:
+        live_report.start(
+            train_set, test_set,
+            original_description=original_description,
+            holdout=holdout,
             runs_per_query=runs_per_query,
             trigger_threshold=trigger_threshold,
-            model=model,
         )
-        eval_elapsed = time.time() - t0
-
-        # Split results back into train/test by matching queries
-        train_queries_set = {q["query"] for q in train_set}
-        train_result_list = [r for r in all_results["results"] if r["query"] in train_queries_set]
-        test_result_list = [r for r in all_results["results"] if r["query"] not in train_queries_set]
+        eval_kwargs["on_run"] = live_report.on_run
 
-        train_passed = sum(1 for r in train_result_list if r["pass"])
-        train_total = len(train_result_list)
-        train_summary = {"passed": train_passed, "failed": train_total - train_passed, "total": train_total}
-        train_results = {"results": train_result_list, "summary": train_summary}
-
-        if test_set:
-            test_passed = sum(1 for r in test_result_list if r["pass"])
-            test_total = len(test_result_list)
-            test_summary = {"passed": test_passed, "failed": test_total - test_passed, "total": test_total}
-            test_results = {"results": test_result_list, "summary": test_summary}
-        else:
-            test_results = None
-            test_summary = None
-
-        history.append({
-            "iteration": iteration,
-            "description": current_description,
-            "train_passed": train_summary["passed"],
-            "train_failed": train_summary["failed"],
-            "train_total": train_summary["total"],
-            "train_results": train_results["results"],
-            "test_passed": test_summary["passed"] if test_summary else None,
-            "test_failed": test_summary["failed"] if test_summary else None,
-            "test_total": test_summary["total"] if test_summary else None,
-            "test_results": test_results["results"] if test_results else None,
-            # For backward compat with report generator
-            "passed": train_summary["passed"],
-            "failed": train_summary["failed"],
-            "total": train_summary["total"],
-            "results": train_results["results"],
-        })
-
-        # Write live report if path provided
-        if live_report_path:
-            partial_output = {
-                "original_description": original_description,
-                "best_description": current_description,
-                "best_score": "in progress",
-                "iterations_run": len(history),
-                "holdout": holdout,
-                "train_size": len(train_set),
-                "test_size": len(test_set),
-                "history": history,
-            }
-            live_report_path.write_text(generate_html(partial_output, auto_refresh=True, skill_name=name))
-
-        if verbose:
-            def print_eval_stats(label, results, elapsed):
-                pos = [r for r in results if r["should_trigger"]]
-                neg = [r for r in results if not r["should_trigger"]]
-                tp = sum(r["triggers"] for r in pos)
-                pos_runs = sum(r["runs"] for r in pos)
-                fn = pos_runs - tp
-                fp = sum(r["triggers"] for r in neg)
-                neg_runs = sum(r["runs"] for r in neg)
-                tn = neg_runs - fp
-                total = tp + tn + fp + fn
-                precision = tp / (tp + fp) if (tp + fp) > 0 else 1.0
-                recall = tp / (tp + fn) if (tp + fn) > 0 else 1.0
-                accuracy = (tp + tn) / total if total > 0 else 0.0
-                print(f"{label}: {tp+tn}/{total} correct, precision={precision:.0%} recall={recall:.0%} accuracy={accuracy:.0%} ({elapsed:.1f}s)", file=sys.stderr)
-                for r in results:
-                    status = "PASS" if r["pass"] else "FAIL"
-                    rate_str = f"{r['triggers']}/{r['runs']}"
-                    print(f"  [{status}] rate={rate_str} expected={r['should_trigger']}: {r['query'][:60]}", file=sys.stderr)
-
-            print_eval_stats("Train", train_results["results"], eval_elapsed)
-            if test_summary:
-                print_eval_stats("Test ", test_results["results"], 0)
-
-        if train_summary["failed"] == 0:
-            exit_reason = f"all_passed (iteration {iteration})"
-            if verbose:
-                print(f"\nAll train queries passed on iteration {iteration}!", file=sys.stderr)
-            break
-
-        if iteration == max_iterations:
-            exit_reason = f"max_iterations ({max_iterations})"
-            if verbose:
-                print(f"\nMax iterations reached ({max_iterations}).", file=sys.stderr)
-            break
-
-        # Improve the description based on train results
-        if verbose:
-            print(f"\nImproving description...", file=sys.stderr)
-
-        t0 = time.time()
-        # Strip test scores from history so improvement model can't see them
+    def improver_inputs(description: str, entries: list[dict]) -> dict:
+        """Arguments for the improver; entries[-1] is the current iteration."""
+        # Strip test scores from history so improvement model can't see them,
+        # and surrogate predictions so it only sees what was actually run
         blinded_history = [
-            {k: v for k, v in h.items() if not k.startswith("test_")}
-            for h in history
+            {k: v for k, v in measured_only(h).items() if not k.startswith("test_")}
+            for h in entries
         ]
-        new_description = improve_description(
+        measured = blinded_history[-1]["train_results"]
+        measured_passed = sum(1 for r in measured if r["pass"])
+        train_results = {"results": measured, "summary": {
+            "passed": measured_passed, "failed": len(measured) - measured_passed, "total": len(measured),
+        }}
+        return dict(
             skill_name=name,
             skill_content=content,
-            current_description=current_description,
+            current_description=description,
             eval_results=train_results,
             history=blinded_history,
             model=model,
             log_dir=log_dir,
-            iteration=iteration,
+            history_keep=history_keep,
+            history_budget=history_budget,
+            response_cache=response_cache,
         )
-        improve_elapsed = time.time() - t0
 
+    def propose(iteration: int, description: str, entries: list[dict], cancel: CancelToken | None = None) -> list[str]:
+        """Ask the improver for the next description(s); entries[-1] is the current iteration."""
+        with tracing.span("improve_description", lane="improver", iteration=iteration, candidates=n_candidates):
+            if n_candidates > 1:
+                return improve_description_candidates(
+                    **improver_inputs(description, entries), n_candidates=n_candidates, iteration=iteration,
+                    cancel=cancel,
+                )
+            return [improve_description(**improver_inputs(description, entries), iteration=iteration, cancel=cancel)]
+
+    def screen(iteration: int, descriptions: list[str]) -> tuple[str, list[dict]]:
+        """The description passing the most train queries (the first on ties), in one batch.
+
+        Also returns a history entry for each of the others, marked
+        "screened_out" (and "partial", as they have no test results).
+        """
+        if len(descriptions) == 1:
+            return descriptions[0], []
+        if verbose:
+            print(f"Screening {len(descriptions)} candidates on the train set...", file=sys.stderr)
+        with tracing.span("screen_candidates", candidates=len(descriptions)):
+            outputs = run_eval_many(eval_set=train_set, descriptions=descriptions, **{**eval_kwargs, "on_run": None})
+        scores = [output["summary"]["passed"] for output in outputs]
+        if verbose:
+            for description, score in zip(descriptions, scores):
+                print(f"  {score}/{len(train_set)} train: {description[:60]}", file=sys.stderr)
+        winner = scores.index(max(scores))
+        losers = []
+        for i, (description, output) in enumerate(zip(descriptions, outputs)):
+            if i == winner:
+                continue
+            if surrogate is not None:
+                surrogate.observe(description, output["results"])
+            entry = make_history_entry(iteration + 1, description, output["results"], train_set, test_set)
+            entry.update(
+                candidate=i + 1,
+                partial=True,
+                screened_out=True,
+                fate=f"screened out before iteration {iteration + 1} ({scores[i]}/{len(train_set)} train, "
+                     f"the winner had {scores[winner]})",
+                note="Lost the train-set screening to another candidate, so it was never scored on the test set.",
+            )
+            losers.append(entry)
+        return descriptions[winner], losers
+
+    def propose_candidates(iteration: int, description: str, entries: list[dict], k: int) -> list[str]:
+        """Up to k new descriptions, none a rewording of one already in entries."""
+        return improve_description_candidates(**improver_inputs(description, entries), n_candidates=k, iteration=iteration)
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="improver") if pipeline else None
+    # Stops the latest pipelined proposal if the loop ends without using it
+    improver_cancel: CancelToken | None = None
+
+    surrogate = None
+    if surrogate_mode != "off":
+        surrogate = TriggerSurrogate([q["query"] for q in eval_set], trigger_threshold)
+
+    history = []
+    exit_reason = "unknown"
+    finished = False
+    claude_calls = None
+    if journal is not None and journal.rounds:
+        history = [entry for record in journal.rounds for entry in record["entries"]]
+        last = journal.rounds[-1]
+        if last["exit_reason"]:
+            exit_reason = last["exit_reason"]
+            claude_calls = last["spent"]
+            finished = True
+        if verbose:
+            print(f"Resuming after round {last['round']} ({'finished' if finished else 'continuing'})", file=sys.stderr)
+        if live_report is not None:
+            for h in history:
+                live_report.entry(h)
+    elif journal is not None and journal.iterations:
+        history = [entry for record in journal.iterations for entry in [record["entry"], *record.get("screened", [])]]
+        last = journal.iterations[-1]
+        if last["exit_reason"]:
+            exit_reason = last["exit_reason"]
+            finished = True
+        else:
+            current_description = last["next_description"]
         if verbose:
-            print(f"Proposed ({improve_elapsed:.1f}s): {new_description}", file=sys.stderr)
+            print(f"Resuming after iteration {len(journal.iterations)} ({'finished' if finished else 'continuing'})", file=sys.stderr)
+        if surrogate is not None:
+            for h in history:
+                measured = measured_only(h)
+                surrogate.observe(h["description"], measured["train_results"] + (measured["test_results"] or []))
+        if live_report is not None:
+            for h in history:
+                live_report.entry(h)
+
+    if search == "halving" and not finished:
+        def evaluate(queries: list[dict], descriptions: list[str]) -> list[list[dict]]:
+            on_result = live_report.wrap_on_result() if live_report is not None else None
+            outputs = run_eval_many(eval_set=queries, descriptions=descriptions, on_result=on_result, **eval_kwargs)
+            return [output["results"] for output in outputs]
+
+        exit_reason, claude_calls = successive_halving(
+            history, current_description, train_set, test_set, propose_candidates, evaluate,
+            runs_per_query=runs_per_query,
+            candidates=candidates,
+            budget=budget,
+            max_rounds=max_iterations,
+            verbose=verbose,
+            on_candidate=live_report.row if live_report is not None else None,
+            on_entry=live_report.entry if live_report is not None else None,
+            deadline=deadline,
+            journal=journal,
+        )
+        finished = True
+
+    try:
+        # Candidates screened out on the train set are in history but are not iterations
+        iterations_done = sum(1 for h in history if not h.get("screened_out"))
+        for iteration in range(iterations_done + 1, max_iterations + 1):
+            if finished:
+                break
+            if history and deadline is not None and time.monotonic() >= deadline:
+                exit_reason = f"deadline (iteration {iteration - 1})"
+                if verbose:
+                    print(f"\nDeadline reached before iteration {iteration}.", file=sys.stderr)
+                break
+            iteration_start = tracing.now()
+            if verbose:
+                print(f"\n{'='*60}", file=sys.stderr)
+                print(f"Iteration {iteration}/{max_iterations}", file=sys.stderr)
+                print(f"Description: {current_description}", file=sys.stderr)
+                print(f"{'='*60}", file=sys.stderr)
+
+            # Evaluate train + test together in one batch for parallelism
+            all_queries = train_set + test_set
+            priorities = None
+            eval_queries = all_queries
+            on_result = None
+            if surrogate is not None and surrogate.offsets:
+                priorities = surrogate.priorities(current_description, [q["query"] for q in all_queries])
+                if surrogate_mode == "budget":
+                    # Only the most uncertain queries are paid for; the rest are predicted.
+                    k = max(1, math.ceil(surrogate_budget * len(all_queries)))
+                    chosen = set(sorted(priorities, key=priorities.get, reverse=True)[:k])
+                    eval_queries = [q for q in all_queries if q["query"] in chosen]
+            if abort_hopeless:
+                best_train = max((h["train_passed"] for h in history if is_complete(h)), default=None)
+                if best_train is not None:
+                    # Last iteration's failures are the likeliest to fail again.
+                    last = next(h for h in reversed(history) if not h.get("screened_out"))
+                    previously_failed = {r["query"] for r in last["train_results"] if not r["pass"]}
+                    priorities = {
+                        q["query"]: (priorities or {}).get(q["query"], 0.0) + (1.0 if q["query"] in previously_failed else 0.0)
+                        for q in all_queries
+                    }
+                    on_result = failure_budget(train_set, best_train)
+            improver: Future | None = None
+            if executor is not None and iteration < max_iterations:
+                train_queries = {q["query"] for q in train_set}
+                priorities = {
+                    q["query"]: (priorities or {}).get(q["query"], 0.0) + (2.0 if q["query"] in train_queries else 0.0)
+                    for q in all_queries
+                }
+                n_train = sum(1 for q in eval_queries if q["query"] in train_queries)
+                start_at = max(1, math.ceil(speculate_at * n_train))
+                train_done: list[dict] = []
+
+                def pipelined(description: str, result: dict, on_result=on_result, iteration=iteration) -> bool:
+                    nonlocal improver, improver_cancel
+                    abort = on_result(description, result) if on_result is not None else False
+                    if result["query"] in train_queries:
+                        train_done.append(result)
+                        failed = any(not r["pass"] for r in train_done)
+                        if improver is None and not abort and failed and len(train_done) >= start_at:
+                            entry = make_history_entry(iteration, description, list(train_done), train_set, [])
+                            if len(train_done) < n_train:
+                                entry["note"] = f"Speculative proposal from {len(train_done)} of {n_train} train results."
+                            if verbose:
+                                print(f"Improving description from {len(train_done)}/{n_train} train results...", file=sys.stderr)
+                            improver_cancel = CancelToken()
+                            improver = executor.submit(propose, iteration, description, history + [entry], improver_cancel)
+                    return abort
+
+                on_result = pipelined
+            if live_report is not None:
+                live_report.row(iteration, current_description)
+                live_report.status(f"Iteration {iteration}/{max_iterations}: evaluating")
+                on_result = live_report.wrap_on_result(on_result)
+            t0 = time.time()
+            all_results = run_eval(
+                eval_set=eval_queries,
+                description=current_description,
+                priorities=priorities,
+                on_result=on_result,
+                **eval_kwargs,
+            )
+            eval_elapsed = time.time() - t0
+            results = all_results["results"]
+            aborted = all_results["summary"].get("aborted", False)
+            if surrogate is not None:
+                surrogate.observe(current_description, results)
+                if len(eval_queries) < len(all_queries) and not aborted:
+                    results = fill_predicted(surrogate, current_description, all_queries, results, trigger_threshold)
+
+            entry = make_history_entry(iteration, current_description, results, train_set, test_set)
+            if aborted:
+                entry["partial"] = True
+                entry["note"] = (
+                    f"Aborted after {len(results)} of {len(all_queries)} queries: it could no longer "
+                    f"match the best train score, so only the completed queries are listed."
+                )
+                if verbose:
+                    print(f"Aborted: cannot match the best train score ({len(results)}/{len(all_queries)} queries run)", file=sys.stderr)
+            history.append(entry)
+            if live_report is not None:
+                live_report.entry(entry)
+
+            if verbose:
+                def print_eval_stats(label, results, elapsed):
+                    pos = [r for r in results if r["should_trigger"]]
+                    neg = [r for r in results if not r["should_trigger"]]
+                    tp = sum(r["triggers"] for r in pos)
+                    pos_runs = sum(r["runs"] for r in pos)
+                    fn = pos_runs - tp
+                    fp = sum(r["triggers"] for r in neg)
+                    neg_runs = sum(r["runs"] for r in neg)
+                    tn = neg_runs - fp
+                    total = tp + tn + fp + fn
+                    precision = tp / (tp + fp) if (tp + fp) > 0 else 1.0
+                    recall = tp / (tp + fn) if (tp + fn) > 0 else 1.0
+                    accuracy = (tp + tn) / total if total > 0 else 0.0
+                    print(f"{label}: {tp+tn}/{total} correct, precision={precision:.0%} recall={recall:.0%} accuracy={accuracy:.0%} ({elapsed:.1f}s)", file=sys.stderr)
+                    for r in results:
+                        status = "PASS" if r["pass"] else "FAIL"
+                        rate_str = f"~{r['trigger_rate']:.2f}" if r.get("predicted") else f"{r['triggers']}/{r['runs']}"
+                        print(f"  [{status}] rate={rate_str} expected={r['should_trigger']}: {r['query'][:60]}", file=sys.stderr)
+
+                print_eval_stats("Train", entry["train_results"], eval_elapsed)
+                if test_set:
+                    print_eval_stats("Test ", entry["test_results"], 0)
 
-        current_description = new_description
+            # Surrogate-predicted passes don't count: stop only once every train
+            # query was actually run and passed.
+            if entry["train_failed"] == 0 and not entry.get("estimated"):
+                tracing.record("loop.iteration", iteration_start, tracing.now(), iteration=iteration)
+                exit_reason = f"all_passed (iteration {iteration})"
+                if journal is not None:
+                    journal.record_iteration(iteration, entry, None, exit_reason)
+                if verbose:
+                    print(f"\nAll train queries passed on iteration {iteration}!", file=sys.stderr)
+                break
+
+            if iteration == max_iterations:
+                tracing.record("loop.iteration", iteration_start, tracing.now(), iteration=iteration)
+                exit_reason = f"max_iterations ({max_iterations})"
+                if journal is not None:
+                    journal.record_iteration(iteration, entry, None, exit_reason)
+                if verbose:
+                    print(f"\nMax iterations reached ({max_iterations}).", file=sys.stderr)
+                break
+
+            # Improve the description based on train results
+            t0 = time.time()
+            if live_report is not None:
+                live_report.status(f"Iteration {iteration}/{max_iterations}: improving the description")
+            if improver is not None:
+                if verbose:
+                    print(f"\nWaiting for the proposal started during evaluation...", file=sys.stderr)
+                proposals = improver.result()
+            else:
+                if verbose:
+                    print(f"\nImproving description...", file=sys.stderr)
+                proposals = propose(iteration, current_description, history)
+            if not proposals:
+                # Every candidate reworded a description already scored
+                tracing.record("loop.iteration", iteration_start, tracing.now(), iteration=iteration)
+                exit_reason = f"no_new_description (iteration {iteration})"
+                if journal is not None:
+                    journal.record_iteration(iteration, entry, None, exit_reason)
+                if verbose:
+                    print(f"\nEvery proposal repeats a description already scored; stopping.", file=sys.stderr)
+                break
+            new_description, screened = screen(iteration, proposals)
+            improve_elapsed = time.time() - t0
+            tracing.record("loop.iteration", iteration_start, tracing.now(), iteration=iteration)
+            history.extend(screened)
+            if live_report is not None:
+                for loser in screened:
+                    live_report.entry(loser)
+
+            if verbose:
+                print(f"Proposed ({improve_elapsed:.1f}s): {new_description}", file=sys.stderr)
+
+            current_description = new_description
+            if journal is not None:
+                journal.record_iteration(iteration, entry, current_description, screened=screened)
+    finally:
+        if executor is not None:
+            # A proposal still running when the loop ends (on any exit, including
+            # an error or interrupt) is not needed: kill its claude call rather
+            # than wait for it, since worker threads are joined at interpreter exit.
+            if improver_cancel is not None:
+                improver_cancel.cancel()
+            executor.shutdown(wait=True)
 
     # Find the best iteration by TEST score (or train if no test set)
+    # (aborted candidates are provably worse on train and were not fully scored)
+    def pick_best(entries: list[dict]) -> dict:
+        if test_set:
+            return max(entries, key=lambda h: h["test_passed"] or 0)
+        return max(entries, key=lambda h: h["train_passed"])
+
+    best = pick_best([h for h in history if not h.get("partial")] or history)
+
+    if best.get("estimated"):
+        # Budget mode picked the best on partly predicted scores; report it
+        # with every query actually run.
+        if verbose:
+            print(f"\nFinal check of iteration {best['iteration']} on the full eval set...", file=sys.stderr)
+        if live_report is not None:
+            live_report.row(best["iteration"], best["description"])
+        final = run_eval(eval_set=train_set + test_set, description=best["description"], **eval_kwargs)
+        checked = make_history_entry(best["iteration"], best["description"], final["results"], train_set, test_set)
+        checked["final_check"] = True
+        history[history.index(best)] = checked
+        if live_report is not None:
+            live_report.entry(checked)
+        # The measured score may be lower than the estimate; choose again
+        # among the fully measured entries only.
+        best = pick_best([h for h in history if is_complete(h)])
+
     if test_set:
-        best = max(history, key=lambda h: h["test_passed"] or 0)
         best_score = f"{best['test_passed']}/{best['test_total']}"
     else:
-        best = max(history, key=lambda h: h["train_passed"])
         best_score = f"{best['train_passed']}/{best['train_total']}"
 
     if verbose:
         print(f"\nExit reason: {exit_reason}", file=sys.stderr)
         print(f"Best score: {best_score} (iteration {best['iteration']})", file=sys.stderr)
 
-    return {
+    output = {
         "exit_reason": exit_reason,
         "original_description": original_description,
         "best_description": best["description"],
@@ -233,12 +938,19 @@ def run_loop(
         "best_train_score": f"{best['train_passed']}/{best['train_total']}",
         "best_test_score": f"{best['test_passed']}/{best['test_total']}" if test_set else None,
         "final_description": current_description,
-        "iterations_run": len(history),
+        "iterations_run": sum(1 for h in history if not h.get("screened_out")),
         "holdout": holdout,
         "train_size": len(train_set),
         "test_size": len(test_set),
         "history": history,
     }
+    if claude_calls is not None:
+        output["search"] = {"mode": search, "candidates": candidates, "budget": budget, "claude_calls": claude_calls}
+    if owns_report:
+        live_report.done(output)
+        live_report.close()
+        live_report.path.write_text(generate_html(output, auto_refresh=False, skill_name=name))
+    return output
 
 
 def main():
@@ -246,21 +958,53 @@ def main():
     parser.add_argument("--eval-set", required=True, help="Path to eval set JSON file")
     parser.add_argument("--skill-path", required=True, help="Path to skill directory")
     parser.add_argument("--description", default=None, help="Override starting description")
-    parser.add_argument("--num-workers", type=int, default=10, help="Number of parallel workers")
+    parser.add_argument("--num-workers", type=int, default=10, help="Number of concurrent claude processes to start with")
     parser.add_argument("--timeout", type=int, default=30, help="Timeout per query in seconds")
-    parser.add_argument("--max-iterations", type=int, default=5, help="Max improvement iterations")
+    parser.add_argument("--max-iterations", type=int, default=5, help="Max improvement iterations (rounds with --search halving)")
     parser.add_argument("--runs-per-query", type=int, default=3, help="Number of runs per query")
     parser.add_argument("--trigger-threshold", type=float, default=0.5, help="Trigger rate threshold")
     parser.add_argument("--holdout", type=float, default=0.4, help="Fraction of eval set to hold out for testing (0 to disable)")
     parser.add_argument("--model", required=True, help="Model for improvement")
+    parser.add_argument("--backend", choices=["process", "pool"], default="process", help="'process' spawns claude -p per query; 'pool' reuses one persistent claude session per worker")
+    parser.add_argument("--recycle-after", type=int, default=20, help="With --backend pool, restart a worker's session after this many queries")
+    parser.add_argument("--cache-dir", default=None, help="Directory for the trigger result cache (default: ~/.cache/skill-creator/trigger-cache)")
+    parser.add_argument("--no-cache", action="store_true", help="Always call claude; neither read nor write the trigger result cache")
+    parser.add_argument("--response-cache", default=None, metavar="DIR", help="Reuse improver responses cached in DIR (default: $SKILL_CREATOR_RESPONSE_CACHE, else no cache)")
+    parser.add_argument("--no-response-cache", action="store_true", help="Always call claude for improvements, even if $SKILL_CREATOR_RESPONSE_CACHE is set")
+    parser.add_argument("--max-workers", type=int, default=None, help="Let adaptive concurrency grow up to this many claude processes (default: twice --num-workers)")
+    parser.add_argument("--claude-bin", default="claude", help="Executable to run trigger evals with instead of claude (e.g. scripts/fake_claude.py)")
+    parser.add_argument("--max-retries", type=int, default=2, help="Retry a run this many times after a timeout, crash or rate limit")
+    parser.add_argument("--early-stop", choices=["off", "exact", "confidence"], default="off", help="Stop a query's runs once its pass/fail is settled ('exact') or clear at --confidence ('confidence')")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level for --early-stop confidence")
+    parser.add_argument("--surrogate", choices=["off", "order", "budget"], default="off", help="Use a local trigger predictor to run uncertain queries first ('order') or to run only the most uncertain --surrogate-budget share after iteration 1 ('budget')")
+    parser.add_argument("--surrogate-budget", type=float, default=0.5, help="With --surrogate budget, fraction of queries actually run per iteration")
+    parser.add_argument("--abort-hopeless", action="store_true", help="Run last iteration's failures first and stop evaluating a candidate once it cannot match the best train score")
+    parser.add_argument("--pipeline", action="store_true", help="Start improving the description as soon as train results are in, while test queries still run")
+    parser.add_argument("--speculate-at", type=float, default=1.0, help="With --pipeline, start improving once this fraction of train queries is done")
+    parser.add_argument("--search", choices=["linear", "halving"], default="linear", help="'linear' improves one description per iteration; 'halving' races --candidates proposals per round with successive halving on train slices")
+    parser.add_argument("--candidates", type=int, default=4, help="With --search halving, descriptions proposed in parallel per round")
+    parser.add_argument("--budget", type=int, default=None, help="With --search halving, total claude calls to spend (trigger runs plus proposals)")
+    parser.add_argument("--n-candidates", type=int, default=1, help="With --search linear, descriptions written concurrently per iteration; rewordings of scored ones are dropped and the rest are screened on the train set")
+    parser.add_argument("--history-keep", type=int, default=HISTORY_KEEP, help="Previous attempts shown verbatim in the improver prompt; older ones are summarized")
+    parser.add_argument("--history-budget", type=int, default=HISTORY_BUDGET, help="Character budget for the history section of the improver prompt")
+    parser.add_argument("--full-history", action="store_true", help="Embed every previous attempt in full in the improver prompt (no compaction)")
+    parser.add_argument("--hedge", action="store_true", help="Race a duplicate run against runs slower than their --hedge-percentile latency")
+    parser.add_argument("--hedge-percentile", type=float, default=90.0, help="Latency percentile after which a run is hedged")
     parser.add_argument("--verbose", action="store_true", help="Print progress to stderr")
     parser.add_argument("--report", default="auto", help="Generate HTML report at this path (default: 'auto' for temp file, 'none' to disable)")
-    parser.add_argument("--results-dir", default=None, help="Save all outputs (results.json, report.html, log.txt) to a timestamped subdirectory here")
+    parser.add_argument("--live-server", action="store_true", help="Stream the live report from a local HTTP server instead of rewriting the report file")
+    parser.add_argument("--results-dir", default=None, help="Save all outputs (results.json, report.html, logs/, trace.json, journal.jsonl) to a timestamped subdirectory here")
+    parser.add_argument("--resume", default=None, metavar="DIR", help="Resume an interrupted run from its timestamped results directory (rerun with the same arguments)")
     args = parser.parse_args()
 
     eval_set = json.loads(Path(args.eval_set).read_text())
     skill_path = Path(args.skill_path)
 
+    if args.search == "halving" and args.budget is not None and args.budget < len(eval_set) * args.runs_per_query:
+        print(f"Error: --budget {args.budget} does not cover scoring the starting description "
+              f"({len(eval_set) * args.runs_per_query} claude calls)", file=sys.stderr)
+        sys.exit(1)
+
     if not (skill_path / "SKILL.md").exists():
         print(f"Error: No SKILL.md found at {skill_path}", file=sys.stderr)
         sys.exit(1)
@@ -275,21 +1019,32 @@ def main():
         else:
             live_report_path = Path(args.report)
         # Open the report immediately so the user can watch
-        live_report_path.write_text("<html><body><h1>Starting optimization loop...</h1><meta http-equiv='refresh' content='5'></body></html>")
-        webbrowser.open(str(live_report_path))
+        live_report = LiveReport(live_report_path, skill_name=name, serve=args.live_server)
+        webbrowser.open(live_report.url or live_report.path.resolve().as_uri())
     else:
-        live_report_path = None
+        live_report = None
 
     # Determine output directory (create before run_loop so logs can be written)
-    if args.results_dir:
+    if args.resume:
+        results_dir = Path(args.resume)
+        if not (results_dir / "journal.jsonl").is_file():
+            print(f"Error: No journal.jsonl found in {results_dir}", file=sys.stderr)
+            sys.exit(1)
+        tracing.enable()
+    elif args.results_dir:
         timestamp = time.strftime("%Y-%m-%d_%H%M%S")
         results_dir = Path(args.results_dir) / timestamp
         results_dir.mkdir(parents=True, exist_ok=True)
+        tracing.enable()
     else:
         results_dir = None
 
     log_dir = results_dir / "logs" if results_dir else None
 
+    cache = None if args.no_cache else TriggerCache(Path(args.cache_dir) if args.cache_dir else default_cache_dir())
+    journal = Journal(results_dir / "journal.jsonl") if results_dir else None
+    response_cache = open_response_cache(args.response_cache, args.no_response_cache)
+
     output = run_loop(
         eval_set=eval_set,
         skill_path=skill_path,
@@ -302,25 +1057,68 @@ def main():
         holdout=args.holdout,
         model=args.model,
         verbose=args.verbose,
-        live_report_path=live_report_path,
+        live_report=live_report,
         log_dir=log_dir,
+        backend=args.backend,
+        recycle_after=args.recycle_after,
+        cache=cache,
+        early_stop=args.early_stop,
+        confidence=args.confidence,
+        max_workers=args.max_workers,
+        max_retries=args.max_retries,
+        claude_bin=args.claude_bin,
+        journal=journal,
+        hedge=args.hedge,
+        hedge_percentile=args.hedge_percentile,
+        surrogate_mode=args.surrogate,
+        surrogate_budget=args.surrogate_budget,
+        abort_hopeless=args.abort_hopeless,
+        pipeline=args.pipeline,
+        speculate_at=args.speculate_at,
+        search=args.search,
+        candidates=args.candidates,
+        budget=args.budget,
+        history_keep=None if args.full_history else args.history_keep,
+        history_budget=args.history_budget,
+        n_candidates=args.n_candidates,
+        response_cache=response_cache,
     )
 
+    if journal is not None:
+        journal.close()
+
+    if cache is not None:
+        if args.verbose:
+            print(f"Cache: {cache.hits} hits, {cache.misses} misses", file=sys.stderr)
+        cache.close()
+
+    if response_cache is not None:
+        if args.verbose:
+            print(f"Response cache: {response_cache.hits} hits, {response_cache.misses} misses", file=sys.stderr)
+        response_cache.close()
+
     # Save JSON output
     json_output = json.dumps(output, indent=2)
     print(json_output)
     if results_dir:
         (results_dir / "results.json").write_text(json_output)
 
-    # Write final HTML report (without auto-refresh)
-    if live_report_path:
-        live_report_path.write_text(generate_html(output, auto_refresh=False, skill_name=name))
-        print(f"\nReport: {live_report_path}", file=sys.stderr)
+    # Write final HTML report over the live shell
+    if live_report is not None:
+        live_report.done(output)
+        live_report.close()
+        live_report.path.write_text(generate_html(output, auto_refresh=False, skill_name=name))
+        print(f"\nReport: {live_report.path}", file=sys.stderr)
 
-    if results_dir and live_report_path:
+    if results_dir and live_report is not None:
         (results_dir / "report.html").write_text(generate_html(output, auto_refresh=False, skill_name=name))
 
     if results_dir:
+        tracing.write_trace(results_dir / "trace.json")
+        trace_summary = tracing.format_summary(tracing.summarize())
+        (results_dir / "trace_summary.txt").write_text(trace_summary + "\n")
+        if args.verbose:
+            print(f"\nStage timings:\n{trace_summary}", file=sys.stderr)
         print(f"Results saved to: {results_dir}", file=sys.stderr)
 
 
@@ -0,0 +1,279 @@
+"""Persistent `claude` sessions for trigger evaluation.
+
+Spawning a fresh `claude -p` per query pays the CLI cold start (Node boot,
+auth, settings and command discovery) every single time. A SessionPool keeps
+one long-lived `claude` per worker in streaming-input mode and feeds it
+queries one after another, clearing the conversation between them so each
+query is still judged in a fresh context.
+
+Each worker's session runs from that worker's isolated root (see
+run_eval.WorkerRoots), which holds the single command file for the description
+under test, so the pool lives for exactly one run_eval() call.
+"""
+
+import asyncio
+import json
+import uuid
+from collections import deque
+from pathlib import Path
+
+from scripts import tracing
+from scripts.claude_cli import (
+    RUN_EVENTS,
+    STREAM_CHUNK_SIZE,
+    TriggerDetector,
+    claude_env,
+    is_rate_limit_event,
+)
+from scripts.concurrency import QueryFailed
+from scripts.stream_decoder import StreamDecoder, StreamEvent
+
+
+class ClaudeSession:
+    """One long-lived `claude` process speaking stream-json on stdin/stdout.
+
+    Create with `await ClaudeSession.start(...)`.
+    """
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.decoder = StreamDecoder(RUN_EVENTS)
+        self._events: deque[StreamEvent] = deque()
+        self.queries_served = 0
+        # Cleared whenever a turn could not be brought back to a clean
+        # `result` boundary; the pool recycles unhealthy sessions.
+        self.healthy = True
+
+    @classmethod
+    async def start(cls, project_root: str, model: str | None = None, claude_bin: str = "claude") -> "ClaudeSession":
+        cmd = [
+            claude_bin,
+            "-p",
+            "--input-format", "stream-json",
+            "--output-format", "stream-json",
+            "--verbose",
+            "--include-partial-messages",
+        ]
+        if model:
+            cmd.extend(["--model", model])
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                cwd=project_root,
+                env=claude_env(),
+            )
+        except OSError:
+            raise QueryFailed("spawn") from None
+        return cls(process)
+
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def _send(self, payload: dict) -> None:
+        self.process.stdin.write((json.dumps(payload) + "\n").encode("utf-8"))
+        await self.process.stdin.drain()
+
+    async def _send_user(self, text: str) -> None:
+        await self._send({"type": "user", "message": {"role": "user", "content": text}})
+
+    async def _read_event(self, deadline: float) -> StreamEvent | None:
+        """Return the next subscribed stream event, or None on timeout or EOF."""
+        loop = asyncio.get_running_loop()
+        while not self._events:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                chunk = await asyncio.wait_for(self.process.stdout.read(STREAM_CHUNK_SIZE), remaining)
+            except asyncio.TimeoutError:
+                return None
+            if not chunk:
+                self._events.extend(self.decoder.flush())
+                if not self._events:
+                    return None
+                break
+            self._events.extend(self.decoder.feed(chunk))
+        return self._events.popleft()
+
+    async def _drain_turn(self, timeout: float) -> dict | None:
+        """Consume events until the current turn's `result` and return it; None if it never comes."""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            event = await self._read_event(deadline)
+            if event is None:
+                return None
+            if event.kind == "result":
+                return event.data
+
+    async def _interrupt(self) -> None:
+        await self._send({
+            "type": "control_request",
+            "request_id": f"req_{uuid.uuid4().hex[:12]}",
+            "request": {"subtype": "interrupt"},
+        })
+
+    async def query(self, query: str, clean_name: str, timeout: int, drain_timeout: float = 10.0) -> bool:
+        """Send one query and return whether clean_name was triggered.
+
+        As in run_query_in_root, the decision is taken from the first stream
+        event that settles it. The rest of the turn is then interrupted and
+        drained so the session is positioned at a turn boundary again.
+        Raises QueryFailed on timeout, on the session dying, or on a rate
+        limit, after the turn has been cleaned up.
+        """
+        detector = TriggerDetector(clean_name)
+        try:
+            await self._send_user(query)
+        except (BrokenPipeError, ConnectionResetError):
+            self.healthy = False
+            raise QueryFailed("exit") from None
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        decision = None
+        failure = None
+        turn_finished = False
+        while decision is None:
+            event = await self._read_event(deadline)
+            if event is None:
+                failure = "timeout" if loop.time() >= deadline else "exit"
+                break
+            if is_rate_limit_event(event):
+                failure = "rate_limit"
+                turn_finished = event.kind == "result"
+                break
+            decision = detector.feed(event)
+            turn_finished = event.kind == "result"
+
+        self.queries_served += 1
+        if not turn_finished and self.alive():
+            try:
+                await self._interrupt()
+                turn_finished = await self._drain_turn(drain_timeout) is not None
+            except (BrokenPipeError, ConnectionResetError):
+                turn_finished = False
+        if not turn_finished:
+            self.healthy = False
+
+        if failure is not None:
+            raise QueryFailed(failure)
+        return decision
+
+    async def reset(self, timeout: float) -> bool:
+        """Clear the conversation so the next query starts from a fresh context.
+
+        In stream-json input mode the CLI runs /clear locally: it emits a
+        `conversation_reset` event and a `result` marked local_command
+        "clear", without a model turn. Any other result means /clear went to
+        the model as a prompt and the context was kept, so the reset counts
+        as failed. Doubles as the health check: a session that cannot
+        complete a /clear within the timeout is not safe to reuse either.
+        """
+        try:
+            await self._send_user("/clear")
+            result = await self._drain_turn(timeout)
+        except (BrokenPipeError, ConnectionResetError):
+            result = None
+        ok = result is not None and result.get("local_command") == "clear"
+        if not ok:
+            self.healthy = False
+        return ok
+
+    async def close(self) -> None:
+        if not self.alive():
+            return
+        try:
+            self.process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        try:
+            await asyncio.wait_for(self.process.wait(), 2)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+
+
+class SessionPool:
+    """Pool of ClaudeSession workers bound to one candidate description.
+
+    Use as an async context manager. Callers hand each run_query() the
+    worker root it holds; the pool keeps at most one session per root and
+    starts it in that root on first use. Sessions are recycled after
+    recycle_after queries, or as soon as a health check (process alive +
+    successful reset) fails. stats counts sessions started and recycled,
+    failed resets and queries answered; run_eval reports it under
+    summary["pool"].
+    """
+
+    def __init__(
+        self,
+        clean_name: str,
+        model: str | None = None,
+        recycle_after: int = 20,
+        reset_timeout: float = 30.0,
+        claude_bin: str = "claude",
+    ):
+        self.clean_name = clean_name
+        self.model = model
+        self.claude_bin = claude_bin
+        self.recycle_after = recycle_after
+        self.reset_timeout = reset_timeout
+
+        self._idle: dict[str, ClaudeSession] = {}
+        self._sessions: set[ClaudeSession] = set()
+        self.stats = {"sessions_started": 0, "sessions_recycled": 0, "failed_resets": 0, "queries": 0}
+
+    async def __aenter__(self) -> "SessionPool":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        sessions, self._sessions = self._sessions, set()
+        self._idle = {}
+        await asyncio.gather(*(session.close() for session in sessions))
+
+    async def _checkout(self, project_root: str) -> ClaudeSession:
+        session = self._idle.pop(project_root, None)
+        if session is not None:
+            return session
+        with tracing.span("session.start", lane=f"{self.clean_name}/{Path(project_root).name}"):
+            session = await ClaudeSession.start(project_root, self.model, self.claude_bin)
+        self._sessions.add(session)
+        self.stats["sessions_started"] += 1
+        return session
+
+    async def _retire(self, session: ClaudeSession) -> None:
+        self._sessions.discard(session)
+        self.stats["sessions_recycled"] += 1
+        await session.close()
+
+    async def _checkin(self, session: ClaudeSession, project_root: str) -> None:
+        reusable = session.healthy and session.alive() and session.queries_served < self.recycle_after
+        if reusable and not await session.reset(self.reset_timeout):
+            self.stats["failed_resets"] += 1
+            reusable = False
+        if reusable:
+            self._idle[project_root] = session
+        else:
+            await self._retire(session)
+
+    async def run_query(self, query: str, timeout: int, project_root: str) -> tuple[bool, float]:
+        """Run one query on project_root's session.
+
+        Returns whether it triggered and the event loop time at which that
+        was known, i.e. before the session is reset for its next query.
+        """
+        session = await self._checkout(project_root)
+        try:
+            with tracing.span("query", lane=f"{self.clean_name}/{Path(project_root).name}"):
+                triggered = await session.query(query, self.clean_name, timeout)
+        except BaseException:
+            await self._retire(session)
+            raise
+        answered_at = asyncio.get_running_loop().time()
+        self.stats["queries"] += 1
+        await self._checkin(session, project_root)
+        return triggered, answered_at
@@ -0,0 +1,165 @@
+"""Incremental decoder for `claude --output-format stream-json` output.
+
+Lines are framed in place over one growing bytearray: a line is located with
+bytearray.find() between offsets and never copied unless it is going to be
+parsed, and the consumed prefix is dropped only once it makes up half the
+buffer, so framing stays amortized O(1) per byte.
+
+Most of the stream is events a caller does not care about (text deltas, full
+`assistant`/`user` payloads with tool results). A byte-level prefilter skips
+any line that cannot contain a subscribed event type before json.loads ever
+sees it. Lines that do get parsed are classified into typed StreamEvents.
+
+The prefilter only looks at the first PREFILTER_WINDOW bytes of a line. The
+CLI serializes the `type` keys first (`{"type":"stream_event","event":
+{"type":"content_block_delta","index":0,"delta":{"type":"input_json_delta"`),
+so every discriminating token sits well inside the window and the cost of
+skipping a multi-megabyte tool_result line does not depend on its length.
+"""
+
+import json
+from typing import Iterable, NamedTuple
+
+PREFILTER_WINDOW = 256
+
+
+class StreamEvent(NamedTuple):
+    """A classified stream-json event.
+
+    kind is one of EVENT_KINDS. data is the inner Anthropic stream event for
+    stream_event lines (content_block_start, deltas, ...) and the whole
+    top-level object otherwise (assistant, user, result, system).
+    """
+
+    kind: str
+    data: dict
+
+
+# Byte signatures that must appear in a raw line for it to possibly decode
+# to the given kind. Being too broad only costs a wasted parse; a missing
+# signature would drop events, so each kind lists the token that names it.
+EVENT_SIGNATURES: dict[str, tuple[bytes, ...]] = {
+    "message_start": (b"message_start",),
+    "content_block_start": (b"content_block_start",),
+    "tool_use_start": (b"content_block_start",),
+    "content_block_delta": (b"content_block_delta",),
+    "input_json_delta": (b"input_json_delta",),
+    "content_block_stop": (b"content_block_stop",),
+    "message_delta": (b"message_delta",),
+    "message_stop": (b"message_stop",),
+    "assistant": (b'"assistant"',),
+    "user": (b'"user"',),
+    "result": (b'"result"',),
+    "system": (b'"system"',),
+}
+
+EVENT_KINDS = frozenset(EVENT_SIGNATURES)
+
+
+def classify(obj: dict) -> StreamEvent | None:
+    """Map one parsed stream-json object to a StreamEvent (None if unknown)."""
+    top_type = obj.get("type")
+    if top_type == "stream_event":
+        se = obj.get("event", {})
+        se_type = se.get("type")
+        if se_type == "content_block_start":
+            if se.get("content_block", {}).get("type") == "tool_use":
+                return StreamEvent("tool_use_start", se)
+            return StreamEvent("content_block_start", se)
+        if se_type == "content_block_delta":
+            if se.get("delta", {}).get("type") == "input_json_delta":
+                return StreamEvent("input_json_delta", se)
+            return StreamEvent("content_block_delta", se)
+        if se_type in EVENT_KINDS:
+            return StreamEvent(se_type, se)
+        return None
+    if top_type in ("assistant", "user", "result", "system"):
+        return StreamEvent(top_type, obj)
+    return None
+
+
+class StreamDecoder:
+    """Frame and decode stream-json incrementally from arbitrary byte chunks.
+
+    subscribe limits decoding to the given kinds (see EVENT_KINDS); None
+    decodes everything. stats counts framed lines, how many were parsed and
+    how many the prefilter skipped.
+    """
+
+    def __init__(self, subscribe: Iterable[str] | None = None):
+        self._buf = bytearray()
+        self._start = 0
+        self._scan = 0
+        if subscribe is None:
+            self.subscribe = None
+            self._signatures = None
+        else:
+            self.subscribe = frozenset(subscribe)
+            unknown = self.subscribe - EVENT_KINDS
+            if unknown:
+                raise ValueError(f"Unknown stream event kinds: {sorted(unknown)}")
+            self._signatures = tuple(sorted({sig for kind in self.subscribe for sig in EVENT_SIGNATURES[kind]}))
+        self.stats = {"lines": 0, "parsed": 0, "skipped": 0}
+
+    def feed(self, chunk: bytes) -> list[StreamEvent]:
+        """Add a chunk and return the subscribed events completed by it."""
+        buf = self._buf
+        buf += chunk
+        find = buf.find
+        decode = self._decode
+        events = []
+        start = self._start
+        newline = find(b"\n", self._scan)
+        while newline != -1:
+            if newline > start:
+                event = decode(start, newline)
+                if event is not None:
+                    events.append(event)
+            start = newline + 1
+            newline = find(b"\n", start)
+
+        if start and start * 2 >= len(buf):
+            del buf[:start]
+            start = 0
+        self._start = start
+        self._scan = len(buf)
+        return events
+
+    def flush(self) -> list[StreamEvent]:
+        """Decode a trailing line that was never newline-terminated (at EOF)."""
+        events = []
+        if self._start < len(self._buf):
+            event = self._decode(self._start, len(self._buf))
+            if event is not None:
+                events.append(event)
+        self._buf.clear()
+        self._start = self._scan = 0
+        return events
+
+    def _decode(self, start: int, end: int) -> StreamEvent | None:
+        buf = self._buf
+        stats = self.stats
+        stats["lines"] += 1
+        if self._signatures is not None:
+            window_end = min(end, start + PREFILTER_WINDOW)
+            find = buf.find
+            for sig in self._signatures:
+                if find(sig, start, window_end) != -1:
+                    break
+            else:
+                stats["skipped"] += 1
+                return None
+        line = buf[start:end].strip()
+        if not line:
+            return None
+        stats["parsed"] += 1
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(obj, dict):
+            return None
+        event = classify(obj)
+        if event is None or (self.subscribe is not None and event.kind not in self.subscribe):
+            return None
+        return event
@@ -0,0 +1,132 @@
+"""Cheap local stand-in for `claude` when deciding which queries to pay for.
+
+TriggerSurrogate predicts a query's trigger rate under a description from the
+character n-gram TF-IDF cosine similarity of the two texts, passed through a
+logistic model that is recalibrated after every eval against the trigger
+rates actually observed. Each query also gets its own learned offset, so a
+query that keeps triggering (or keeps not triggering) whatever the wording
+is recognized as settled.
+
+The predictions are only used to spend `claude` calls well: run_loop orders
+the most uncertain queries first and, in budget mode, evaluates only the
+most uncertain share of queries in later iterations. Scores that count are
+always measured.
+
+The texts involved are a description and at most a few hundred short queries,
+so sparse dict vectors are plenty and no numeric library is needed.
+"""
+
+import math
+from collections import Counter
+
+NGRAM_SIZES = (3, 4, 5)
+
+
+def char_ngrams(text: str) -> Counter:
+    text = " ".join(text.lower().split())
+    padded = f" {text} "
+    grams = Counter()
+    for n in NGRAM_SIZES:
+        for i in range(len(padded) - n + 1):
+            grams[padded[i:i + n]] += 1
+    return grams
+
+
+def _sigmoid(x: float) -> float:
+    if x >= 0:
+        return 1 / (1 + math.exp(-x))
+    z = math.exp(x)
+    return z / (1 + z)
+
+
+class TriggerSurrogate:
+    """Online-calibrated trigger-rate predictor for one eval set.
+
+    queries is the full list of eval queries; it fixes the document
+    frequencies used for TF-IDF weighting.
+    """
+
+    def __init__(self, queries: list[str], threshold: float = 0.5, l2: float = 1.0, prior: float = 0.01):
+        self.threshold = threshold
+        # Penalties on the per-query offsets (l2) and on weight/bias (prior),
+        # the latter only to keep separable data from diverging.
+        self.l2 = l2
+        self.prior = prior
+        self._query_grams = {q: char_ngrams(q) for q in queries}
+        df = Counter()
+        for grams in self._query_grams.values():
+            df.update(grams.keys())
+        n_docs = len(queries) + 1
+        self._idf = {g: math.log(n_docs / (1 + c)) + 1 for g, c in df.items()}
+        self._default_idf = math.log(n_docs) + 1
+        self._query_vectors = {q: self._vector(grams) for q, grams in self._query_grams.items()}
+
+        # Logistic model: logit = weight * similarity + bias + offset[query]
+        self.weight = 0.0
+        self.bias = 0.0
+        self.offsets: dict[str, float] = {}
+        # (similarity, query, triggers, runs) for every observed (description, query)
+        self._observations: list[tuple[float, str, int, int]] = []
+
+    def _vector(self, grams: Counter) -> dict[str, float]:
+        vector = {g: c * self._idf.get(g, self._default_idf) for g, c in grams.items()}
+        norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+        return {g: v / norm for g, v in vector.items()}
+
+    def _similarity(self, description_vector: dict[str, float], query: str) -> float:
+        query_vector = self._query_vectors.get(query) or self._vector(char_ngrams(query))
+        return sum(v * description_vector.get(g, 0.0) for g, v in query_vector.items())
+
+    def predict(self, description: str, queries: list[str]) -> dict[str, float]:
+        """Predicted trigger rate for each query under description."""
+        description_vector = self._vector(char_ngrams(description))
+        return {
+            query: _sigmoid(
+                self.weight * self._similarity(description_vector, query)
+                + self.bias
+                + self.offsets.get(query, 0.0)
+            )
+            for query in queries
+        }
+
+    def uncertainty(self, rate: float) -> float:
+        """1 when a predicted rate sits on the pass/fail threshold, 0 at the far end."""
+        return 1 - abs(rate - self.threshold) / max(self.threshold, 1 - self.threshold)
+
+    def priorities(self, description: str, queries: list[str]) -> dict[str, float]:
+        """Uncertainty of each query's outcome under description (higher = run first)."""
+        return {q: self.uncertainty(p) for q, p in self.predict(description, queries).items()}
+
+    def observe(self, description: str, results: list[dict]) -> None:
+        """Record measured results (run_eval format) and recalibrate."""
+        description_vector = self._vector(char_ngrams(description))
+        for r in results:
+            if not r.get("runs"):
+                continue
+            sim = self._similarity(description_vector, r["query"])
+            self._observations.append((sim, r["query"], r["triggers"], r["runs"]))
+        self._fit()
+
+    def _fit(self, steps: int = 50, damping: float = 0.5) -> None:
+        # Damped diagonal Newton steps on the binomial log-likelihood, with an
+        # L2 penalty on the per-query offsets; warm-started from the last fit.
+        for _ in range(steps):
+            grad = {"weight": -self.prior * self.weight, "bias": -self.prior * self.bias}
+            curvature = {"weight": self.prior, "bias": self.prior}
+            grad_offsets: dict[str, float] = {}
+            curvature_offsets: dict[str, float] = {}
+            for sim, query, triggers, runs in self._observations:
+                p = _sigmoid(self.weight * sim + self.bias + self.offsets.get(query, 0.0))
+                residual = triggers - runs * p
+                h = runs * p * (1 - p)
+                grad["weight"] += residual * sim
+                grad["bias"] += residual
+                curvature["weight"] += h * sim * sim
+                curvature["bias"] += h
+                grad_offsets[query] = grad_offsets.get(query, 0.0) + residual
+                curvature_offsets[query] = curvature_offsets.get(query, 0.0) + h
+            self.weight += damping * grad["weight"] / curvature["weight"]
+            self.bias += damping * grad["bias"] / curvature["bias"]
+            for query, g in grad_offsets.items():
+                offset = self.offsets.get(query, 0.0)
+                self.offsets[query] = offset + damping * (g - self.l2 * offset) / (curvature_offsets[query] + self.l2)
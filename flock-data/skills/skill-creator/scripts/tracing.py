@@ -0,0 +1,129 @@
+"""Span tracing for the description optimization pipeline.
+
+Spans are recorded into a process-wide tracer that is disabled (and free) by
+default. run_loop enables it when --results-dir is given and then writes:
+
+- trace.json: Chrome trace / Perfetto JSON (open in https://ui.perfetto.dev
+  or chrome://tracing). Each concurrent activity gets its own lane, so a
+  worker's queries line up on one track with their sub-stages nested inside.
+- trace_summary.txt: per-stage count, total, and p50/p90/p99 durations.
+
+Usage:
+    with tracing.span("run_eval", queries=20):
+        ...
+    tracing.record("query.spawn", start, end, lane="worker-3")
+
+Recording is thread-safe, so several loops (run_fleet.py) can share the
+tracer, each on its own lanes.
+"""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+_enabled = False
+_events: list[dict] = []
+_lanes: dict[str, int] = {}
+_lock = threading.Lock()
+_epoch = time.perf_counter()
+
+
+def enable() -> None:
+    """Start recording spans (from now until the process exits)."""
+    global _enabled
+    _enabled = True
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def now() -> float:
+    """Timestamp on the tracer's clock, for use with record()."""
+    return time.perf_counter()
+
+
+def _lane_id(lane: str) -> int:
+    if lane not in _lanes:
+        _lanes[lane] = len(_lanes) + 1
+    return _lanes[lane]
+
+
+def record(name: str, start: float, end: float, lane: str = "main", **args) -> None:
+    """Record a span measured with now() timestamps."""
+    if not _enabled:
+        return
+    with _lock:
+        _events.append({
+            "name": name,
+            "ph": "X",
+            "ts": round((start - _epoch) * 1e6, 1),
+            "dur": round(max(end - start, 0.0) * 1e6, 1),
+            "pid": 1,
+            "tid": _lane_id(lane),
+            "args": args,
+        })
+
+
+@contextmanager
+def span(name: str, lane: str = "main", **args):
+    """Time the enclosed block as one span. Works across awaits."""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, start, time.perf_counter(), lane, **args)
+
+
+def write_trace(path: Path) -> None:
+    """Write all spans so far as a Chrome trace JSON file."""
+    with _lock:
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": lane}}
+            for lane, tid in _lanes.items()
+        ]
+        events = metadata + _events
+    path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    # Nearest-rank percentile
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize() -> list[dict]:
+    """Return per-stage duration statistics (seconds), slowest total first."""
+    by_name: dict[str, list[float]] = {}
+    with _lock:
+        events = list(_events)
+    for event in events:
+        by_name.setdefault(event["name"], []).append(event["dur"] / 1e6)
+    rows = []
+    for name, durations in by_name.items():
+        durations.sort()
+        rows.append({
+            "stage": name,
+            "count": len(durations),
+            "total": sum(durations),
+            "p50": _percentile(durations, 50),
+            "p90": _percentile(durations, 90),
+            "p99": _percentile(durations, 99),
+        })
+    rows.sort(key=lambda r: r["total"], reverse=True)
+    return rows
+
+
+def format_summary(rows: list[dict]) -> str:
+    lines = [f"{'stage':<28} {'count':>6} {'total s':>9} {'p50 s':>8} {'p90 s':>8} {'p99 s':>8}"]
+    for r in rows:
+        lines.append(
+            f"{r['stage']:<28} {r['count']:>6} {r['total']:>9.2f} {r['p50']:>8.3f} {r['p90']:>8.3f} {r['p99']:>8.3f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,100 @@
+"""Compressed store of raw `claude` stream-json transcripts.
+
+run_eval can record what every `claude -p` run printed (--record-transcripts)
+so that fake_claude.py can replay it later without a network or an API key.
+
+Layout: <root>/<query key>/<run id>.jsonl.gz, where the query key is a hash
+of the query text. Each file is one header line followed by the raw stdout
+lines exactly as claude printed them:
+
+    {"type": "transcript_header", "query": ..., "skill_name": ...,
+     "description": ..., "clean_name": ..., "model": ..., "outcome": ...,
+     "offsets": [...]}
+
+offsets[i] is when line i arrived, in seconds after the run started.
+outcome is "triggered", "not_triggered", or the QueryFailed reason
+("timeout", "exit", "rate_limit"). Runs that are decided early are killed,
+so their transcripts stop at the decision point, which is all a replay needs.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+
+HEADER_TYPE = "transcript_header"
+
+
+def query_key(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()[:16]
+
+
+class TranscriptRecorder:
+    """Collect one run's stdout chunks with their arrival times."""
+
+    def __init__(self):
+        self._start = time.monotonic()
+        self._chunks: list[tuple[float, bytes]] = []
+
+    def feed(self, chunk: bytes) -> None:
+        if chunk:
+            self._chunks.append((time.monotonic() - self._start, chunk))
+
+    def lines(self) -> tuple[list[bytes], list[float]]:
+        """Split the recording into lines, each timed by the chunk that completed it."""
+        lines: list[bytes] = []
+        offsets: list[float] = []
+        pending = b""
+        for offset, chunk in self._chunks:
+            pending += chunk
+            *complete, pending = pending.split(b"\n")
+            for line in complete:
+                if line.strip():
+                    lines.append(line)
+                    offsets.append(round(offset, 4))
+        if pending.strip():
+            lines.append(pending)
+            offsets.append(round(self._chunks[-1][0], 4))
+        return lines, offsets
+
+
+class TranscriptStore:
+    """Directory of recorded transcripts, grouped by query."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def save(self, recorder: TranscriptRecorder, outcome: str, **meta) -> Path:
+        """Write a recording atomically; meta must include query and clean_name."""
+        lines, offsets = recorder.lines()
+        header = {"type": HEADER_TYPE, **meta, "outcome": outcome, "offsets": offsets}
+        directory = self.root / query_key(meta["query"])
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{uuid.uuid4().hex}.jsonl.gz"
+        tmp = path.with_name(f".{path.name}.tmp")
+        with gzip.open(tmp, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            for line in lines:
+                f.write(line + b"\n")
+        os.replace(tmp, path)
+        return path
+
+    def transcripts(self, query: str) -> list[Path]:
+        """Recorded transcripts for a query, in a stable order."""
+        directory = self.root / query_key(query)
+        if not directory.is_dir():
+            return []
+        return sorted(directory.glob("*.jsonl.gz"))
+
+    @staticmethod
+    def read(path: Path) -> tuple[dict, list[bytes]]:
+        """Return (header, raw lines) of one transcript."""
+        with gzip.open(path, "rb") as f:
+            header = json.loads(f.readline())
+            lines = [line.rstrip(b"\n") for line in f]
+        if header.get("type") != HEADER_TYPE:
+            raise ValueError(f"{path} is not a recorded transcript")
+        return header, lines
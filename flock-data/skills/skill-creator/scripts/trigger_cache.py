@@ -0,0 +1,117 @@
+"""On-disk cache of trigger results for run_eval.
+
+Each (description, query, model, run index) outcome is stored in a small
+SQLite database keyed by a content hash, so re-evaluating a description that
+was already scored (a rerun after a crash, or the improver regressing to an
+older wording) costs no `claude` calls. The trigger-detection version is part
+of the key, so changing how triggering is detected invalidates old entries,
+and so is the CLI that produced the outcome (see cli_identity), so results
+from a stand-in such as fake_claude.py are never served to real runs.
+
+The database is capped at max_entries rows; least-recently-used rows are
+evicted first.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+
+from scripts.claude_cli import claude_version
+
+DEFAULT_MAX_ENTRIES = 200_000
+
+# Evict at most once per this many writes rather than on every insert.
+_EVICT_EVERY = 256
+
+
+def default_cache_dir() -> Path:
+    """Return the default cache location (respects XDG_CACHE_HOME)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "skill-creator" / "trigger-cache"
+
+
+def cli_identity(claude_bin: str = "claude") -> str:
+    """The resolved executable path of claude_bin and its --version output."""
+    return f"{shutil.which(claude_bin) or claude_bin} {claude_version(claude_bin)}"
+
+
+class TriggerCache:
+    """SQLite-backed LRU cache of individual trigger runs.
+
+    Safe to share between concurrent loops: SQLite serializes writers, and
+    every write is a single autocommitted statement.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / "triggers.sqlite3"
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " triggered INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+
+    @staticmethod
+    def make_key(
+        skill_name: str,
+        description: str,
+        query: str,
+        model: str | None,
+        run_idx: int,
+        detection_version: int,
+        cli: str,
+    ) -> str:
+        payload = json.dumps(
+            [detection_version, cli, skill_name, description, query, model or "", run_idx],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> bool | None:
+        row = self.conn.execute("SELECT triggered FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return bool(row[0])
+
+    def put(self, key: str, triggered: bool) -> None:
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results (key, triggered, created, last_used) VALUES (?, ?, ?, ?)",
+            (key, int(triggered), now, now),
+        )
+        self._writes += 1
+        if self._writes % _EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop least-recently-used rows beyond max_entries; return how many."""
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return 0
+        self.conn.execute(
+            "DELETE FROM results WHERE key IN"
+            " (SELECT key FROM results ORDER BY last_used ASC LIMIT ?)",
+            (excess,),
+        )
+        return excess
+
+    def close(self) -> None:
+        self.evict()
+        self.conn.close()
@@ -0,0 +1,51 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+SKILL_CREATOR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SKILL_CREATOR))
+
+FAKE_CLAUDE = SKILL_CREATOR / "scripts" / "fake_claude.py"
+
+
+@pytest.fixture
+def fake_claude(tmp_path, monkeypatch):
+    """Point fake_claude.py at a fresh state dir; return a function that sets its model."""
+    monkeypatch.setenv("FAKE_CLAUDE_STATE", str(tmp_path / "fake-claude-state"))
+    monkeypatch.delenv("FAKE_CLAUDE_TRANSCRIPTS", raising=False)
+
+    def set_model(model: dict) -> str:
+        path = tmp_path / "fake-claude-model.json"
+        path.write_text(json.dumps(model))
+        monkeypatch.setenv("FAKE_CLAUDE_MODEL", str(path))
+        return str(FAKE_CLAUDE)
+
+    return set_model
+
+
+@pytest.fixture
+def project_root(tmp_path):
+    root = tmp_path / "project"
+    root.mkdir()
+    return root
+
+
+@pytest.fixture
+def fake_improver(fake_claude, tmp_path, monkeypatch):
+    """Put fake_claude.py first on PATH as `claude`; return a function that sets its improver answers.
+
+    The function also takes the rest of the model (for trigger runs) and
+    returns the path to pass as claude_bin.
+    """
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "claude").symlink_to(FAKE_CLAUDE)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+
+    def set_improver(model: dict | None = None, **improver) -> str:
+        return fake_claude({**(model or {}), "improver": improver})
+
+    return set_improver
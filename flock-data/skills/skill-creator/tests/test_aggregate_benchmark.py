@@ -0,0 +1,72 @@
+import json
+import shutil
+
+import pytest
+
+from scripts.aggregate_benchmark import Manifest, load_run_results
+from scripts.bench_aggregate_benchmark import legacy_load_run_results, synthesize_tree
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "benchmark"
+    synthesize_tree(root, 600, seed=3)
+    return root
+
+
+def load(root, manifest=None):
+    return load_run_results(root, workers=4, manifest=manifest)
+
+
+def test_loader_matches_the_legacy_loader(tree, capsys):
+    legacy = legacy_load_run_results(tree)
+    legacy_out = capsys.readouterr().out
+    assert load(tree) == legacy
+    assert capsys.readouterr().out == legacy_out
+
+
+def test_manifest_reuses_unchanged_runs(tree, tmp_path):
+    manifest_path = tmp_path / "benchmark.manifest.json"
+    manifest = Manifest(manifest_path)
+    full = load(tree, manifest)
+    assert manifest.reused == 0
+    assert manifest.parsed > 0
+    manifest.save()
+
+    manifest = Manifest(manifest_path)
+    assert load(tree, manifest) == full
+    assert manifest.parsed == 0
+    assert manifest.reused > 0
+
+
+def test_manifest_reparses_changed_new_and_removed_runs(tree, tmp_path, capsys):
+    manifest_path = tmp_path / "benchmark.manifest.json"
+    manifest = Manifest(manifest_path)
+    load(tree, manifest)
+    manifest.save()
+    capsys.readouterr()
+
+    changed = tree / "eval-0" / "with_skill" / "run-1" / "grading.json"
+    grading = json.loads(changed.read_text())
+    grading["summary"]["pass_rate"] = 0.123
+    changed.write_text(json.dumps(grading))
+    added = tree / "eval-0" / "with_skill" / "run-9"
+    shutil.copytree(changed.parent, added)
+    shutil.rmtree(tree / "eval-1" / "without_skill" / "run-2")
+
+    manifest = Manifest(manifest_path)
+    incremental = load(tree, manifest)
+    incremental_out = capsys.readouterr().out
+    assert manifest.parsed == 2
+    assert incremental == load(tree)
+    assert capsys.readouterr().out == incremental_out
+    assert "eval-1/without_skill/run-2" not in manifest.runs
+    assert "eval-0/with_skill/run-9" in manifest.runs
+
+
+def test_unreadable_or_old_manifest_starts_empty(tmp_path):
+    path = tmp_path / "benchmark.manifest.json"
+    path.write_text("{not json")
+    assert Manifest(path).runs == {}
+    path.write_text(json.dumps({"version": Manifest.VERSION + 1, "runs": {"x": {}}}))
+    assert Manifest(path).runs == {}
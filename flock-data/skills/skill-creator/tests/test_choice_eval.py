@@ -0,0 +1,76 @@
+from scripts.choice_eval import NONE_LABEL, format_choice_results, merge_eval_sets, run_choice_eval
+
+SKILLS = [("charts", "Draw charts."), ("sheets", "Edit spreadsheets.")]
+EVAL_SETS = {
+    "charts": [
+        {"query": "plot sales", "should_trigger": True},
+        {"query": "chart a spreadsheet", "should_trigger": True},
+        {"query": "say hi", "should_trigger": False},
+    ],
+    "sheets": [
+        {"query": "chart a spreadsheet", "should_trigger": True},
+        {"query": "sum column b", "should_trigger": True},
+        {"query": "plot sales", "should_trigger": False},
+    ],
+}
+
+
+def test_eval_sets_are_merged_by_query():
+    merged = {q["query"]: q for q in merge_eval_sets(EVAL_SETS)}
+    assert list(merged) == ["plot sales", "chart a spreadsheet", "say hi", "sum column b"]
+    assert merged["chart a spreadsheet"]["acceptable"] == ["charts", "sheets"]
+    assert merged["chart a spreadsheet"]["expected"] == "charts"
+    assert merged["plot sales"]["acceptable"] == ["charts"]
+    assert merged["say hi"] == {"query": "say hi", "acceptable": [], "expected": None}
+
+
+def test_the_confusion_matrix_counts_runs_by_expected_and_chosen():
+    queries = merge_eval_sets(EVAL_SETS)
+    choices = {
+        "plot sales": ["charts", "charts", "sheets"],
+        "chart a spreadsheet": ["sheets", "sheets", None],
+        "say hi": [None, "charts"],
+        "sum column b": [],
+    }
+    output = format_choice_results(
+        queries, SKILLS, EVAL_SETS, choices, 0.5, {}, errors={"say hi": 1, "sum column b": 3},
+    )
+    assert output["confusion"] == {
+        "labels": ["charts", "sheets", NONE_LABEL],
+        # Rows: expected charts (plot sales, chart a spreadsheet), sheets (sum column b), none (say hi)
+        "matrix": [[2, 3, 1], [0, 0, 0], [1, 0, 1]],
+    }
+    results = {r["query"]: r for r in output["results"]}
+    # Any skill whose eval set expects the query is acceptable
+    assert results["chart a spreadsheet"]["chosen"] == "sheets" and results["chart a spreadsheet"]["pass"]
+    assert results["plot sales"]["pass"]
+    # Failed runs are not choices of none
+    assert results["say hi"]["choices"] == {NONE_LABEL: 1, "charts": 1}
+    assert results["say hi"]["errors"] == 1 and "error" not in results["say hi"]
+    assert results["sum column b"] == {
+        "query": "sum column b", "expected": "sheets", "acceptable": ["sheets"], "choices": {}, "runs": 0,
+        "chosen": None, "pass": False, "errors": 3, "error": "all 3 runs failed",
+    }
+    assert output["summary"]["errored"] == 1
+    assert output["summary"]["runs"] == 8
+
+    sheets = {r["query"]: r for r in output["per_skill"]["sheets"]["results"]}
+    assert sheets["chart a spreadsheet"]["trigger_rate"] == 2 / 3
+    assert sheets["sum column b"]["error"] == "all 3 runs failed"
+    assert output["per_skill"]["sheets"]["summary"]["errored"] == 1
+
+
+def test_failed_runs_are_reported_as_errors_not_as_none(fake_claude, project_root):
+    claude_bin = fake_claude({
+        "trigger_probability": 1.0, "latency": {"first_byte": 0.01, "decision": 0.01}, "failures": {"exit": 1.0},
+    })
+    queries = merge_eval_sets(EVAL_SETS)
+    choices, errors, _ = run_choice_eval(
+        queries, SKILLS, num_workers=4, timeout=10, project_root=project_root, runs_per_query=2,
+        max_retries=0, claude_bin=claude_bin,
+    )
+    assert all(runs == [] for runs in choices.values())
+    assert errors == {q["query"]: 2 for q in queries}
+    output = format_choice_results(queries, SKILLS, EVAL_SETS, choices, 0.5, {}, errors)
+    assert output["confusion"]["matrix"] == [[0] * 3] * 3
+    assert output["summary"]["errored"] == len(queries)
@@ -0,0 +1,219 @@
+import asyncio
+import threading
+
+import pytest
+
+from scripts.concurrency import AIMDController, FairShare, max_window_for
+from scripts.journal import Journal
+from scripts.run_eval import run_eval
+
+
+def drive(initial: int, max_window: int, steps) -> AIMDController:
+    """Apply steps(controller, loop) to a fresh controller inside an event loop."""
+    async def scenario():
+        controller = AIMDController(initial, max_window)
+        result = steps(controller, asyncio.get_running_loop())
+        if asyncio.iscoroutine(result):
+            await result
+        await asyncio.sleep(0)
+        return controller
+
+    return asyncio.run(scenario())
+
+
+def test_slow_start_grows_by_one_per_success_up_to_max():
+    def steps(controller, loop):
+        for _ in range(10):
+            controller.on_success(1.0)
+
+    controller = drive(2, 5, steps)
+    assert controller.window == 5
+    assert controller.peak_window == 5
+
+
+def test_failures_from_one_burst_decrease_once():
+    async def steps(controller, loop):
+        started = loop.time()
+        await asyncio.sleep(0.01)
+        controller.on_failure("timeout", started)
+        controller.on_failure("timeout", started)
+        controller.on_failure("rate_limit", started)
+
+    controller = drive(8, 8, steps)
+    assert controller.window == 4
+    assert controller.decreases == 1
+    assert controller.failures == {"timeout": 2, "rate_limit": 1}
+    assert not controller.slow_start
+
+
+def test_additive_increase_after_a_failure():
+    def steps(controller, loop):
+        controller.on_failure("exit", loop.time())
+        for _ in range(2):
+            controller.on_success(1.0)
+
+    controller = drive(4, 10, steps)
+    # 2 -> 2.5 -> 2.9
+    assert 2.8 < controller.window < 3.0
+
+
+def test_rising_latency_holds_the_window():
+    def steps(controller, loop):
+        controller.on_success(1.0)
+        for _ in range(10):
+            controller.on_success(10.0)
+
+    controller = drive(2, 10, steps)
+    assert controller.window == 3
+
+
+def test_slots_never_exceed_the_window():
+    peak = 0
+
+    async def steps(controller, loop):
+        async def run():
+            nonlocal peak
+            async with controller.slot():
+                peak = max(peak, controller.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(run() for _ in range(20)))
+
+    controller = drive(3, 3, steps)
+    assert peak == 3
+    assert controller.in_flight == 0
+
+
+def test_backoff_delay_is_capped():
+    for attempt in range(1, 12):
+        delay = AIMDController.backoff_delay(attempt, base=1.0, cap=30.0)
+        assert 0 <= delay <= min(30.0, 2 ** (attempt - 1))
+
+
+def test_window_ceiling_defaults_above_the_start():
+    assert max_window_for(10) == 20
+    assert max_window_for(10, 12) == 12
+
+
+def test_fair_share_caps_runs_across_event_loops():
+    share = FairShare(3)
+
+    async def tenant(name):
+        async def run():
+            async with share.slot(name):
+                assert share.in_use <= 3
+                await asyncio.sleep(0.005)
+
+        await asyncio.gather(*(run() for _ in range(20)))
+
+    threads = [threading.Thread(target=asyncio.run, args=(tenant(f"skill-{i}"),)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert share.peak == 3
+    assert share.in_use == 0
+    assert share.granted == {"skill-0": 20, "skill-1": 20, "skill-2": 20}
+
+
+def test_fair_share_grants_freed_slots_round_robin():
+    share = FairShare(1)
+    order = []
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def hold():
+            async with share.slot("blocker"):
+                await release.wait()
+
+        async def run(name):
+            async with share.slot(name):
+                order.append(name)
+                await asyncio.sleep(0)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        # a queues all of its runs before b queues any
+        waiters = [asyncio.create_task(run(name)) for name in ["a", "a", "a", "b", "b"]]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(holder, *waiters)
+
+    asyncio.run(scenario())
+    assert order == ["a", "b", "a", "b", "a"]
+
+
+def test_a_cancelled_waiter_gives_up_its_place():
+    share = FairShare(1)
+
+    async def scenario():
+        async with share.slot("a"):
+            waiter = asyncio.create_task(share.slot("b").__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        async with share.slot("c"):
+            assert share.in_use == 1
+
+    asyncio.run(scenario())
+    assert share.in_use == 0
+    assert "b" not in share.granted
+
+
+def negatives(n):
+    return [{"query": f"unrelated query {i}", "should_trigger": False} for i in range(n)]
+
+
+@pytest.mark.parametrize("backend", ["process", "pool"])
+def test_runs_that_cannot_start_are_errors_not_non_triggers(backend, project_root, tmp_path, capsys):
+    output = run_eval(
+        negatives(5), "demo", "A demo skill.", num_workers=2, timeout=10, project_root=project_root,
+        runs_per_query=2, backend=backend, max_retries=0, claude_bin=str(tmp_path / "no-such-claude"),
+    )
+    summary = output["summary"]
+    assert summary["passed"] == 0
+    assert summary["errored"] == 5
+    assert summary["concurrency"]["failures"] == {"spawn": 10}
+    for result in output["results"]:
+        assert result["runs"] == 0 and result["errors"] == 2 and "error" in result
+    assert "run failed" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("early_stop", ["off", "exact"])
+def test_failed_runs_are_left_out_of_the_trigger_rate(early_stop, fake_claude, project_root):
+    claude_bin = fake_claude({
+        "trigger_probability": 1.0,
+        "latency": {"first_byte": 0.01, "decision": 0.01},
+        "failures": {"exit": 0.5},
+    })
+    output = run_eval(
+        negatives(8), "demo", "A demo skill.", num_workers=4, timeout=10, project_root=project_root,
+        runs_per_query=3, max_retries=0, claude_bin=claude_bin, early_stop=early_stop,
+    )
+    results = output["results"]
+    # Every run that got an answer triggered, so no query can pass
+    assert output["summary"]["passed"] == 0
+    assert all(r["triggers"] == r["runs"] for r in results)
+    assert sum(r.get("errors", 0) for r in results) == output["summary"]["concurrency"]["failures"]["exit"]
+    assert output["summary"]["errored"] == sum(1 for r in results if r["runs"] == 0)
+    if early_stop == "off":
+        assert all(r["runs"] + r.get("errors", 0) == 3 for r in results)
+
+
+def test_pool_latency_stops_at_the_answer(fake_claude, project_root, tmp_path):
+    claude_bin = fake_claude({
+        "trigger_probability": 1.0,
+        "latency": {"first_byte": 0.01, "decision": 0.05, "clear": 1.0},
+    })
+    journal = Journal(tmp_path / "journal.jsonl")
+    run_eval(
+        [{"query": "a query", "should_trigger": True}], "demo", "A demo skill.", num_workers=1, max_workers=1,
+        timeout=10, project_root=project_root, runs_per_query=3, backend="pool", claude_bin=claude_bin,
+        journal=journal,
+    )
+    journal.close()
+    latencies = Journal(tmp_path / "journal.jsonl").latencies["a query"]
+    # The /clear after each answer takes 1s and must not be counted
+    assert len(latencies) == 3 and max(latencies) < 0.8
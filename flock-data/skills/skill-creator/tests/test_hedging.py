@@ -0,0 +1,61 @@
+import sys
+import time
+
+from scripts.journal import Journal
+from scripts.run_eval import run_eval
+
+FAST = {"trigger_probability": 1.0, "latency": {"first_byte": 0.01, "decision": 0.02}}
+
+
+def eval_set(queries):
+    return [{"query": q, "should_trigger": True} for q in queries]
+
+
+def test_runs_within_the_deadline_keep_their_result(fake_claude, project_root, capsys):
+    claude_bin = fake_claude(FAST)
+    queries = [f"fast query {i}" for i in range(8)]
+    output = run_eval(
+        eval_set(queries), "demo", "A demo skill.", num_workers=4, timeout=30, project_root=project_root,
+        runs_per_query=3, claude_bin=claude_bin, cache=None, hedge=True,
+    )
+    assert "run failed" not in capsys.readouterr().err
+    assert [r["triggers"] for r in output["results"]] == [3] * len(queries)
+
+
+def test_hedge_wins_over_a_stalled_primary(fake_claude, project_root, tmp_path, capsys):
+    fake_bin = fake_claude(FAST)
+    slow_model = tmp_path / "slow-model.json"
+    slow_model.write_text('{"trigger_probability": 1.0, "latency": {"first_byte": 20, "decision": 0}}')
+    # The first run of "slow query" stalls; its hedge (and everything else) is fast.
+    wrapper = tmp_path / "claude"
+    wrapper.write_text(
+        f"#!{sys.executable}\n"
+        "import os, sys\n"
+        f"marker = {str(tmp_path / 'stalled')!r}\n"
+        "if 'slow query' in sys.argv and not os.path.exists(marker):\n"
+        "    open(marker, 'w').close()\n"
+        f"    os.environ['FAKE_CLAUDE_MODEL'] = {str(slow_model)!r}\n"
+        f"os.execv(sys.executable, [sys.executable, {fake_bin!r}, *sys.argv[1:]])\n"
+    )
+    wrapper.chmod(0o755)
+
+    queries = [f"fast query {i}" for i in range(10)] + ["slow query"]
+    # Earlier runs (of another description) put every query's hedge
+    # deadline at 2s, so only the stalled run gets hedged.
+    journal = Journal(tmp_path / "journal.jsonl")
+    for query in queries:
+        for run_idx in range(5):
+            journal.record_run("An earlier description.", query, run_idx, None, 0.5, True, 2.0)
+    journal.close()
+    journal = Journal(tmp_path / "journal.jsonl")
+    start = time.monotonic()
+    output = run_eval(
+        eval_set(queries), "demo", "A demo skill.", num_workers=2, timeout=60, project_root=project_root,
+        runs_per_query=1, claude_bin=str(wrapper), cache=None, hedge=True, journal=journal,
+    )
+    journal.close()
+    # Waiting out the stalled run would take 20s
+    assert time.monotonic() - start < 15
+    assert "run failed" not in capsys.readouterr().err
+    assert all(r["triggers"] == 1 for r in output["results"])
+    assert output["summary"]["hedging"] == {"hedges": 1, "hedge_wins": 1, "time_saved": output["summary"]["hedging"]["time_saved"]}
@@ -0,0 +1,175 @@
+import json
+import threading
+import time
+
+import pytest
+
+from scripts.improve_description import (
+    CLOSE_TAG,
+    DESCRIPTION_LIMIT,
+    HISTORY_HEADER,
+    Cancelled,
+    CancelToken,
+    _call_claude,
+    build_prompt,
+    compact_history,
+    description_similarity,
+    format_history,
+    improve_description,
+    improve_description_candidates,
+)
+from scripts.response_cache import ResponseCache
+
+
+def attempt(i, n_queries=40):
+    results = [
+        {"query": f"query number {q} about some task", "should_trigger": q % 2 == 0,
+         "pass": (q + i) % 3 != 0, "triggers": 1, "runs": 3}
+        for q in range(n_queries)
+    ]
+    passed = sum(r["pass"] for r in results)
+    return {
+        "iteration": i, "description": f"Attempt {i}: " + "use this skill for things " * 20,
+        "passed": passed, "total": n_queries, "train_passed": passed, "train_total": n_queries,
+        "results": results,
+    }
+
+
+@pytest.fixture
+def history():
+    return [attempt(i) for i in range(12)]
+
+
+@pytest.mark.parametrize("budget", [50, 400, 1500, 4000, 12000])
+def test_compacted_history_never_exceeds_the_budget(history, budget):
+    assert len(format_history(history)) > budget
+    assert len(compact_history(history, budget=budget)) <= budget
+
+
+def test_the_current_attempt_survives_while_it_fits(history):
+    text = compact_history(history, budget=1500)
+    assert history[-1]["description"] in text
+    assert history[0]["description"] not in text
+    # Failing result lines of the current attempt are kept over passing ones
+    failing = next(r["query"] for r in history[-1]["results"] if not r["pass"])
+    assert failing in text
+
+
+def test_a_history_within_budget_is_kept_verbatim():
+    history = [attempt(i, n_queries=3) for i in range(2)]
+    text = compact_history(history)
+    assert text.startswith(HISTORY_HEADER)
+    assert all(h["description"] in text for h in history)
+    assert "earlier" not in text
+
+
+def test_prompt_reports_the_uncompacted_length(history):
+    eval_results = {"results": history[-1]["results"], "summary": {"passed": 1, "total": 40}}
+    prompt, uncompacted = build_prompt("demo", "Skill body.", "A description.", eval_results, history)
+    full, _ = build_prompt("demo", "Skill body.", "A description.", eval_results, history, history_keep=None)
+    assert len(prompt) < uncompacted == len(full)
+
+
+LONG = "use this skill whenever the user asks about things " * 60
+
+
+def test_a_closed_description_does_not_wait_for_the_rest(fake_improver, tmp_path):
+    fake_improver(descriptions=["Use this skill for demos."], tail=" More text.", tail_delay=30)
+    cache = ResponseCache(tmp_path / "cache")
+    stats = {"hits": 0, "misses": 0}
+    start = time.monotonic()
+    text = _call_claude("prompt", None, cache=cache, stats=stats)
+    assert time.monotonic() - start < 15
+    assert text.endswith(CLOSE_TAG)
+    # A complete answer is cached
+    assert _call_claude("prompt", None, cache=cache, stats=stats) == text
+    assert stats == {"hits": 1, "misses": 1}
+    cache.close()
+
+
+def test_a_description_cut_off_over_the_limit_is_not_cached(fake_improver, tmp_path):
+    fake_improver(descriptions=[LONG], chunk=100, delay=0.01)
+    cache = ResponseCache(tmp_path / "cache")
+    stats = {"hits": 0, "misses": 0}
+    for _ in range(2):
+        text = _call_claude("prompt", None, cache=cache, stats=stats)
+        assert CLOSE_TAG not in text
+        assert DESCRIPTION_LIMIT < len(text) < len(LONG)
+    assert stats == {"hits": 0, "misses": 2}
+    cache.close()
+
+
+def test_the_rewrite_starts_before_the_cut_off_call_returns(fake_improver):
+    fake_improver(descriptions=[LONG], chunk=100, delay=0.01)
+    order = []
+    _call_claude("prompt", None, on_over_limit=lambda text: order.append("rewrite started"))
+    order.append("call returned")
+    assert order == ["rewrite started", "call returned"]
+
+
+def test_a_cut_off_description_is_replaced_by_its_rewrite(fake_improver, tmp_path):
+    fake_improver(descriptions=[LONG], rewrite="Use this skill for things.", chunk=100, delay=0.01)
+    eval_results = {"results": [], "summary": {"passed": 0, "total": 0}}
+    description = improve_description(
+        "demo", "Skill body.", "A description.", eval_results, [], None, log_dir=tmp_path / "logs", iteration=1,
+    )
+    assert description == "Use this skill for things."
+    transcript = json.loads((tmp_path / "logs" / "improve_iter_1.json").read_text())
+    assert transcript["cut_off"] and transcript["over_limit"]
+    assert transcript["rewrite_description"] == description
+
+
+def test_cancelling_stops_a_call_in_progress(fake_improver):
+    # About 30 s of streaming if left to run
+    fake_improver(descriptions=["Use this skill for demos."], chunk=1, delay=1.0)
+    cancel = CancelToken()
+    timer = threading.Timer(0.5, cancel.cancel)
+    timer.start()
+    start = time.monotonic()
+    with pytest.raises(Cancelled):
+        _call_claude("prompt", None, cancel=cancel)
+    assert time.monotonic() - start < 10
+    # Later calls with the same token do not start claude at all
+    start = time.monotonic()
+    with pytest.raises(Cancelled):
+        _call_claude("prompt", None, cancel=cancel)
+    assert time.monotonic() - start < 0.5
+
+
+def test_similarity_ignores_case_punctuation_and_spacing():
+    assert description_similarity("Use this skill for charts.", "use   this skill, for CHARTS") == 1.0
+    assert description_similarity("Use this skill for charts.", "Reach for it on spreadsheets") == 0.0
+    assert 0.0 < description_similarity("Use this skill for charts", "Use this skill for tables") < 1.0
+
+
+CURRENT = "Use this skill whenever the user wants a chart drawn."
+
+
+def test_candidates_drop_rewordings_of_scored_and_earlier_ones(fake_improver, tmp_path):
+    fake_improver(descriptions=[
+        "Use this skill whenever the user wants a chart drawn!",
+        "Reach for it on spreadsheet questions of any kind.",
+        "reach for it on spreadsheet questions, of any kind",
+        "Helps with plotting data from CSV files and tables.",
+    ])
+    eval_results = {"results": [], "summary": {"passed": 0, "total": 0}}
+    survivors = improve_description_candidates(
+        "demo", "Skill body.", CURRENT, eval_results, [], None, n_candidates=4, log_dir=tmp_path, iteration=1,
+    )
+    # Candidates run concurrently, so either spelling of the spreadsheet one may come first
+    assert len(survivors) == 2
+    assert "Helps with plotting data from CSV files and tables." in survivors
+    [spreadsheet] = [s for s in survivors if "spreadsheet" in s]
+    log = json.loads((tmp_path / "improve_iter_1_candidates.json").read_text())
+    assert sorted(t.get("duplicate_of", "") for t in log["candidates"]) == sorted(["", "", spreadsheet, CURRENT])
+
+
+def test_no_candidate_is_returned_when_all_are_duplicates(fake_improver, tmp_path):
+    fake_improver(descriptions=[CURRENT, CURRENT.upper()])
+    eval_results = {"results": [], "summary": {"passed": 0, "total": 0}}
+    survivors = improve_description_candidates(
+        "demo", "Skill body.", CURRENT, eval_results, [], None, n_candidates=2, log_dir=tmp_path, iteration=1,
+    )
+    assert survivors == []
+    log = json.loads((tmp_path / "improve_iter_1_candidates.json").read_text())
+    assert log["survivors"] == []
@@ -0,0 +1,73 @@
+import pytest
+
+from scripts.journal import Journal, description_hash
+
+
+def test_resume_after_a_torn_final_line(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = Journal(path)
+    journal.record_run("desc", "q1", 0, "model-a", 0.5, True, 1.5)
+    journal.close()
+    with open(path, "a") as f:
+        f.write('{"type": "run", "description": "')
+
+    journal = Journal(path)
+    assert journal.lookup_run("desc", "q1", 0, "model-a", 0.5) is True
+    journal.record_run("desc", "q1", 1, "model-a", 0.5, False, 2.0)
+    journal.close()
+
+    journal = Journal(path)
+    assert journal.runs == {
+        (description_hash("desc"), "model-a", 0.5, "q1", 0): True,
+        (description_hash("desc"), "model-a", 0.5, "q1", 1): False,
+    }
+    assert journal.latencies == {"q1": [1.5, 2.0]}
+    journal.close()
+    assert path.read_text().endswith("}\n")
+
+
+def test_recorded_latencies_are_seen_without_reopening(tmp_path):
+    journal = Journal(tmp_path / "journal.jsonl")
+    journal.record_run("desc", "q1", 0, None, 0.5, True, 1.25)
+    journal.record_run("other desc", "q1", 0, None, 0.5, False, 3.0)
+    assert journal.latencies == {"q1": [1.25, 3.0]}
+    journal.close()
+
+
+@pytest.mark.parametrize("model, threshold", [("model-b", 0.5), ("model-a", 0.7)])
+def test_runs_under_other_settings_are_not_reused(tmp_path, model, threshold):
+    journal = Journal(tmp_path / "journal.jsonl")
+    journal.record_run("desc", "q1", 0, "model-a", 0.5, True, 1.0)
+    assert journal.lookup_run("desc", "q1", 0, model, threshold) is None
+    journal.close()
+
+
+def test_records_without_settings_never_match(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    path.write_text(
+        f'{{"type": "run", "description": "{description_hash("desc")}", "query": "q1", '
+        f'"run_idx": 0, "triggered": true, "latency": 1.0}}\n'
+    )
+    journal = Journal(path)
+    assert journal.lookup_run("desc", "q1", 0, None, 0.5) is None
+    assert journal.latencies == {"q1": [1.0]}
+    journal.close()
+
+
+def test_iterations_are_reloaded(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = Journal(path)
+    journal.record_iteration(1, {"iteration": 1, "description": "a"}, "b")
+    journal.record_iteration(2, {"iteration": 2, "description": "b"}, None, "all_passed (iteration 2)")
+    journal.close()
+
+    journal = Journal(path)
+    assert [r["entry"]["description"] for r in journal.iterations] == ["a", "b"]
+    assert journal.iterations[-1]["exit_reason"] == "all_passed (iteration 2)"
+    journal.close()
+
+
+def test_unknown_run_is_not_found(tmp_path):
+    journal = Journal(tmp_path / "journal.jsonl")
+    assert journal.lookup_run("desc", "q1", 0, None, 0.5) is None
+    journal.close()
@@ -0,0 +1,92 @@
+import json
+import re
+import threading
+import urllib.request
+
+from scripts.live_report import LiveReport
+from scripts.run_loop import make_history_entry, run_loop
+
+TRAIN = [{"query": "make a chart", "should_trigger": True}, {"query": "say hi", "should_trigger": False}]
+
+
+def snapshot(path):
+    match = re.search(r"const snapshot = (.*);\n", path.read_text())
+    return json.loads(match.group(1).replace("<\\/", "</"))
+
+
+def fill(report):
+    report.start(TRAIN, [], original_description="The </script> skill.")
+    row = report.row(1, "desc")
+    report.on_run("desc", "make a chart", True)
+    results = [
+        {"query": "make a chart", "should_trigger": True, "pass": True, "triggers": 1, "runs": 1},
+        {"query": "say hi", "should_trigger": False, "pass": True, "triggers": 0, "runs": 1},
+    ]
+    entry = make_history_entry(1, "desc", results, TRAIN, [])
+    report.entry(entry)
+    report.done({"history": [entry], "best_description": "desc", "best_score": "2/2", "exit_reason": "all_passed"})
+    return row
+
+
+def test_without_a_server_the_file_is_a_snapshot(tmp_path):
+    report = LiveReport(tmp_path / "report.html", skill_name="demo")
+    assert report.url is None
+    assert snapshot(report.path) == []
+    assert 'http-equiv="refresh"' in report.path.read_text()
+
+    fill(report)
+    report.close()
+    events = snapshot(report.path)
+    assert [e["type"] for e in events] == ["start", "row", "run", "entry", "done"]
+    assert events[0]["original_description"] == "The </script> skill."
+    assert "</script> skill" not in report.path.read_text()
+    # A finished snapshot stops reloading
+    assert 'http-equiv="refresh"' not in report.path.read_text()
+    assert [json.loads(line) for line in report.events_path.read_text().splitlines()] == events
+
+
+def test_the_server_streams_the_log_from_an_offset(tmp_path):
+    report = LiveReport(tmp_path / "report.html", skill_name="demo", serve=True)
+    try:
+        assert report.url.startswith("http://127.0.0.1:")
+        assert urllib.request.urlopen(report.url).read().decode() == report.path.read_text()
+        assert "const snapshot = null;" in report.path.read_text()
+        fill(report)
+
+        first_line = report.events_path.read_text().splitlines()[0]
+        request = urllib.request.Request(report.url + "events", headers={"Last-Event-ID": str(len(first_line) + 1)})
+        stream = urllib.request.urlopen(request)
+        received = []
+
+        def read():
+            received.append(stream.read().decode())
+
+        reader = threading.Thread(target=read)
+        reader.start()
+    finally:
+        report.close()
+    reader.join(timeout=10)
+    data = [json.loads(line[len("data: "):]) for line in received[0].splitlines() if line.startswith("data: ")]
+    assert [e["type"] for e in data] == ["row", "run", "entry", "done"]
+
+
+def test_run_loop_writes_the_final_report_to_live_report_path(fake_claude, tmp_path, monkeypatch):
+    claude_bin = fake_claude({"trigger_probability": 1.0, "latency": {"first_byte": 0.01, "decision": 0.01}})
+    skill_path = tmp_path / "demo"
+    skill_path.mkdir()
+    (skill_path / "SKILL.md").write_text("---\nname: demo\ndescription: A demo skill.\n---\n\nBody.\n")
+    monkeypatch.chdir(tmp_path)
+    report_path = tmp_path / "report.html"
+
+    output = run_loop(
+        eval_set=[{"query": "make a chart", "should_trigger": True}],
+        skill_path=skill_path, description_override=None, num_workers=1, timeout=10, max_iterations=1,
+        runs_per_query=1, trigger_threshold=0.5, holdout=0, model=None, verbose=False,
+        claude_bin=claude_bin, live_report_path=report_path,
+    )
+    assert output["exit_reason"] == "all_passed (iteration 1)"
+    text = report_path.read_text()
+    assert "const snapshot" not in text
+    assert "A demo skill." in text
+    events = [json.loads(line) for line in (tmp_path / "report.events.ndjson").read_text().splitlines()]
+    assert events[-1]["type"] == "done"
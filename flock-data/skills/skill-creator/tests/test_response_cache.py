@@ -0,0 +1,54 @@
+import itertools
+
+import pytest
+
+from scripts import response_cache
+from scripts.response_cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    # A strictly increasing clock, so recency never ties
+    clock = itertools.count(1)
+    monkeypatch.setattr(response_cache.time, "time", lambda: float(next(clock)))
+    cache = ResponseCache(tmp_path, max_bytes=10)
+    yield cache
+    cache.close()
+
+
+def keys(cache):
+    return {key for (key,) in cache.conn.execute("SELECT key FROM responses")}
+
+
+def test_the_least_recently_used_responses_go_first(cache):
+    cache.put("a", "1234")
+    cache.put("b", "1234")
+    assert cache.get("a") == "1234"
+    # 12 bytes would be over the cap: b was used longest ago
+    cache.put("c", "1234")
+    assert keys(cache) == {"a", "c"}
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_size_is_counted_in_utf8_bytes(cache):
+    cache.put("a", "ab")
+    cache.put("b", "é" * 4)
+    assert keys(cache) == {"a", "b"}
+    cache.put("c", "é")
+    assert keys(cache) == {"b", "c"}
+
+
+def test_a_response_over_the_cap_is_not_kept(cache):
+    cache.put("a", "1234")
+    cache.put("big", "x" * 11)
+    assert keys(cache) == {"a"}
+
+
+def test_replacing_a_response_counts_its_new_size(cache):
+    cache.put("a", "1234")
+    cache.put("b", "1234")
+    cache.put("a", "12")
+    cache.put("c", "1234")
+    assert keys(cache) == {"a", "b", "c"}
+    assert cache.get("a") == "12"
@@ -0,0 +1,117 @@
+from pathlib import Path
+
+import pytest
+
+from scripts.run_eval import WorkerRoots, _query_result, confidently_decided, run_eval, runs_still_needed
+
+
+def test_a_query_settled_without_runs_is_scored():
+    result = _query_result({"query": "q", "should_trigger": True}, [], 0.0)
+    assert result["runs"] == 0
+    assert result["trigger_rate"] == 0.0
+    assert result["pass"]
+
+
+def test_early_stop_with_a_zero_threshold_runs_nothing(project_root, tmp_path):
+    # Every query passes before any run, so claude is never needed
+    output = run_eval(
+        [{"query": "q", "should_trigger": True}], "demo", "A demo skill.", num_workers=1, timeout=10,
+        project_root=project_root, runs_per_query=3, trigger_threshold=0.0, early_stop="exact",
+        claude_bin=str(tmp_path / "no-such-claude"),
+    )
+    assert output["summary"]["passed"] == 1
+    assert output["results"][0]["runs"] == 0
+
+
+# Includes thresholds that are not exact in binary (0.1 * 3 > 0.3)
+THRESHOLDS = [0.0, 0.1, 0.25, 1 / 3, 0.1 * 3, 0.5, 0.6, 0.7, 0.9, 1.0]
+
+
+def passes(triggers, runs, threshold):
+    return _query_result({"query": "q", "should_trigger": True}, [True] * triggers + [False] * (runs - triggers), threshold)["pass"]
+
+
+@pytest.mark.parametrize("threshold", THRESHOLDS)
+def test_a_settled_query_passes_exactly_when_every_full_run_would(threshold):
+    for planned in range(1, 9):
+        for runs in range(planned + 1):
+            for triggers in range(runs + 1):
+                if runs_still_needed(triggers, runs, planned, threshold):
+                    continue
+                full = {passes(triggers + more, planned, threshold) for more in range(planned - runs + 1)}
+                assert full == {passes(triggers, runs, threshold)}, (planned, runs, triggers)
+
+
+@pytest.mark.parametrize("threshold", THRESHOLDS)
+def test_runs_still_needed_is_the_fewest_that_can_settle(threshold):
+    for planned in range(1, 9):
+        for runs in range(planned):
+            for triggers in range(runs + 1):
+                needed = runs_still_needed(triggers, runs, planned, threshold)
+                if needed == 0:
+                    continue
+                # The remaining outcomes can go either way, so it is not settled yet
+                assert len({passes(triggers + more, planned, threshold) for more in range(planned - runs + 1)}) == 2
+
+                def settles_after(n):
+                    return any(
+                        runs_still_needed(triggers + t, runs + n, planned, threshold) == 0 for t in range(n + 1)
+                    )
+
+                assert settles_after(needed)
+                assert not any(settles_after(n) for n in range(needed))
+
+
+def test_confidently_decided_needs_the_interval_clear_of_the_threshold():
+    assert not confidently_decided(0, 0, 0.5, 0.95)
+    assert confidently_decided(10, 10, 0.5, 0.95)
+    assert confidently_decided(0, 10, 0.5, 0.95)
+    assert not confidently_decided(5, 10, 0.5, 0.95)
+    assert not confidently_decided(3, 3, 0.5, 0.95)
+    # More confidence needs more runs
+    assert confidently_decided(6, 6, 0.5, 0.9)
+    assert not confidently_decided(6, 6, 0.5, 0.999)
+
+
+@pytest.mark.parametrize("threshold", [0.3, 0.5, 0.8])
+def test_exact_early_stop_gives_the_full_run_verdicts(fake_claude, project_root, tmp_path, monkeypatch, threshold):
+    claude_bin = fake_claude({"trigger_probability": 0.5, "latency": {"first_byte": 0.01, "decision": 0.01}})
+    eval_set = [{"query": f"query {i}", "should_trigger": i % 2 == 0} for i in range(10)]
+    outputs = {}
+    for early_stop in ["off", "exact"]:
+        # A fresh state dir replays the same draws, run by run
+        monkeypatch.setenv("FAKE_CLAUDE_STATE", str(tmp_path / f"state-{early_stop}"))
+        outputs[early_stop] = run_eval(
+            eval_set, "demo", "A demo skill.", num_workers=8, timeout=10, project_root=project_root,
+            runs_per_query=5, trigger_threshold=threshold, early_stop=early_stop, claude_bin=claude_bin,
+        )
+    full, exact = outputs["off"], outputs["exact"]
+    assert [r["pass"] for r in exact["results"]] == [r["pass"] for r in full["results"]]
+    assert sum(r["runs"] for r in exact["results"]) < sum(r["runs"] for r in full["results"])
+
+
+def test_every_worker_gets_its_own_root(project_root):
+    (project_root / ".claude").mkdir()
+    (project_root / ".claude" / "settings.json").write_text("{}")
+    with WorkerRoots(3, [("charts", "Draw charts."), ("sheets", "Edit sheets.")], project_root) as roots:
+        assert len(set(roots.roots)) == 3
+        for root in map(Path, roots.roots):
+            commands = sorted(p.stem for p in (root / ".claude" / "commands").iterdir())
+            assert commands == sorted(roots.clean_names)
+            assert (root / ".claude" / "settings.json").resolve() == (project_root / ".claude" / "settings.json").resolve()
+            assert not (root / ".claude" / "settings.local.json").exists()
+        assert list(roots.clean_names.values()) == ["charts", "sheets"]
+        assert all(name.startswith(f"{skill}-skill-") for name, skill in roots.clean_names.items())
+
+
+def test_roots_are_removed_on_exit_even_after_an_error(project_root):
+    with pytest.raises(RuntimeError):
+        with WorkerRoots(2, [("charts", "Draw charts.")], project_root) as roots:
+            paths = [Path(root) for root in roots.roots]
+            assert all(path.is_dir() for path in paths)
+            raise RuntimeError()
+    assert not any(path.exists() for path in paths)
+    assert not paths[0].parent.exists()
+    # The real project is left alone
+    assert list(project_root.iterdir()) == []
+
@@ -0,0 +1,122 @@
+import json
+import threading
+
+from scripts import tracing
+from scripts.run_fleet import FleetIndex, discover_skills, run_fleet
+from scripts.run_loop import make_history_entry
+
+
+def make_skill(root, name, eval_set=None):
+    skill_dir = root / name
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(f"---\nname: {name}\ndescription: The {name} skill.\n---\n\nBody.\n")
+    if eval_set is not None:
+        (skill_dir / "evals").mkdir()
+        (skill_dir / "evals" / "trigger_eval.json").write_text(json.dumps(eval_set))
+    return skill_dir
+
+
+def test_discover_skills_finds_eval_sets(tmp_path):
+    root = tmp_path / "skills"
+    make_skill(root, "alpha", [])
+    make_skill(root, "beta")
+    make_skill(root, "gamma")
+    (root / "not-a-skill").mkdir()
+    eval_dir = tmp_path / "evals"
+    eval_dir.mkdir()
+    (eval_dir / "gamma.json").write_text("[]")
+
+    skills = discover_skills(root, eval_dir)
+    assert [s["skill"] for s in skills] == ["alpha", "beta", "gamma"]
+    assert [s["eval_set"] for s in skills] == [
+        root / "alpha" / "evals" / "trigger_eval.json", None, eval_dir / "gamma.json",
+    ]
+    assert [s["skill"] for s in discover_skills(root, only=["beta"])] == ["beta"]
+
+
+def test_fleet_index_is_written_on_every_update(tmp_path):
+    path = tmp_path / "index.json"
+    index = FleetIndex(path, started="then", model="m")
+    index.update("alpha", status="running")
+    index.update("alpha", status="done", best_score="3/4")
+    assert json.loads(path.read_text()) == {
+        "started": "then", "model": "m", "skills": {"alpha": {"status": "done", "best_score": "3/4"}},
+    }
+    assert [p.name for p in tmp_path.iterdir()] == ["index.json"]
+
+
+def test_a_resumed_index_keeps_earlier_skills(tmp_path):
+    path = tmp_path / "index.json"
+    FleetIndex(path, started="then").update("alpha", status="done")
+    index = FleetIndex(path, started="now")
+    index.update("beta", status="running")
+    data = json.loads(path.read_text())
+    assert data["started"] == "then"
+    assert data["resumed"] == "now"
+    assert data["skills"] == {"alpha": {"status": "done"}, "beta": {"status": "running"}}
+
+
+def test_resume_does_not_rerun_finished_skills(tmp_path):
+    root = tmp_path / "skills"
+    make_skill(root, "alpha", [{"query": "q", "should_trigger": True}])
+    make_skill(root, "beta")
+    fleet_dir = tmp_path / "fleet"
+    fleet_dir.mkdir()
+    FleetIndex(fleet_dir / "index.json", started="then").update("alpha", status="done", best_score="1/1")
+
+    data = run_fleet(
+        discover_skills(root), fleet_dir, model="m", num_workers=2, max_parallel_skills=None,
+        time_limit=None, cache_dir=None, verbose=False,
+    )
+    assert data["skills"]["alpha"] == {"status": "done", "best_score": "1/1"}
+    assert data["skills"]["beta"]["status"] == "skipped"
+    assert not (fleet_dir / "alpha").exists()
+
+
+def test_spans_from_many_threads_are_all_recorded(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "_events", [])
+    monkeypatch.setattr(tracing, "_lanes", {})
+    monkeypatch.setattr(tracing, "_enabled", True)
+
+    def loop(i):
+        for j in range(200):
+            t = tracing.now()
+            tracing.record("step", t, t, lane=f"fleet:{i}:{j % 7}")
+
+    threads = [threading.Thread(target=loop, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    tracing.write_trace(tmp_path / "trace.json")
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    lanes = [e for e in events if e["ph"] == "M"]
+    assert len(lanes) == 56
+    assert len({e["tid"] for e in lanes}) == 56
+    assert len(events) - len(lanes) == 1600
+
+
+def test_each_loop_starts_with_its_share_of_the_workers(tmp_path, monkeypatch):
+    root = tmp_path / "skills"
+    for name in ["alpha", "beta", "gamma"]:
+        make_skill(root, name, [{"query": "q", "should_trigger": True}])
+    calls = []
+
+    def fake_run_loop(**kwargs):
+        calls.append((kwargs["num_workers"], kwargs["max_workers"]))
+        results = [{"query": "q", "should_trigger": True, "pass": True, "triggers": 3, "runs": 3, "trigger_rate": 1.0}]
+        return {
+            "exit_reason": "all_passed (iteration 1)", "original_description": "d", "best_description": "d",
+            "best_score": "1/1", "best_train_score": "1/1", "best_test_score": None, "iterations_run": 1,
+            "holdout": 0, "train_size": 1, "test_size": 0,
+            "history": [make_history_entry(1, "d", results, kwargs["eval_set"], [])],
+        }
+
+    monkeypatch.setattr("scripts.run_fleet.run_loop", fake_run_loop)
+    fleet_dir = tmp_path / "fleet"
+    fleet_dir.mkdir()
+    run_fleet(
+        discover_skills(root), fleet_dir, model="m", num_workers=10, max_parallel_skills=2,
+        time_limit=None, cache_dir=None, verbose=False,
+    )
+    assert calls == [(5, 10)] * 3
@@ -0,0 +1,291 @@
+import pytest
+
+from scripts.journal import Journal
+from scripts.run_loop import failure_budget, halving_schedule, run_loop, successive_halving
+
+EVAL_SET = [{"query": f"draw chart {i}", "should_trigger": True} for i in range(4)]
+STRONG = "Use this skill whenever the user asks for an alpha chart or graph."
+WEAK = "Reach for it when beta spreadsheets come up in conversation."
+# Only the strong candidate triggers on every query
+MODEL = {
+    "trigger_probability": 0.0,
+    "queries": {"draw chart 0": 1.0},
+    "latency": {"first_byte": 0.01, "decision": 0.01},
+    "by_description": [{"match": "alpha", "trigger_probability": 1.0, "queries": {}}],
+}
+
+
+@pytest.fixture
+def skill_path(tmp_path, monkeypatch):
+    path = tmp_path / "demo"
+    path.mkdir()
+    (path / "SKILL.md").write_text("---\nname: demo\ndescription: A demo skill.\n---\n\nBody.\n")
+    monkeypatch.chdir(tmp_path)
+    return path
+
+
+def loop(skill_path, claude_bin, n_candidates=2, **kwargs):
+    return run_loop(
+        eval_set=EVAL_SET, skill_path=skill_path, description_override=None, num_workers=2, timeout=10,
+        max_iterations=3, runs_per_query=1, trigger_threshold=0.5, holdout=0, model=None, verbose=False,
+        claude_bin=claude_bin, n_candidates=n_candidates, **kwargs,
+    )
+
+
+def test_every_candidate_is_screened_and_losers_are_kept(fake_improver, skill_path, tmp_path):
+    claude_bin = fake_improver(MODEL, descriptions=[WEAK, STRONG])
+    journal = Journal(tmp_path / "journal.jsonl")
+    output = loop(skill_path, claude_bin, journal=journal)
+    journal.close()
+
+    # The strong candidate wins the screening even though it was not proposed first
+    assert output["exit_reason"] == "all_passed (iteration 2)"
+    assert output["best_description"] == STRONG
+    assert output["iterations_run"] == 2
+    assert [(h["iteration"], h["description"]) for h in output["history"]] == [
+        (1, "A demo skill."), (2, WEAK), (2, STRONG),
+    ]
+    loser = output["history"][1]
+    assert loser["screened_out"] and loser["partial"]
+    assert loser["train_passed"] == 1
+    assert "screened out before iteration 2" in loser["fate"]
+
+    # A resumed loop restores the screened-out candidate too
+    journal = Journal(tmp_path / "journal.jsonl")
+    resumed = loop(skill_path, claude_bin, journal=journal)
+    journal.close()
+    assert resumed["history"] == output["history"]
+    assert resumed["exit_reason"] == output["exit_reason"]
+
+
+def test_the_loop_stops_when_every_proposal_is_a_duplicate(fake_improver, skill_path):
+    claude_bin = fake_improver(MODEL, descriptions=["A demo skill!", "a demo SKILL"])
+    output = loop(skill_path, claude_bin)
+    assert output["exit_reason"] == "no_new_description (iteration 1)"
+    assert [h["description"] for h in output["history"]] == ["A demo skill."]
+
+
+@pytest.mark.parametrize("speculate_at", [1.0, 0.5])
+def test_the_pipelined_loop_keeps_the_serial_order(fake_improver, skill_path, speculate_at):
+    # A fresh seed per run restarts the improver's answers from the first one
+    serial = loop(skill_path, fake_improver({**MODEL, "seed": 1}, descriptions=[WEAK, STRONG]), n_candidates=1)
+    pipelined = loop(
+        skill_path, fake_improver({**MODEL, "seed": 2}, descriptions=[WEAK, STRONG]), n_candidates=1,
+        pipeline=True, speculate_at=speculate_at,
+    )
+    assert [(h["iteration"], h["description"]) for h in serial["history"]] == [
+        (1, "A demo skill."), (2, WEAK), (3, STRONG),
+    ]
+    for key in ("exit_reason", "best_description", "iterations_run"):
+        assert pipelined[key] == serial[key]
+    assert [(h["iteration"], h["description"], h["train_passed"]) for h in pipelined["history"]] == [
+        (h["iteration"], h["description"], h["train_passed"]) for h in serial["history"]
+    ]
+
+
+TRAIN = [{"query": f"train {i}", "should_trigger": i % 2 == 0} for i in range(16)]
+TEST = [{"query": f"test {i}", "should_trigger": i % 2 == 0} for i in range(4)]
+
+
+class Crash(Exception):
+    pass
+
+
+class FakeSearch:
+    """propose/evaluate for successive_halving; later proposals pass more queries."""
+
+    def __init__(self, crash_at: int | None = None):
+        self.crash_at = crash_at
+        self.proposed = []
+        self.evaluations = 0
+
+    def propose(self, iteration, description, entries, k):
+        proposals = [f"proposal {len(self.proposed) + i}" for i in range(k)]
+        self.proposed.extend(proposals)
+        return proposals
+
+    def evaluate(self, queries, descriptions):
+        self.evaluations += 1
+        if self.evaluations == self.crash_at:
+            raise Crash()
+        return [[self.result(q, d) for q in queries] for d in descriptions]
+
+    @staticmethod
+    def result(query, description):
+        strength = int(description.split()[-1]) + 1 if description.startswith("proposal") else 0
+        passed = int(query["query"].split()[-1]) % 8 < strength
+        return {"query": query["query"], "should_trigger": query["should_trigger"],
+                "pass": passed, "triggers": int(passed), "runs": 1}
+
+
+def search(journal, fake, history, **kwargs):
+    options = dict(runs_per_query=1, candidates=3, budget=None, max_rounds=3, verbose=False)
+    return successive_halving(
+        history, "start", TRAIN, TEST, fake.propose, fake.evaluate, journal=journal, **{**options, **kwargs},
+    )
+
+
+def restored_history(journal):
+    return [entry for record in journal.rounds for entry in record["entries"]]
+
+
+def test_halving_resumes_after_the_last_round(tmp_path):
+    uninterrupted = FakeSearch()
+    journal = Journal(tmp_path / "full.jsonl")
+    full_history = []
+    expected = search(journal, uninterrupted, full_history)
+    journal.close()
+
+    # Crash in the middle of round 2, after its proposals were written
+    path = tmp_path / "journal.jsonl"
+    crashing = FakeSearch(crash_at=uninterrupted.evaluations - 3)
+    journal = Journal(path)
+    with pytest.raises(Crash):
+        search(journal, crashing, [])
+    journal.close()
+
+    journal = Journal(path)
+    assert journal.rounds[-1]["round"] == 1
+    assert 2 in journal.proposals
+    resumed = FakeSearch()
+    resumed.proposed = list(crashing.proposed)
+    history = restored_history(journal)
+    assert search(journal, resumed, history) == expected
+    # Round 2 was replayed from its recorded proposals, not written again
+    assert resumed.proposed == uninterrupted.proposed
+    assert [h["description"] for h in history] == [h["description"] for h in full_history]
+    journal.close()
+
+    # A finished search is recorded as such
+    journal = Journal(path)
+    assert journal.rounds[-1]["exit_reason"] == expected[0]
+    assert journal.rounds[-1]["spent"] == expected[1]
+    journal.close()
+
+
+@pytest.mark.parametrize("n_candidates, n_train, sizes", [
+    (2, 16, [8]),
+    (4, 16, [4, 8]),
+    (5, 16, [2, 4, 8]),
+    (8, 10, [2, 3, 5]),
+    (4, 3, [2, 2]),
+])
+def test_halving_schedule_doubles_up_to_half_the_train_set(n_candidates, n_train, sizes):
+    assert halving_schedule(n_candidates, n_train) == sizes
+
+
+class SliceSearch(FakeSearch):
+    """Each call's first `strength` queries pass, so every candidate's slice score is known."""
+
+    def __init__(self, strengths):
+        super().__init__()
+        self.strengths = strengths
+
+    def propose(self, iteration, description, entries, k):
+        proposals = [f"candidate {i} passes {s}" for i, s in enumerate(self.strengths[:k], 1)]
+        self.proposed.extend(proposals)
+        return proposals
+
+    def evaluate(self, queries, descriptions):
+        self.evaluations += 1
+        outputs = []
+        for d in descriptions:
+            strength = int(d.split()[-1]) if d.startswith("candidate") else 0
+            results = [self.result(q, "start") for q in queries]
+            for r in results[:strength]:
+                r.update(**{"pass": True, "triggers": int(r["should_trigger"])})
+            outputs.append(results)
+        return outputs
+
+
+def test_halving_drops_the_worse_half_at_each_rung():
+    history = []
+    exit_reason, spent = search(None, SliceSearch([1, 2, 3]), history, max_rounds=1)
+    fates = [(h["description"], h["fate"]) for h in history]
+    # Slices are 4 then 8 train queries; the incumbent fails all and goes out at rung 1
+    assert fates == [
+        ("start", "starting description"),
+        ("candidate 1 passes 1", "eliminated in round 1, rung 1 (1/4 on the slice)"),
+        ("candidate 2 passes 2", "eliminated in round 1, rung 2 (4/8 on the slice)"),
+        ("candidate 3 passes 3", "won round 1"),
+    ]
+    assert [h.get("partial", False) for h in history] == [False, True, True, False]
+    # Initial full evaluation, 3 proposals, 3 x 4 then 2 x 4 slice runs, the winner's remaining 12
+    assert spent == 20 + 3 + 12 + 8 + 12
+    assert exit_reason == "max_rounds (1)"
+
+
+def test_ties_go_to_the_incumbent_then_to_earlier_candidates():
+    history = []
+    search(None, SliceSearch([0, 0, 0]), history, max_rounds=1)
+    assert [(h["description"], h["fate"]) for h in history] == [
+        ("start", "starting description"),
+        ("candidate 2 passes 0", "eliminated in round 1, rung 1 (0/4 on the slice)"),
+        ("candidate 3 passes 0", "eliminated in round 1, rung 1 (0/4 on the slice)"),
+        ("candidate 1 passes 0", "eliminated in round 1, rung 2 (0/8 on the slice)"),
+    ]
+
+
+def test_the_budget_counts_the_starting_evaluation():
+    fake = FakeSearch()
+    exit_reason, spent = search(None, fake, [], budget=20)
+    assert (exit_reason, spent) == ("budget (20/20 claude calls)", 20)
+    assert fake.proposed == []
+    with pytest.raises(ValueError, match="does not cover scoring the starting description"):
+        search(None, FakeSearch(), [], budget=19)
+
+
+def test_spend_never_exceeds_the_budget_and_counts_every_call():
+    for budget in [40, 60, 80, 120]:
+        fake = FakeSearch()
+        calls = []
+
+        def evaluate(queries, descriptions):
+            outputs = fake.evaluate(queries, descriptions)
+            calls.extend(r["runs"] for results in outputs for r in results)
+            return outputs
+
+        _, spent = successive_halving(
+            [], "start", TRAIN, TEST, fake.propose, evaluate,
+            runs_per_query=1, candidates=3, budget=budget, max_rounds=5, verbose=False,
+        )
+        assert spent == sum(calls) + len(fake.proposed)
+        assert spent <= budget
+
+
+
+def test_failed_runs_are_spent_too():
+    fake = FakeSearch()
+
+    def evaluate(queries, descriptions):
+        outputs = fake.evaluate(queries, descriptions)
+        for results in outputs:
+            for r in results[::2]:
+                r.update(runs=0, errors=1, error="timeout")
+        return outputs
+
+    exit_reason, spent = successive_halving(
+        [], "start", TRAIN, TEST, fake.propose, evaluate,
+        runs_per_query=1, candidates=3, budget=20, max_rounds=5, verbose=False,
+    )
+    assert (exit_reason, spent) == ("budget (20/20 claude calls)", 20)
+
+
+def train_result(i, passed, **extra):
+    return {"query": f"train {i}", "should_trigger": True, "pass": passed, **extra}
+
+
+def test_failure_budget_aborts_once_the_best_is_out_of_reach():
+    on_result = failure_budget(TRAIN[:4], best_train_passed=3)
+    assert on_result("d", train_result(0, True)) is False
+    # One failure still allows a tie at 3/4
+    assert on_result("d", train_result(1, False)) is False
+    assert on_result("d", train_result(2, False)) is True
+
+
+def test_failure_budget_ignores_test_queries_and_errored_runs():
+    on_result = failure_budget(TRAIN[:4], best_train_passed=4)
+    assert on_result("d", {"query": "test 0", "should_trigger": True, "pass": False}) is False
+    assert on_result("d", train_result(0, False, runs=0, errors=3, error="all 3 runs failed")) is False
+    assert on_result("d", train_result(1, False)) is True
+
@@ -0,0 +1,96 @@
+import asyncio
+
+from scripts.run_eval import run_eval, write_command_file
+from scripts.session_pool import ClaudeSession
+
+FAST = {"first_byte": 0.01, "decision": 0.01}
+
+
+def pool_eval(claude_bin, project_root, eval_set, **kwargs):
+    return run_eval(
+        eval_set, "demo", "A demo skill.", num_workers=1, max_workers=1, timeout=10,
+        project_root=project_root, backend="pool", claude_bin=claude_bin, **kwargs,
+    )
+
+
+def positives(n):
+    return [{"query": f"query {i}", "should_trigger": True} for i in range(n)]
+
+
+def test_one_session_serves_every_query(fake_claude, project_root):
+    claude_bin = fake_claude({"trigger_probability": 1.0, "latency": FAST})
+    output = pool_eval(claude_bin, project_root, positives(6))
+    assert output["summary"]["passed"] == 6
+    assert output["summary"]["pool"] == {
+        "sessions_started": 1, "sessions_recycled": 0, "failed_resets": 0, "queries": 6,
+    }
+
+
+def test_sessions_are_recycled_after_recycle_after_queries(fake_claude, project_root):
+    claude_bin = fake_claude({"trigger_probability": 1.0, "latency": FAST})
+    output = pool_eval(claude_bin, project_root, positives(5), recycle_after=2)
+    pool = output["summary"]["pool"]
+    assert pool["sessions_started"] == 3
+    assert pool["sessions_recycled"] == 2
+
+
+def test_a_session_that_crashed_is_replaced(fake_claude, project_root):
+    claude_bin = fake_claude({"trigger_probability": 1.0, "latency": FAST, "failures": {"exit": 0.3}})
+    output = pool_eval(claude_bin, project_root, positives(8), max_retries=10)
+    crashes = output["summary"]["concurrency"]["failures"]["exit"]
+    pool = output["summary"]["pool"]
+    assert crashes >= 1
+    assert output["summary"]["passed"] == 8
+    # Every crash retires its session and the retry starts a fresh one
+    assert pool["sessions_started"] == 1 + crashes
+    assert pool["sessions_recycled"] == crashes
+
+
+def sticky_eval_set():
+    return [{"query": "use the skill", "should_trigger": True}] + [
+        {"query": f"unrelated {i}", "should_trigger": False} for i in range(3)
+    ]
+
+
+STICKY = {
+    "trigger_probability": 0.0,
+    "queries": {"use the skill": 1.0},
+    "latency": FAST,
+    "sticky": True,
+}
+
+
+def test_clear_keeps_queries_from_seeing_each_other(fake_claude, project_root):
+    claude_bin = fake_claude(STICKY)
+    output = pool_eval(claude_bin, project_root, sticky_eval_set())
+    assert output["summary"]["passed"] == 4
+    assert output["summary"]["pool"]["sessions_started"] == 1
+
+
+def test_a_session_whose_clear_is_not_confirmed_is_not_reused(fake_claude, project_root):
+    claude_bin = fake_claude({**STICKY, "ignore_clear": True})
+    output = pool_eval(claude_bin, project_root, sticky_eval_set())
+    pool = output["summary"]["pool"]
+    assert output["summary"]["passed"] == 4
+    assert pool["failed_resets"] == 4
+    assert pool["sessions_started"] == 4
+
+
+def test_context_carries_over_until_reset(fake_claude, tmp_path):
+    claude_bin = fake_claude(STICKY)
+    clean_name, _ = write_command_file(str(tmp_path), "demo", "A demo skill.")
+
+    async def scenario():
+        session = await ClaudeSession.start(str(tmp_path), claude_bin=claude_bin)
+        try:
+            outcomes = [
+                await session.query("use the skill", clean_name, 10),
+                await session.query("unrelated", clean_name, 10),
+            ]
+            assert await session.reset(10)
+            outcomes.append(await session.query("unrelated", clean_name, 10))
+            return outcomes
+        finally:
+            await session.close()
+
+    assert asyncio.run(scenario()) == [True, True, False]
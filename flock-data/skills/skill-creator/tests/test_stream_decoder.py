@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from scripts.stream_decoder import PREFILTER_WINDOW, StreamDecoder, classify
+
+LINES = [
+    {"type": "system", "subtype": "init"},
+    {"type": "stream_event", "event": {"type": "message_start", "message": {}}},
+    {"type": "stream_event", "event": {"type": "content_block_start", "index": 0,
+                                       "content_block": {"type": "tool_use", "name": "Skill"}}},
+    {"type": "stream_event", "event": {"type": "content_block_delta", "index": 0,
+                                       "delta": {"type": "input_json_delta", "partial_json": "{\"skill\""}}},
+    {"type": "stream_event", "event": {"type": "content_block_delta", "index": 1,
+                                       "delta": {"type": "text_delta", "text": "hello"}}},
+    {"type": "user", "message": {"content": [{"type": "tool_result", "content": "x" * 100_000}]}},
+    {"type": "result", "subtype": "success", "result": "done"},
+]
+STREAM = b"".join(json.dumps(line).encode() + b"\n" for line in LINES)
+
+
+def kinds(events):
+    return [event.kind for event in events]
+
+
+def test_classify():
+    assert kinds(classify(line) for line in LINES) == [
+        "system", "message_start", "tool_use_start", "input_json_delta", "content_block_delta", "user", "result",
+    ]
+    assert classify({"type": "stream_event", "event": {"type": "ping"}}) is None
+    assert classify({"type": "unknown"}) is None
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096, len(STREAM)])
+def test_events_do_not_depend_on_chunking(chunk_size):
+    decoder = StreamDecoder()
+    events = []
+    for i in range(0, len(STREAM), chunk_size):
+        events += decoder.feed(STREAM[i:i + chunk_size])
+    events += decoder.flush()
+    assert events == [classify(line) for line in LINES]
+    assert decoder.stats == {"lines": len(LINES), "parsed": len(LINES), "skipped": 0}
+
+
+def test_prefilter_skips_unsubscribed_lines_without_parsing():
+    decoder = StreamDecoder(["tool_use_start", "result"])
+    events = decoder.feed(STREAM)
+    assert kinds(events) == ["tool_use_start", "result"]
+    assert decoder.stats["lines"] == len(LINES)
+    # The huge tool_result line is skipped by the prefilter, not parsed
+    assert decoder.stats["parsed"] < len(LINES)
+    assert decoder.stats["skipped"] >= 1
+
+
+def test_flush_decodes_an_unterminated_last_line():
+    decoder = StreamDecoder(["result"])
+    tail = json.dumps({"type": "result", "result": "done"}).encode()
+    assert decoder.feed(tail) == []
+    assert kinds(decoder.flush()) == ["result"]
+
+
+def test_malformed_and_blank_lines_are_ignored():
+    decoder = StreamDecoder()
+    events = decoder.feed(b"\n   \n{not json\n[1, 2]\n" + STREAM)
+    assert kinds(events) == kinds(classify(line) for line in LINES)
+
+
+def test_unknown_subscription_is_rejected():
+    with pytest.raises(ValueError):
+        StreamDecoder(["no_such_event"])
+
+
+def test_prefilter_window_covers_the_type_keys():
+    line = json.dumps(LINES[3]).encode()
+    assert line.find(b"input_json_delta") < PREFILTER_WINDOW
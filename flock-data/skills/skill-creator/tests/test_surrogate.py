@@ -0,0 +1,41 @@
+from scripts.surrogate import TriggerSurrogate
+
+DESCRIPTION = "Draw charts, plots and graphs from spreadsheet data."
+CHARTS = ["draw a bar chart of sales", "plot this data as a line graph", "make a pie chart from my spreadsheet",
+          "graph the spreadsheet columns", "chart monthly data as bars"]
+OTHER = ["what is the weather in paris", "translate hello into french", "write a haiku about autumn",
+         "who won the football match", "recommend a good novel"]
+UNSEEN_CHARTS = ["plot a chart of the spreadsheet data", "draw graphs of my data"]
+UNSEEN_OTHER = ["tell me a joke about cats", "how tall is mount everest"]
+
+
+def fitted() -> TriggerSurrogate:
+    surrogate = TriggerSurrogate(CHARTS + OTHER + UNSEEN_CHARTS + UNSEEN_OTHER)
+    results = [{"query": q, "triggers": 3, "runs": 3} for q in CHARTS]
+    results += [{"query": q, "triggers": 0, "runs": 3} for q in OTHER]
+    surrogate.observe(DESCRIPTION, results)
+    return surrogate
+
+
+def test_the_fit_is_deterministic():
+    queries = CHARTS + OTHER + UNSEEN_CHARTS + UNSEEN_OTHER
+    first, second = fitted(), fitted()
+    assert (first.weight, first.bias, first.offsets) == (second.weight, second.bias, second.offsets)
+    assert first.predict(DESCRIPTION, queries) == second.predict(DESCRIPTION, queries)
+
+
+def test_a_separable_set_is_ranked_correctly():
+    surrogate = fitted()
+    assert surrogate.weight > 0
+    observed = surrogate.predict(DESCRIPTION, CHARTS + OTHER)
+    assert min(observed[q] for q in CHARTS) > 0.5 > max(observed[q] for q in OTHER)
+    # Queries never run are ranked by their similarity to the description alone
+    unseen = surrogate.predict(DESCRIPTION, UNSEEN_CHARTS + UNSEEN_OTHER)
+    assert min(unseen[q] for q in UNSEEN_CHARTS) > max(unseen[q] for q in UNSEEN_OTHER)
+
+
+def test_unmeasured_results_are_not_observed():
+    surrogate = TriggerSurrogate(CHARTS)
+    surrogate.observe(DESCRIPTION, [{"query": CHARTS[0], "triggers": 0, "runs": 0, "predicted": True}])
+    assert (surrogate.weight, surrogate.bias, surrogate.offsets) == (0.0, 0.0, {})
+    assert surrogate.priorities(DESCRIPTION, CHARTS[:1]) == {CHARTS[0]: 1.0}
@@ -0,0 +1,69 @@
+import shutil
+
+from scripts.run_eval import run_eval
+from scripts.trigger_cache import TriggerCache, cli_identity
+
+KEY_ARGS = ("skill", "A description.", "a query", "sonnet", 0, 1, "/usr/bin/claude 1.0")
+
+
+def test_every_key_field_matters():
+    key = TriggerCache.make_key(*KEY_ARGS)
+    assert TriggerCache.make_key(*KEY_ARGS) == key
+    for i, changed in enumerate(("other", "Other.", "other query", "opus", 1, 2, "/tmp/fake_claude.py unknown")):
+        args = list(KEY_ARGS)
+        args[i] = changed
+        assert TriggerCache.make_key(*args) != key
+
+
+def test_model_none_matches_the_default_model():
+    args = list(KEY_ARGS)
+    args[3] = None
+    assert TriggerCache.make_key(*args) == TriggerCache.make_key(*args[:3], "", *args[4:])
+
+
+def test_get_put_and_eviction(tmp_path):
+    cache = TriggerCache(tmp_path, max_entries=2)
+    assert cache.get("a") is None
+    cache.put("a", True)
+    cache.put("b", False)
+    assert cache.get("a") is True
+    assert cache.get("b") is False
+    assert (cache.hits, cache.misses) == (2, 1)
+    cache.put("c", True)
+    assert cache.evict() == 1
+    assert cache.get("c") is True
+    assert sum(cache.get(k) is not None for k in ("a", "b")) == 1
+    cache.close()
+
+
+def test_the_cli_identity_is_the_resolved_executable_and_its_version(fake_improver, tmp_path):
+    fake_improver()
+    on_path = shutil.which("claude")
+    assert on_path == str(tmp_path / "bin" / "claude")
+    # A bare name and the path it resolves to are the same CLI
+    assert cli_identity("claude") == cli_identity(on_path) == f"{on_path} 0.0.0 (fake_claude)"
+
+
+def test_results_are_not_shared_between_claude_executables(fake_claude, project_root, tmp_path):
+    claude_bin = fake_claude({"trigger_probability": 0.5, "latency": {"first_byte": 0.01, "decision": 0.01}})
+    other_bin = tmp_path / "other_claude.py"
+    shutil.copy(claude_bin, other_bin)
+    assert cli_identity(claude_bin) != cli_identity(str(other_bin))
+
+    eval_set = [{"query": f"query {i}", "should_trigger": i % 2 == 0} for i in range(4)]
+    cache = TriggerCache(tmp_path / "cache")
+
+    def run(executable: str) -> dict:
+        return run_eval(
+            eval_set, "demo", "A demo skill.", num_workers=4, timeout=30, project_root=project_root,
+            runs_per_query=2, claude_bin=executable, cache=cache,
+        )
+
+    first = run(claude_bin)
+    assert (cache.hits, cache.misses) == (0, 8)
+    again = run(claude_bin)
+    assert (cache.hits, cache.misses) == (8, 8)
+    assert [r["triggers"] for r in again["results"]] == [r["triggers"] for r in first["results"]]
+    run(str(other_bin))
+    assert (cache.hits, cache.misses) == (8, 16)
+    cache.close()